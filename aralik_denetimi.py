@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zil programı aralık denetimi – çakışma, boşluk ve ters aralık
+Gün başına başlangıca göre sıralı aralık listesi tutulur. Program
+çakışmasız tutulduğundan yeni / değişen bir kaydın komşuları ikili aramayla
+bulunur: arama O(log k), ekleme / silme liste kaydırmasıyla O(k) – k tek
+bir günün (bölge + gün) kayıt sayısıdır, onlarca kayıt. Toplu aktarımda
+tüm hafta sıralanıp tek geçişte taranır: O(n log n).
+
+Bitişi başlangıcından sonra olmayan kayıt terstir (TERS). Gece yarısını
+aşan kayıt yalnızca açıkça işaretlenirse (zaman_cizelgesi.gun_araligi
+gece=True, saklanan satırda süre) bitişi ertesi güne taşınarak gelir ve en
+çok GECE_EN_UZUN_DK sürebilir. Aşan kısım ertesi günün
+başına eklenir ve orada yalnızca çakışma için karşılaştırılır (gece boyunca
+süren boşluk uyarı sayılmaz).
+
+Gün anahtarı herhangi bir değer olabilir: 0–6, gün adı ya da (bolge, gun).
+Ertesi günü bilinmeyen anahtar (ör. plan adı) için aşan kısım aynı güne düşer.
+"""
+
+from bisect import bisect_left
+from zaman_cizelgesi import GUNLER, GUN_DK
+
+CAKISMA = "cakisma"     # iki kayıt aynı dakikaları kapsıyor – kaydedilmez
+TERS    = "ters"        # bitiş başlangıçtan sonra değil / gece aşımı çok uzun – kaydedilmez
+BOSLUK  = "bosluk"      # iki kayıt arasında boş dakika – yalnızca uyarı
+
+GECE_EN_UZUN_DK = 12 * 60   # gece yarısını aşan kaydın en uzun süresi
+
+
+def _saat(dk):
+    return f"{dk % GUN_DK // 60:02d}:{dk % 60:02d}"
+
+
+def gun_adi(gun):
+    if isinstance(gun, tuple):
+        return " / ".join(gun_adi(g) for g in gun)
+    if isinstance(gun, int) and 0 <= gun <= 6:
+        return GUNLER[gun]
+    return str(gun)
+
+
+def gecerli(bas, bit):
+    """Gün içinde başlayan, boş olmayan aralık; gece yarısını aşıyorsa en çok GECE_EN_UZUN_DK"""
+    return 0 <= bas < GUN_DK and bas < bit and (bit <= GUN_DK or bit - bas <= GECE_EN_UZUN_DK)
+
+
+def ertesi_gun(gun):
+    """Gün anahtarının ertesi günü: 6 → 0, 'Pazar' → 'Pazartesi', (bolge, gun) → (bolge, gun + 1)"""
+    if isinstance(gun, tuple) and gun:
+        return gun[:-1] + (ertesi_gun(gun[-1]),)
+    if isinstance(gun, int) and not isinstance(gun, bool) and 0 <= gun <= 6:
+        return (gun + 1) % 7
+    if gun in GUNLER:
+        return GUNLER[(GUNLER.index(gun) + 1) % 7]
+    return gun
+
+
+def _parcalar(gun, bas, bit):
+    # (gun, bas, bit, tasan): gece yarısını aşan kayıt iki parça
+    if bit <= GUN_DK:
+        return ((gun, bas, bit, False),)
+    return ((gun, bas, GUN_DK, False), (ertesi_gun(gun), 0, bit - GUN_DK, True))
+
+
+class Bulgu:
+    __slots__ = ("tur", "gun", "bas", "bit", "anahtar", "diger", "diger_bas", "diger_bit")
+
+    def __init__(self, tur, gun, bas, bit, anahtar=None, diger=None, diger_bas=None, diger_bit=None):
+        self.tur, self.gun, self.bas, self.bit, self.anahtar = tur, gun, bas, bit, anahtar
+        self.diger, self.diger_bas, self.diger_bit = diger, diger_bas, diger_bit
+
+    @property
+    def engel(self):
+        """Kaydı engelleyen bulgu mu (boşluk yalnızca uyarıdır)"""
+        return self.tur != BOSLUK
+
+    def __str__(self):
+        yer = f"{gun_adi(self.gun)} {_saat(self.bas)}–{_saat(self.bit)}"
+        if self.anahtar is not None:
+            yer += f" ({self.anahtar})"
+        if self.tur == TERS:
+            if self.bit <= self.bas:
+                return f"{yer}: bitiş başlangıçtan sonra olmalı"
+            return f"{yer}: gece yarısını aşan kayıt en çok {GECE_EN_UZUN_DK // 60} saat sürebilir"
+        diger = f"{_saat(self.diger_bas)}–{_saat(self.diger_bit)}"
+        if self.diger is not None:
+            diger += f" ({self.diger})"
+        if self.tur == CAKISMA:
+            return f"{yer}: {diger} ile çakışıyor"
+        bosluk = self.diger_bas - self.bit if self.diger_bas >= self.bit else self.bas - self.diger_bit
+        return f"{yer}: {diger} ile arasında {bosluk} dk boşluk"
+
+    def __repr__(self):
+        return f"Bulgu({self.tur!r}, {str(self)!r})"
+
+
+class AralikDenetcisi:
+    """
+    Kayıtlar: anahtar → (gun, bas_dk, bit_dk). ekle/sil/guncelle ikili aramayla
+    sıralı listeyi günceller; denetle() kaydetmeden önce sorulur.
+    """
+
+    def __init__(self, kayitlar=(), bosluk_esigi=1):
+        self.bosluk_esigi = bosluk_esigi
+        self._gunler = {}       # gun → ([bas, ...], [(bas, bit, anahtar, tasan), ...]) başlangıç sıralı
+        self._kayitlar = {}     # anahtar → (gun, bas, bit)
+        for anahtar, gun, bas, bit in kayitlar:
+            self.ekle(anahtar, gun, bas, bit)
+
+    def __len__(self):
+        return len(self._kayitlar)
+
+    def ekle(self, anahtar, gun, bas, bit):
+        """Kaydı ekle (aynı anahtar varsa yerine koy); denetim yapmaz"""
+        if anahtar in self._kayitlar:
+            self.sil(anahtar)
+        for p_gun, p_bas, p_bit, tasan in _parcalar(gun, bas, bit):
+            baslar, araliklar = self._gunler.setdefault(p_gun, ([], []))
+            j = _konum(araliklar, p_bas, p_bit)
+            baslar.insert(j, p_bas)
+            araliklar.insert(j, (p_bas, p_bit, anahtar, tasan))
+        self._kayitlar[anahtar] = (gun, bas, bit)
+
+    guncelle = ekle
+
+    def sil(self, anahtar):
+        kayit = self._kayitlar.pop(anahtar, None)
+        if kayit is None:
+            return
+        for p_gun, p_bas, _, _ in _parcalar(*kayit):
+            baslar, araliklar = self._gunler[p_gun]
+            j = bisect_left(baslar, p_bas)
+            while araliklar[j][2] != anahtar:
+                j += 1
+            del baslar[j], araliklar[j]
+
+    def denetle(self, gun, bas, bit, haric=None):
+        """
+        [bas, bit) aralığı eklenseydi oluşacak bulgular (haric: güncellenen
+        kaydın anahtarı, kendisiyle karşılaştırılmaz)
+        """
+        if not gecerli(bas, bit):
+            return [Bulgu(TERS, gun, bas, bit)]
+        bulgular, gorulen = [], set()
+
+        def bulgu(tur, diger):
+            if (tur, diger) not in gorulen:         # iki parça aynı kayıtla çakışabilir
+                gorulen.add((tur, diger))
+                _, d_bas, d_bit = self._kayitlar[diger]
+                bulgular.append(Bulgu(tur, gun, bas, bit, None, diger, d_bas, d_bit))
+
+        for p_gun, p_bas, p_bit, tasan in _parcalar(gun, bas, bit):
+            baslar, araliklar = self._gunler.get(p_gun, ((), ()))
+            j = bisect_left(baslar, p_bas)
+
+            i = j - 1
+            while i >= 0 and araliklar[i][2] == haric:
+                i -= 1
+            onceki = araliklar[i] if i >= 0 else None
+            if onceki is not None:
+                if onceki[1] > p_bas:
+                    bulgu(CAKISMA, onceki[2])
+                elif not tasan and not onceki[3] and p_bas - onceki[1] >= self.bosluk_esigi:
+                    bulgu(BOSLUK, onceki[2])
+
+            ust = p_bit             # çakışan sonraki kayıtlar dahil en geç bitiş
+            for a_bas, a_bit, a_anahtar, a_tasan in araliklar[j:]:
+                if a_anahtar == haric:
+                    continue
+                if a_bas < p_bit:
+                    bulgu(CAKISMA, a_anahtar)
+                    ust = max(ust, a_bit)
+                    continue
+                # boşluk ancak yeni kayıt ile sonraki arasında kalıyorsa bildirilir
+                if not tasan and not a_tasan and ust == p_bit and a_bas - p_bit >= self.bosluk_esigi:
+                    bulgu(BOSLUK, a_anahtar)
+                break
+        return bulgular
+
+    def bosluklar(self, gun):
+        """Günün ilk ve son kaydı arasındaki boşluklar: [(bas_dk, bit_dk), ...]"""
+        _, araliklar = self._gunler.get(gun, ((), ()))
+        sonuc, en_son = [], None
+        for bas, bit, _, tasan in araliklar:
+            if tasan:
+                continue            # önceki geceden taşan kısım
+            if en_son is not None and bas - en_son >= self.bosluk_esigi:
+                sonuc.append((en_son, bas))
+            en_son = bit if en_son is None else max(en_son, bit)
+        return sonuc
+
+
+def _konum(araliklar, bas, bit):
+    # (bas, bit) sırasında ekleme yeri; anahtarlar karşılaştırılmaz
+    lo, hi = 0, len(araliklar)
+    while lo < hi:
+        orta = (lo + hi) // 2
+        if araliklar[orta][:2] < (bas, bit):
+            lo = orta + 1
+        else:
+            hi = orta
+    return lo
+
+
+def hafta_tara(kayitlar, bosluk_esigi=1):
+    """
+    Toplu denetim: kayitlar (anahtar, gun, bas_dk, bit_dk) – gün başına sıralayıp
+    tek geçişte tüm ters aralıkları, çakışmaları ve boşlukları bulur.
+    Her kayıt, kendinden önce başlayıp en geç biten kayıtla karşılaştırılır.
+    """
+    gunler, bulgular, gorulen = {}, [], set()
+    for anahtar, gun, bas, bit in kayitlar:
+        if not gecerli(bas, bit):
+            bulgular.append(Bulgu(TERS, gun, bas, bit, anahtar))
+            continue
+        for p_gun, p_bas, p_bit, tasan in _parcalar(gun, bas, bit):
+            gunler.setdefault(p_gun, []).append((p_bas, p_bit, tasan, (anahtar, gun, bas, bit)))
+    for araliklar in gunler.values():
+        araliklar.sort(key=lambda a: a[:2])
+        en_uzun = None      # şimdiye kadar en geç biten parça
+        for p_bas, p_bit, tasan, kayit in araliklar:
+            if en_uzun is not None:
+                u_bit, u_tasan, (u_anahtar, _, u_bas, u_bitis) = en_uzun
+                anahtar, gun, bas, bit = kayit
+                tur = CAKISMA if u_bit > p_bas else \
+                    BOSLUK if not tasan and not u_tasan and p_bas - u_bit >= bosluk_esigi else None
+                if tur is not None and (anahtar, u_anahtar) not in gorulen:
+                    gorulen.add((anahtar, u_anahtar))
+                    bulgular.append(Bulgu(tur, gun, bas, bit, anahtar, u_anahtar, u_bas, u_bitis))
+            if en_uzun is None or p_bit > en_uzun[0]:
+                en_uzun = (p_bit, tasan, kayit)
+    return bulgular
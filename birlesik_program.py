@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Birleşik zil programı şeması + eski veritabanlarından tek geçişte aktarım
+Gün tamsayı (0 Pazartesi … 6 Pazar), başlangıç/bitiş gün başından dakika
+olarak saklanır; bu tabloyu okuyan 'HH:MM' ayrıştırmaz. Gece yarısını aşan
+kaydın bit_dk'sı 1439'u geçer (ertesi günün dakikası + 1440).
+
+`program` tablosu yalnızca aktarım hedefidir: hiçbir uygulama onu okumaz.
+main.py ve zil_programi.py kendi tablolarını okur; onların okuma yolu bu
+şemadan etkilenmez.
+
+Kullanım:
+    python birlesik_program.py [hedef.db] [kaynak.db ...]
+Kaynak verilmezse depodaki altı eski veritabanı aktarılır.
+"""
+
+import sys, sqlite3, os
+
+GUN_DK = 24 * 60
+
+HEDEF_DB = "birlesik_program.db"
+ESKI_DBLER = ["zil_programi.db", "okul_zil_programi.db", "bell.db",
+              "school_bell.db", "ziller.db", "zilsistemi.db"]
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS program (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    gun     INTEGER NOT NULL CHECK(gun BETWEEN 0 AND 6),
+    tur     TEXT    NOT NULL CHECK(tur IN ('DERS','TENEFFUS')),
+    baslik  TEXT    NOT NULL DEFAULT '',
+    bas_dk  INTEGER NOT NULL CHECK(bas_dk BETWEEN 0 AND 1439),
+    bit_dk  INTEGER NOT NULL CHECK(bit_dk > bas_dk AND bit_dk <= bas_dk + 1440),
+    etkin   INTEGER NOT NULL DEFAULT 1,
+    kaynak  TEXT    NOT NULL DEFAULT ''     -- '/mutlak/yol/dosya.db:tablo:id' – aktarım tekrarında çift kayıt olmasın
+);
+-- gün + saat aralığı sorguları tablo satırına gitmeden indeksten cevaplanır
+CREATE INDEX IF NOT EXISTS idx_program_gun_bas ON program(gun, bas_dk, bit_dk, tur, etkin, baslik);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_program_kaynak ON program(kaynak) WHERE kaynak != '';
+CREATE TABLE IF NOT EXISTS ayarlar (
+    anahtar TEXT PRIMARY KEY,
+    deger   TEXT
+);
+"""
+
+_GUN_ADLARI = {}
+for _i, _adlar in enumerate([
+        ("pazartesi", "monday", "mon", "pzt"),
+        ("salı", "sali", "tuesday", "tue", "sal"),
+        ("çarşamba", "carsamba", "wednesday", "wed", "çar", "car"),
+        ("perşembe", "persembe", "thursday", "thu", "per"),
+        ("cuma", "friday", "fri", "cum"),
+        ("cumartesi", "saturday", "sat", "cmt"),
+        ("pazar", "sunday", "sun", "paz")]):
+    for _ad in _adlar:
+        _GUN_ADLARI[_ad] = _i
+
+
+def gun_no(deger) -> int:
+    """0–6 tamsayı, '3' ya da Türkçe/İngilizce gün adı → 0–6"""
+    if isinstance(deger, int):
+        gun = deger
+    else:
+        metin = str(deger).strip()
+        gun = int(metin) if metin.isdigit() else _GUN_ADLARI.get(metin.replace("I", "ı").lower())
+    if gun is None or not 0 <= gun <= 6:
+        raise ValueError(f"geçersiz gün: {deger!r}")
+    return gun
+
+
+def dakika(hhmm) -> int:
+    """'H:MM', 'HH:MM' ya da 'HH:MM:SS' → gün başından dakika"""
+    parcalar = str(hhmm).strip().split(":")
+    s, d = int(parcalar[0]), int(parcalar[1])
+    if not (0 <= s <= 24 and 0 <= d < 60):
+        raise ValueError(f"geçersiz saat: {hhmm!r}")
+    return s * 60 + d
+
+
+def tur_kodu(deger, baslik="") -> str:
+    """'Ders' / 'lesson' / 'Teneffüs' / 'break' … → 'DERS' | 'TENEFFUS'"""
+    metin = f"{deger or ''} {baslik or ''}".lower()
+    if any(k in metin for k in ("teneff", "break", "öğle", "ogle")):
+        return "TENEFFUS"
+    return "DERS"
+
+
+# ---------- eski tablo okuyucuları ----------
+# Her okuyucu (gun, tur, baslik, bas_dk, bit_dk, etkin, kaynak_id) üretir.
+
+def _oku_zil(conn):
+    for id, gun, tur, bas, sure in conn.execute("SELECT id, gun, tur, bas_saat, sure FROM zil"):
+        b = dakika(bas)
+        yield gun_no(gun), tur_kodu(tur), "", b, b + int(sure), 1, id
+
+def _oku_zil_programi(conn):
+    for id, gun, tip, baslik, bas, bit, sure in conn.execute(
+            "SELECT id, gun, tip, baslik, baslangic_saat, bitis_saat, sure FROM zil_programi"):
+        b, e = dakika(bas), dakika(bit)
+        if e <= b and sure == e + GUN_DK - b:       # gece yarısını aşan kayıt (zaman_cizelgesi.gece_asar)
+            e += GUN_DK
+        yield gun_no(gun), tur_kodu(tip), baslik or "", b, e, 1, id
+
+def _oku_entries(conn):
+    for id, day, kind, bas, sure, title, enabled in conn.execute(
+            "SELECT id, day, kind, start_time, duration_minutes, title, enabled FROM entries"):
+        b = dakika(bas)
+        yield gun_no(day), tur_kodu(kind), title or "", b, b + int(sure), int(enabled), id
+
+def _oku_bell_schedule(conn):
+    for id, day, bas, bit, tip in conn.execute(
+            "SELECT id, day, start_time, end_time, type FROM bell_schedule"):
+        yield gun_no(day), tur_kodu(tip), "", dakika(bas), dakika(bit), 1, id
+
+def _oku_schedules(conn):
+    for id, day, name, bas, bit in conn.execute(
+            "SELECT id, day, name, start_time, end_time FROM schedules"):
+        yield gun_no(day), tur_kodu("", name), name or "", dakika(bas), dakika(bit), 1, id
+
+def _oku_plans(conn):
+    for id, day, name, bas, bit in conn.execute("SELECT id, day, name, start, end FROM plans"):
+        yield gun_no(day), tur_kodu("", name), name or "", dakika(bas), dakika(bit), 1, id
+
+OKUYUCULAR = {
+    "zil": _oku_zil,
+    "zil_programi": _oku_zil_programi,
+    "entries": _oku_entries,
+    "bell_schedule": _oku_bell_schedule,
+    "schedules": _oku_schedules,
+    "plans": _oku_plans,
+}
+
+
+# ---------- şema / sorgular ----------
+def init_db(conn):
+    conn.executescript(SEMA)
+
+
+def gunluk(conn, gun):
+    """O günün etkin kayıtları: (id, tur, baslik, bas_dk, bit_dk) – indeks taraması"""
+    return conn.execute(
+        "SELECT id, tur, baslik, bas_dk, bit_dk FROM program "
+        "WHERE gun=? AND etkin=1 ORDER BY bas_dk", (gun,)).fetchall()
+
+
+def aralik(conn, gun, bas_dk, bit_dk):
+    """[bas_dk, bit_dk) aralığında başlayan etkin kayıtlar – indeks araması"""
+    return conn.execute(
+        "SELECT id, tur, baslik, bas_dk, bit_dk FROM program "
+        "WHERE gun=? AND bas_dk>=? AND bas_dk<? AND etkin=1 ORDER BY bas_dk",
+        (gun, bas_dk, bit_dk)).fetchall()
+
+
+# ---------- aktarım ----------
+def _satirlar(okuyucu, kaynak, etiket, durum):
+    # durum: okunan satır sayısı ve en son verilen satırın kaynağı (CHECK ihlalinde hangi satır)
+    try:
+        for s in okuyucu(kaynak):
+            durum["okunan"] += 1
+            durum["son"] = f"{etiket}:{s[6]}"
+            yield s[:6] + (durum["son"],)
+    except ValueError as e:
+        raise ValueError(f"{etiket}: {e}") from e
+
+
+def aktar(hedef, kaynaklar=ESKI_DBLER):
+    """
+    Eski veritabanlarını tek transaction'da hedefe aktar; {kaynak: (eklenen, atlanan)}
+    döndürür – atlanan: önceki aktarımdan zaten var olan satır. Şemaya uymayan
+    (ör. ters aralıklı) satır ValueError ile tüm aktarımı geri alır.
+    """
+    sayilar = {}
+    conn = sqlite3.connect(hedef)
+    try:
+        init_db(conn)
+        with conn:
+            for yol in kaynaklar:
+                if not os.path.isfile(yol):
+                    continue
+                # mutlak yol: farklı klasörlerdeki aynı adlı veritabanları çakışmasın
+                ad = os.path.abspath(yol)
+                kaynak = sqlite3.connect(yol)
+                try:
+                    tablolar = {r[0] for r in kaynak.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table'")}
+                    for tablo, okuyucu in OKUYUCULAR.items():
+                        if tablo not in tablolar:
+                            continue
+                        once, durum = conn.total_changes, {"okunan": 0, "son": None}
+                        try:
+                            # yalnızca yinelenen kaynak atlanır; CHECK ihlali aktarımı durdurur
+                            conn.executemany(
+                                "INSERT INTO program (gun, tur, baslik, bas_dk, bit_dk, etkin, kaynak) "
+                                "VALUES (?,?,?,?,?,?,?) ON CONFLICT(kaynak) WHERE kaynak != '' DO NOTHING",
+                                _satirlar(okuyucu, kaynak, f"{ad}:{tablo}", durum))
+                        except sqlite3.IntegrityError as e:
+                            raise ValueError(f"{durum['son']}: {e}") from e
+                        eklenen = conn.total_changes - once
+                        sayilar[f"{yol}:{tablo}"] = (eklenen, durum["okunan"] - eklenen)
+                    if "settings" in tablolar:
+                        conn.executemany("INSERT OR REPLACE INTO ayarlar (anahtar, deger) VALUES (?,?)",
+                                         kaynak.execute("SELECT key, value FROM settings"))
+                finally:
+                    kaynak.close()
+    finally:
+        conn.close()
+    return sayilar
+
+
+def main(argv):
+    hedef = argv[0] if argv else HEDEF_DB
+    kaynaklar = argv[1:] or ESKI_DBLER
+    try:
+        sayilar = aktar(hedef, kaynaklar)
+    except (ValueError, sqlite3.IntegrityError) as e:
+        print(f"[HATA] aktarım geri alındı – {e}")
+        return 1
+    for ad, (eklenen, atlanan) in sayilar.items():
+        print(f"{ad:40s} {eklenen:6d} kayıt" + (f", {atlanan} zaten vardı – atlandı" if atlanan else ""))
+    print(f"→ {hedef}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Değişiklik günlüğü ve merkez → zil bilgisayarı (düğüm) eşitlemesi
+Her yazma, aynı transaction içinde `degisiklik` tablosuna artan sıra
+numarasıyla eklenir. Düğüm, kaynaktan yalnızca son aldığı sıra
+numarasından sonraki değişiklikleri çeker ve tek transaction'da uygular;
+maliyet program boyutuyla değil değişiklik sayısıyla orantılıdır.
+
+Satırlar düğümler arasında `uid` ile eşlenir (yerel id'ler farklıdır). Her
+satırın son değişikliği (zaman, düğüm) damgası taşır; aynı satır iki yerde
+değiştiyse damgası büyük olan kazanır (zaman eşitse düğüm kimliği karar
+verir), yani sonuç iki tarafta da aynıdır. Zaman, saat geri gitse bile
+artan bir hibrit saattir.
+
+  python degisiklik_gunlugu.py cek merkez.db dugum.db
+  python degisiklik_gunlugu.py kimlik dugum.db [--yeni]
+"""
+
+import sys, json, time, uuid, sqlite3, argparse
+from itertools import islice
+
+# eşitlenen tablolar ve kopyalanan sütunları (id hariç)
+TABLOLAR = {
+    "zil":          ("gun", "tur", "bas_saat", "sure", "bolge"),
+    "zil_programi": ("gun", "tip", "baslik", "baslangic_saat", "bitis_saat", "sure"),
+    "istisna":      ("bas_tarih", "bit_tarih", "tur", "plan", "kayma", "bolge", "aciklama"),
+    "plan_zil":     ("plan", "tur", "bas_saat", "sure", "gun"),
+    "plan_kurali":  ("plan", "bas_tarih", "bit_tarih", "aralik", "faz", "bolge", "oncelik"),
+}
+PARCA = 500                 # toplu yakalamada tek sorgudaki satır sayısı
+
+
+def gunluk_kur(conn, tablo):
+    """Günlük tablolarını oluştur, günlükte olmayan satırları yakala (idempotent)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS degisiklik (
+            seq    INTEGER PRIMARY KEY AUTOINCREMENT,
+            tablo  TEXT NOT NULL,
+            uid    TEXT NOT NULL,
+            islem  TEXT NOT NULL CHECK (islem IN ('ekle', 'guncelle', 'sil')),
+            veri   TEXT,
+            zaman  INTEGER NOT NULL,
+            dugum  TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_degisiklik_uid ON degisiklik (tablo, uid)")
+    # satır başına güncel damga; yerel_id NULL → silinmiş (mezar taşı)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS kopya_satir (
+            tablo     TEXT NOT NULL,
+            uid       TEXT NOT NULL,
+            yerel_id  INTEGER,
+            zaman     INTEGER NOT NULL,
+            dugum     TEXT NOT NULL,
+            PRIMARY KEY (tablo, uid)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_kopya_yerel ON kopya_satir (tablo, yerel_id)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dugum (
+            tek     INTEGER PRIMARY KEY CHECK (tek = 1),
+            kimlik  TEXT NOT NULL,
+            saat    INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO dugum (tek, kimlik, saat) VALUES (1, ?, 0)", (uuid.uuid4().hex,))
+    # kaynak düğüm → ondan alınan son sıra numarası
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS senkron (
+            kaynak   TEXT PRIMARY KEY,
+            son_seq  INTEGER NOT NULL
+        )
+    """)
+    yakala(conn, tablo)
+
+
+def yakala(conn, tablo):
+    """
+    Günlüğü atlayarak yapılmış yazmaları (eski sürümler, toplu işlemler)
+    günlüğe geçir: izlenmeyen satırlar 'ekle', kaybolan satırlar 'sil'
+    """
+    eksik = [r[0] for r in conn.execute(
+        f"SELECT id FROM {tablo} WHERE id NOT IN "
+        f"(SELECT yerel_id FROM kopya_satir WHERE tablo = ? AND yerel_id IS NOT NULL) ORDER BY id", (tablo,))]
+    kayip = [r[0] for r in conn.execute(
+        f"SELECT yerel_id FROM kopya_satir WHERE tablo = ? AND yerel_id IS NOT NULL "
+        f"AND yerel_id NOT IN (SELECT id FROM {tablo})", (tablo,))]
+    for yerel_id in kayip:
+        kaydet(conn, tablo, "sil", yerel_id)
+    if eksik:
+        _toplu_ekle(conn, tablo, eksik)
+    return len(eksik) + len(kayip)
+
+
+def _toplu_ekle(conn, tablo, idler):
+    """kaydet(conn, tablo, 'ekle', id) ile aynı, büyük aktarımlar için executemany ile"""
+    zaman, kimlik = _saat(conn)
+    conn.execute("UPDATE dugum SET saat = ? WHERE tek = 1", (zaman + len(idler) - 1,))
+    sutunlar = ", ".join(TABLOLAR[tablo])
+    parcalar = iter(idler)
+    while True:
+        parca = list(islice(parcalar, PARCA))
+        if not parca:
+            break
+        kayitlar = []
+        for yerel_id, *veri in conn.execute(
+                f"SELECT id, {sutunlar} FROM {tablo} WHERE id IN ({', '.join('?' * len(parca))}) ORDER BY id",
+                parca):
+            kayitlar.append((tablo, uuid.uuid4().hex, yerel_id, zaman, json.dumps(veri, ensure_ascii=False)))
+            zaman += 1
+        conn.executemany("INSERT OR REPLACE INTO kopya_satir (tablo, uid, yerel_id, zaman, dugum) "
+                         "VALUES (?, ?, ?, ?, ?)", ((t, u, i, z, kimlik) for t, u, i, z, _ in kayitlar))
+        conn.executemany("INSERT INTO degisiklik (tablo, uid, islem, veri, zaman, dugum) "
+                         "VALUES (?, ?, 'ekle', ?, ?, ?)", ((t, u, v, z, kimlik) for t, u, _, z, v in kayitlar))
+
+
+def dugum_kimligi(conn):
+    satir = conn.execute("SELECT kimlik FROM dugum WHERE tek = 1").fetchone()
+    if satir is None:
+        raise ValueError("veritabanında değişiklik günlüğü yok")
+    return satir[0]
+
+
+def yeni_kimlik(conn):
+    """Kopyalanarak oluşturulmuş veritabanına kendi düğüm kimliğini ver"""
+    kimlik = uuid.uuid4().hex
+    conn.execute("UPDATE dugum SET kimlik = ? WHERE tek = 1", (kimlik,))
+    return kimlik
+
+
+def _saat(conn, gorulen=0):
+    """Hibrit saat: duvar saati, son damga ve görülen en büyük damgadan büyük"""
+    kimlik, saat = conn.execute("SELECT kimlik, saat FROM dugum WHERE tek = 1").fetchone()
+    saat = max(time.time_ns() // 1000, saat + 1, gorulen)
+    conn.execute("UPDATE dugum SET saat = ? WHERE tek = 1", (saat,))
+    return saat, kimlik
+
+
+def _veri(conn, tablo, yerel_id):
+    satir = conn.execute(f"SELECT {', '.join(TABLOLAR[tablo])} FROM {tablo} WHERE id = ?", (yerel_id,)).fetchone()
+    return json.dumps(satir, ensure_ascii=False) if satir is not None else None
+
+
+def kaydet(conn, tablo, islem, yerel_id):
+    """
+    Yazmayı günlüğe ekle – yazmayla aynı transaction içinde, yazmadan sonra
+    çağrılır. islem: 'ekle' | 'guncelle' | 'sil'
+    """
+    zaman, kimlik = _saat(conn)
+    satir = conn.execute("SELECT uid FROM kopya_satir WHERE tablo = ? AND yerel_id = ?",
+                         (tablo, yerel_id)).fetchone()
+    if satir is None:
+        if islem == "sil":
+            return                  # hiç günlüğe girmemiş satır: karşı tarafta da yok
+        uid = uuid.uuid4().hex
+    else:
+        uid = satir[0]
+    veri = None if islem == "sil" else _veri(conn, tablo, yerel_id)
+    conn.execute("INSERT OR REPLACE INTO kopya_satir (tablo, uid, yerel_id, zaman, dugum) VALUES (?,?,?,?,?)",
+                 (tablo, uid, None if islem == "sil" else yerel_id, zaman, kimlik))
+    conn.execute("INSERT INTO degisiklik (tablo, uid, islem, veri, zaman, dugum) VALUES (?,?,?,?,?,?)",
+                 (tablo, uid, islem, veri, zaman, kimlik))
+
+
+# ---------- eşitleme ----------
+def cek(kaynak_db, hedef_db):
+    """
+    kaynak_db'deki yeni değişiklikleri hedef_db'ye uygula (tek transaction).
+    Dönüş: {'alinan', 'uygulanan', 'son_seq', 'catismalar': [(tablo, uid, kazanan), ...]}
+    """
+    kaynak = sqlite3.connect(kaynak_db)
+    hedef = sqlite3.connect(hedef_db, isolation_level=None)
+    hedef.execute("PRAGMA busy_timeout=5000")
+    try:
+        kaynak_kimlik = dugum_kimligi(kaynak)
+        hedef.execute("BEGIN IMMEDIATE")
+        try:
+            sonuc = _uygula(kaynak, hedef, kaynak_kimlik)
+        except BaseException:
+            hedef.execute("ROLLBACK")
+            raise
+        hedef.execute("COMMIT")
+        return sonuc
+    finally:
+        kaynak.close()
+        hedef.close()
+
+
+def _uygula(kaynak, hedef, kaynak_kimlik):
+    hedef_kimlik = dugum_kimligi(hedef)
+    if hedef_kimlik == kaynak_kimlik:
+        raise ValueError("kaynak ve hedef aynı düğüm kimliğini taşıyor (kopyalanmış dosya?) – "
+                         "hedefte 'kimlik --yeni' çalıştırın")
+    tablolar = [t for t in TABLOLAR if hedef.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (t,)).fetchone()]
+    satir = hedef.execute("SELECT son_seq FROM senkron WHERE kaynak = ?", (kaynak_kimlik,)).fetchone()
+    son_seq = satir[0] if satir else 0
+
+    # aynı satırın ardışık değişikliklerinden yalnızca sonuncusu uygulanır
+    son_hal = {}
+    alinan = 0
+    for seq, tablo, uid, islem, veri, zaman, dugum in kaynak.execute(
+            "SELECT seq, tablo, uid, islem, veri, zaman, dugum FROM degisiklik WHERE seq > ? ORDER BY seq",
+            (son_seq,)):
+        alinan += 1
+        son_seq = seq
+        if tablo in tablolar:
+            son_hal.pop((tablo, uid), None)
+            son_hal[(tablo, uid)] = (islem, veri, zaman, dugum)
+
+    uygulanan, catismalar, gorulen = 0, [], 0
+    for (tablo, uid), (islem, veri, zaman, dugum) in son_hal.items():
+        gorulen = max(gorulen, zaman)
+        yerel = hedef.execute("SELECT yerel_id, zaman, dugum FROM kopya_satir WHERE tablo = ? AND uid = ?",
+                              (tablo, uid)).fetchone()
+        if yerel is not None and (yerel[1], yerel[2]) != (zaman, dugum) and yerel[2] == hedef_kimlik \
+                and not kaynak.execute("SELECT 1 FROM degisiklik WHERE tablo = ? AND uid = ? AND zaman = ? "
+                                       "AND dugum = ?", (tablo, uid, yerel[1], yerel[2])).fetchone():
+            # satır burada da değişmiş ve kaynak bu değişikliği hiç görmemiş
+            kazanan = "hedef" if (yerel[1], yerel[2]) > (zaman, dugum) else "kaynak"
+            catismalar.append((tablo, uid, kazanan))
+        if yerel is not None and (yerel[1], yerel[2]) >= (zaman, dugum):
+            continue                # aynı ya da daha yeni hali zaten burada
+        yerel_id = yerel[0] if yerel is not None else None
+        if islem == "sil":
+            if yerel_id is not None:
+                hedef.execute(f"DELETE FROM {tablo} WHERE id = ?", (yerel_id,))
+            yerel_id = None
+        else:
+            sutunlar = TABLOLAR[tablo]
+            degerler = json.loads(veri)
+            if yerel_id is not None:
+                hedef.execute(f"UPDATE {tablo} SET {', '.join(s + ' = ?' for s in sutunlar)} WHERE id = ?",
+                              (*degerler, yerel_id))
+            else:
+                yerel_id = hedef.execute(
+                    f"INSERT INTO {tablo} ({', '.join(sutunlar)}) VALUES ({', '.join('?' * len(sutunlar))})",
+                    degerler).lastrowid
+        hedef.execute("INSERT OR REPLACE INTO kopya_satir (tablo, uid, yerel_id, zaman, dugum) VALUES (?,?,?,?,?)",
+                      (tablo, uid, yerel_id, zaman, dugum))
+        # özgün damgayla günlüğe: bu düğümden çeken başka düğümler de alır
+        hedef.execute("INSERT INTO degisiklik (tablo, uid, islem, veri, zaman, dugum) VALUES (?,?,?,?,?,?)",
+                      (tablo, uid, islem, veri, zaman, dugum))
+        uygulanan += 1
+
+    if gorulen:
+        _saat(hedef, gorulen)
+    hedef.execute("INSERT OR REPLACE INTO senkron (kaynak, son_seq) VALUES (?, ?)", (kaynak_kimlik, son_seq))
+    for tablo, uid, kazanan in catismalar:
+        print(f"[UYARI] çakışma: {tablo}/{uid} iki tarafta da değişti – {kazanan} tarafı kazandı")
+    return {"alinan": alinan, "uygulanan": uygulanan, "son_seq": son_seq, "catismalar": catismalar}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Zil programı değişiklik günlüğü / eşitleme")
+    alt = p.add_subparsers(dest="komut", required=True)
+    c = alt.add_parser("cek", help="kaynaktaki yeni değişiklikleri hedefe uygula")
+    c.add_argument("kaynak")
+    c.add_argument("hedef")
+    k = alt.add_parser("kimlik", help="düğüm kimliğini göster / yenile")
+    k.add_argument("db")
+    k.add_argument("--yeni", action="store_true")
+    a = p.parse_args(argv)
+
+    try:
+        if a.komut == "cek":
+            sonuc = cek(a.kaynak, a.hedef)
+            print(f"{sonuc['alinan']} değişiklik alındı, {sonuc['uygulanan']} uygulandı, "
+                  f"{len(sonuc['catismalar'])} çakışma (son sıra {sonuc['son_seq']})")
+        else:
+            with sqlite3.connect(a.db) as conn:
+                print(yeni_kimlik(conn) if a.yeni else dugum_kimligi(conn))
+    except (sqlite3.Error, ValueError) as e:
+        print(f"[HATA] {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+"Şu an / sıradaki zil" paneli – her iki pencere için
+Günün kayıtları bir kez GunlukAkis'a dizilir (gün değişince ya da yenile()
+ile); şu anki kayıt ve sıradaki zil yalnızca bir sınır geçildiğinde bisect
+ile yeniden bulunur. Her saniye yalnızca kalan süre yazıları güncellenir:
+veritabanına ya da önbelleğe gidilmez.
+"""
+
+from datetime import datetime
+from PyQt5.QtWidgets import QGroupBox, QLabel, QVBoxLayout
+from PyQt5.QtGui import QFont
+from zaman_cizelgesi import GunlukAkis
+
+AKIS_SINIRI = 8     # "bugün kalan" satırında gösterilen en fazla zil
+
+
+def _saat(dk):
+    return f"{dk // 60 % 24:02d}:{dk % 60:02d}"
+
+
+def _sure(sn):
+    sn = max(int(sn), 0)
+    sa, kalan = divmod(sn, 3600)
+    return f"{sa}:{kalan // 60:02d}:{kalan % 60:02d}" if sa else f"{kalan // 60:02d}:{kalan % 60:02d}"
+
+
+class DurumPaneli(QGroupBox):
+    """kaynak(tarih) -> [(bas_dk, bit_dk, ad), ...]; tik() saniyede bir çağrılır"""
+
+    def __init__(self, kaynak, parent=None):
+        super().__init__("Şu An", parent)
+        self.kaynak = kaynak
+        self._tarih = None
+        self._akis = None       # GunlukAkis – gün değişince / yenile() ile kurulur
+        self._durum = None      # AkisDurumu – sınır geçilince yeniden sorulur
+
+        self.guncel_label = QLabel()
+        self.guncel_label.setFont(QFont("Arial", 12, QFont.Bold))
+        self.sonraki_label = QLabel()
+        self.akis_label = QLabel()
+        self.akis_label.setWordWrap(True)
+        self.akis_label.setStyleSheet("color: #555;")
+        layout = QVBoxLayout(self)
+        for w in (self.guncel_label, self.sonraki_label, self.akis_label):
+            layout.addWidget(w)
+
+    def yenile(self):
+        """Program değişti: akışı yeniden kur"""
+        self._akis = None
+        self.tik()
+
+    def tik(self, simdi=None):
+        simdi = simdi or datetime.now()
+        sn = simdi.hour * 3600 + simdi.minute * 60 + simdi.second + simdi.microsecond / 1e6
+        if self._akis is None or simdi.date() != self._tarih:
+            self._tarih = simdi.date()
+            self._akis = GunlukAkis(self.kaynak(self._tarih))
+            self._durum = None
+        if self._durum is None or sn >= self._durum.gecerlilik:
+            self._durum = self._akis.durum(sn)
+            kalanlar = self._durum.kalanlar
+            metin = "  ·  ".join(f"{_saat(bas)} {ad}" for bas, _, ad in kalanlar[:AKIS_SINIRI])
+            if len(kalanlar) > AKIS_SINIRI:
+                metin += f"  ·  … (+{len(kalanlar) - AKIS_SINIRI})"
+            self.akis_label.setText(f"Bugün kalan: {metin}" if kalanlar else "Bugün kalan zil yok")
+
+        d = self._durum
+        if d.guncel is not None:
+            bas, bit, ad = d.guncel
+            self.guncel_label.setText(f"{ad}  ({_saat(bas)}–{_saat(bit)})  –  {_sure(bit * 60 - sn)} kaldı")
+        else:
+            self.guncel_label.setText("Şu an ders / teneffüs yok")
+        if d.sonraki is not None:
+            bas, _, ad = d.sonraki
+            self.sonraki_label.setText(f"Sıradaki zil: {_saat(bas)} {ad}  –  {_sure(bas * 60 - sn)} sonra")
+        else:
+            self.sonraki_label.setText("Sıradaki zil: bugün yok")
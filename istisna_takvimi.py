@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İstisna takvimi – tatil, sınav günü, yarım gün, A/B haftası, dönem
+Haftalık program hafta gününe (0–6) bağlıdır. Adlandırılmış planlar
+(plan_zil) hafta günü başına ya da her gün için zil listesidir; dönüşüm
+kuralları (plan_kurali) bir dönemde, her N haftanın belirli haftasında
+haftalık program yerine bir planı geçerli kılar. İstisnalar tarih aralığıdır:
+  tatil   → o tarihlerde zil çalmaz
+  plan    → günün programı yerine adlandırılmış bir plan (ör. 'yarim_gun') çalar
+  kaydir  → tüm zil saatleri `kayma` dakika ileri / geri kayar
+Etkin program (bölge, tarih) başına ilk sorulduğunda çözülüp saklanır:
+önümüzdeki haftalar ufuk sözlüğünde, diğer tarihler LRU'da; zamanlayıcı
+kural değerlendirmez, sözlükten okur. Bir istisna / kural
+değişince yalnızca kapsadığı tarihler, haftalık program değişince yalnızca o
+hafta gününe düşen tarihler geçersizlenir.
+
+  python istisna_takvimi.py liste zil_programi.db
+  python istisna_takvimi.py ekle zil_programi.db 2026-10-29 [2026-10-29] tatil [--aciklama …] [--bolge B]
+  python istisna_takvimi.py ekle zil_programi.db 2027-01-15 plan --plan yarim_gun
+  python istisna_takvimi.py ekle zil_programi.db 2027-02-01 2027-02-05 kaydir --kayma 30
+  python istisna_takvimi.py sil zil_programi.db 3
+  python istisna_takvimi.py plan zil_programi.db yarim_gun DERS,08:30,30 TENEFFUS,09:00,10 …
+  python istisna_takvimi.py plan zil_programi.db B_haftasi --gun 0 DERS,08:00,40 …
+  python istisna_takvimi.py kural zil_programi.db B_haftasi --bas 2026-09-07 --bit 2027-01-22 --her 2 --faz 1
+  python istisna_takvimi.py kural-sil zil_programi.db 2
+  python istisna_takvimi.py goster zil_programi.db 2027-01-15 [--bolge B]
+"""
+
+import sys, argparse
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from degisiklik_gunlugu import gunluk_kur
+from zaman_cizelgesi import GUNLER, GUN_DK, saat_dakika
+from zamanlayici import VARSAYILAN_BOLGE
+
+TATIL, PLAN, KAYDIR = "tatil", "plan", "kaydir"
+TURLER    = (TATIL, PLAN, KAYDIR)
+ILERI_GUN = 28              # önceden çözülen gün sayısı (bugünden itibaren)
+LRU_BOYUT = 2048            # ufuk dışında saklanan (bölge, tarih) sayısı
+DEVIR     = date(2001, 1, 1)    # Pazartesi – dönemsiz kuralların hafta sayımı başlangıcı
+
+
+def istisna_kur(conn):
+    """İstisna ve plan tablolarını oluştur (idempotent); çağıran commit eder"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS istisna (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            bas_tarih  TEXT NOT NULL,                   -- 'YYYY-MM-DD'
+            bit_tarih  TEXT NOT NULL,                   -- dahil
+            tur        TEXT NOT NULL CHECK (tur IN ('tatil', 'plan', 'kaydir')),
+            plan       TEXT,                            -- tur='plan': plan_zil.plan
+            kayma      INTEGER NOT NULL DEFAULT 0,      -- tur='kaydir': dakika (+ ileri, - geri)
+            bolge      TEXT,                            -- NULL → tüm bölgeler
+            aciklama   TEXT NOT NULL DEFAULT ''
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS plan_zil (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan      TEXT NOT NULL,
+            tur       TEXT NOT NULL,
+            bas_saat  TEXT NOT NULL,
+            sure      INTEGER NOT NULL,
+            gun       INTEGER                          -- 0–6; NULL → her gün
+        )
+    """)
+    # eski veritabanları: gün sütunu (haftalık planlar) sonradan eklendi
+    if "gun" not in {r[1] for r in conn.execute("PRAGMA table_info(plan_zil)")}:
+        conn.execute("ALTER TABLE plan_zil ADD COLUMN gun INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_plan_zil_plan ON plan_zil (plan)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS plan_kurali (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan      TEXT NOT NULL,                    -- plan_zil.plan
+            bas_tarih TEXT,                             -- dönem; NULL → sınırsız
+            bit_tarih TEXT,
+            aralik    INTEGER NOT NULL DEFAULT 1,       -- her N haftada bir
+            faz       INTEGER NOT NULL DEFAULT 0,       -- 0 … aralik-1
+            bolge     TEXT,                             -- NULL → tüm bölgeler
+            oncelik   INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    gunluk_kur(conn, "istisna")
+    gunluk_kur(conn, "plan_zil")
+    gunluk_kur(conn, "plan_kurali")
+
+
+def tarih_coz(metin):
+    """'YYYY-MM-DD' → date; hatalıysa ValueError"""
+    if isinstance(metin, date):
+        return metin
+    try:
+        return date.fromisoformat(str(metin).strip())
+    except ValueError:
+        raise ValueError(f"tarih 'YYYY-MM-DD' olmalı: {metin!r}") from None
+
+
+class Istisna:
+    __slots__ = ("id", "bas", "bit", "tur", "plan", "kayma", "bolge", "aciklama")
+
+    def __init__(self, id, bas, bit, tur, plan=None, kayma=0, bolge=None, aciklama=""):
+        self.id, self.bas, self.bit, self.tur = id, tarih_coz(bas), tarih_coz(bit), tur
+        self.plan, self.kayma, self.bolge, self.aciklama = plan, kayma or 0, bolge, aciklama or ""
+
+    def kapsar(self, tarih, bolge):
+        return self.bas <= tarih <= self.bit and (self.bolge is None or self.bolge == bolge)
+
+    def tarihler(self):
+        t = self.bas
+        while t <= self.bit:
+            yield t
+            t += timedelta(days=1)
+
+    def __str__(self):
+        aralik = str(self.bas) if self.bas == self.bit else f"{self.bas} – {self.bit}"
+        ayrinti = {PLAN: f" {self.plan}", KAYDIR: f" {self.kayma:+d} dk"}.get(self.tur, "")
+        yer = f" [{self.bolge}]" if self.bolge else ""
+        aciklama = f" – {self.aciklama}" if self.aciklama else ""
+        return f"#{self.id} {aralik}{yer}: {self.tur}{ayrinti}{aciklama}"
+
+    def __repr__(self):
+        return f"Istisna({self.id}, {str(self.bas)!r}, {str(self.bit)!r}, {self.tur!r})"
+
+
+def istisna_dogrula(bas, bit, tur, plan=None, kayma=0):
+    """Alanları doğrula; (bas, bit) date döner, hatalıysa ValueError"""
+    bas = tarih_coz(bas)
+    bit = tarih_coz(bit) if bit else bas
+    if bit < bas:
+        raise ValueError("bitiş tarihi başlangıçtan önce olamaz")
+    if tur not in TURLER:
+        raise ValueError(f"tür {' | '.join(TURLER)} olmalı")
+    if tur == PLAN and not plan:
+        raise ValueError("'plan' istisnası için plan adı gerekli")
+    if tur == KAYDIR and (not isinstance(kayma, int) or not kayma or abs(kayma) >= GUN_DK):
+        raise ValueError("'kaydir' istisnası için sıfırdan farklı kayma (dakika) gerekli")
+    return bas, bit
+
+
+def coz(taban, istisnalar, plan_zilleri):
+    """
+    Tek tarihin etkin programı. taban: haftalık ya da dönüşüm planından
+    (tur, bas_saat, sure) listesi, istisnalar: o tarihi kapsayanlar (id
+    sıralı), plan_zilleri(ad): planın o günkü zilleri. Tatil her şeyi ezer;
+    son plan geçerlidir; kaymalar toplanır ve plana da uygulanır. Kayınca
+    gün dışına taşan ziller düşer.
+    """
+    ziller, kayma = taban, 0
+    for i in istisnalar:
+        if i.tur == TATIL:
+            return ()
+        if i.tur == PLAN:
+            ziller = plan_zilleri(i.plan)
+        else:
+            kayma += i.kayma
+    if not kayma:
+        return tuple(ziller)
+    sonuc = []
+    for tur, bas_saat, sure in ziller:
+        bas = saat_dakika(bas_saat) + kayma
+        if 0 <= bas < GUN_DK:
+            sonuc.append((tur, f"{bas // 60:02d}:{bas % 60:02d}", sure))
+    return tuple(sonuc)
+
+
+def hafta_no(tarih):
+    """DEVIR'den bu yana hafta sayısı (Pazartesi başlar; ISO yıl dönümünde kaymaz)"""
+    return (tarih - DEVIR).days // 7
+
+
+class PlanKurali:
+    """
+    Dönüşüm kuralı: bas–bit (dönem; boş → sınırsız) arasında, her `aralik`
+    haftanın `faz`. haftasında haftalık program yerine `plan` çalar. Haftalar
+    dönem başının haftasından (dönem yoksa DEVIR'den) sayılır: A/B haftası için
+    aralik=2 ile faz=0 (A) ve faz=1 (B) iki kural. Çakışan kurallardan
+    önceliği yüksek, eşitse sonra ekleneni geçerlidir.
+    """
+    __slots__ = ("id", "plan", "bas", "bit", "aralik", "faz", "bolge", "oncelik")
+
+    def __init__(self, id, plan, bas=None, bit=None, aralik=1, faz=0, bolge=None, oncelik=0):
+        self.id, self.plan = id, plan
+        self.bas = tarih_coz(bas) if bas else None
+        self.bit = tarih_coz(bit) if bit else None
+        self.aralik, self.faz, self.bolge, self.oncelik = aralik or 1, faz or 0, bolge, oncelik or 0
+
+    def uyar(self, tarih, bolge):
+        if self.bolge is not None and self.bolge != bolge:
+            return False
+        if self.bas is not None and tarih < self.bas or self.bit is not None and tarih > self.bit:
+            return False
+        return (hafta_no(tarih) - hafta_no(self.bas or DEVIR) - self.faz) % self.aralik == 0
+
+    def __str__(self):
+        donem = f"{self.bas or '…'} – {self.bit or '…'}"
+        tekrar = f", {self.aralik} haftada bir (faz {self.faz})" if self.aralik > 1 else ""
+        yer = f" [{self.bolge}]" if self.bolge else ""
+        oncelik = f", öncelik {self.oncelik}" if self.oncelik else ""
+        return f"kural #{self.id} {donem}{yer}: {self.plan}{tekrar}{oncelik}"
+
+    def __repr__(self):
+        return f"PlanKurali({self.id}, {self.plan!r})"
+
+
+def kural_dogrula(plan, bas=None, bit=None, aralik=1, faz=0):
+    if not plan:
+        raise ValueError("plan adı boş olamaz")
+    bas = tarih_coz(bas) if bas else None
+    bit = tarih_coz(bit) if bit else None
+    if bas is not None and bit is not None and bit < bas:
+        raise ValueError("dönem sonu başlangıçtan önce olamaz")
+    if not isinstance(aralik, int) or aralik < 1:
+        raise ValueError("aralik 1 ya da daha büyük olmalı")
+    if not isinstance(faz, int) or not 0 <= faz < aralik:
+        raise ValueError(f"faz 0 … {aralik - 1} olmalı")
+    return bas, bit
+
+
+class TarihOnbellegi:
+    """
+    (bölge, tarih) → etkin program (tur, bas_saat, sure) demeti.
+    taban(bolge, gun) haftalık programı verir. Ufuk (bugünden itibaren
+    ILERI_GUN) içindeki tarihler sabit bir sözlükte, GUI'nin baktığı diğer tarihler
+    LRU_BOYUT ile sınırlı bir LRU'da tutulur; yıllarca kural yüklü olsa da
+    bellek sınırlıdır. Kilitleme çağıranındır (ProgramOnbellegi kendi
+    kilidi altında kullanır).
+    """
+
+    def __init__(self, taban, istisnalar=(), planlar=None, kurallar=()):
+        self._taban = taban
+        self._istisnalar = {i.id: i for i in istisnalar}
+        self._planlar = {ad: dict(gunler) for ad, gunler in (planlar or {}).items()}
+        self._kurallar = {k.id: k for k in kurallar}
+        self._kural_sirasi()
+        self._ufuk = (date.min, date.min)       # [bas, bit) – _tarihler'in kapsadığı günler
+        self._tarihler = {}                     # ufuk içi: (bolge, date) → demet
+        self._lru = OrderedDict()               # ufuk dışı: (bolge, date) → demet, en eskisi başta
+
+    def gun(self, bolge, tarih):
+        """Hazırsa sözlükten; değilse şimdi çözülüp saklanır"""
+        anahtar = (bolge, tarih)
+        ziller = self._tarihler.get(anahtar)
+        if ziller is not None:
+            return ziller
+        if self._ufuk[0] <= tarih < self._ufuk[1]:
+            ziller = self._tarihler[anahtar] = self._coz(bolge, tarih)
+            return ziller
+        ziller = self._lru.get(anahtar)
+        if ziller is not None:
+            self._lru.move_to_end(anahtar)
+            return ziller
+        ziller = self._lru[anahtar] = self._coz(bolge, tarih)
+        if len(self._lru) > LRU_BOYUT:
+            self._lru.popitem(last=False)
+        return ziller
+
+    def onhesapla(self, bolgeler, bas, gun_sayisi=ILERI_GUN):
+        """Ufku bas'tan itibaren gun_sayisi güne taşı, bolgeler'in günlerini şimdi çöz; ufuktan çıkan tarihler LRU'ya düşer"""
+        self._ufuk = (bas, bas + timedelta(days=gun_sayisi))
+        for anahtar in [a for a in self._tarihler if not bas <= a[1] < self._ufuk[1]]:
+            self._lru[anahtar] = self._tarihler.pop(anahtar)
+        while len(self._lru) > LRU_BOYUT:
+            self._lru.popitem(last=False)
+        for ek in range(gun_sayisi):
+            tarih = bas + timedelta(days=ek)
+            for bolge in bolgeler:
+                anahtar = (bolge, tarih)
+                if anahtar not in self._tarihler:
+                    ziller = self._lru.pop(anahtar, None)
+                    self._tarihler[anahtar] = ziller if ziller is not None else self._coz(bolge, tarih)
+
+    def plan_adi(self, bolge, tarih):
+        """Tarihte geçerli dönüşüm planının adı ya da None (haftalık program)"""
+        j = bisect_right(self._kural_baslari, tarih)
+        adaylar = [k for k in self._kural_listesi[:j] if k.uyar(tarih, bolge)]
+        return max(adaylar, key=lambda k: (k.oncelik, k.id)).plan if adaylar else None
+
+    def _coz(self, bolge, tarih):
+        gun = tarih.weekday()
+        plan = self.plan_adi(bolge, tarih)
+        taban = self._taban(bolge, gun) if plan is None else self._plan_gunu(plan, gun)
+        kapsayan = [i for _, i in sorted(self._istisnalar.items()) if i.kapsar(tarih, bolge)]
+        return coz(taban, kapsayan, lambda ad: self._plan_gunu(ad, gun))
+
+    def _plan_gunu(self, plan, gun):
+        """Planın o hafta günü zilleri: güne özel + her gün (gun NULL) satırları"""
+        gunler = self._planlar.get(plan, {})
+        return sorted(gunler.get(gun, ()) + gunler.get(None, ()), key=lambda z: z[1])
+
+    def _kural_sirasi(self):
+        self._kural_listesi = sorted(self._kurallar.values(), key=lambda k: k.bas or date.min)
+        self._kural_baslari = [k.bas or date.min for k in self._kural_listesi]
+
+    # ---------- geçersizleme ----------
+    def _sil(self, kosul):
+        for sozluk in (self._tarihler, self._lru):
+            for anahtar in [a for a in sozluk if kosul(*a)]:
+                del sozluk[anahtar]
+
+    def program_degisti(self, bolge=None, gun=None):
+        """Haftalık program değişti: bölgenin (None → hepsi) o hafta gününe (None → hepsi) düşen tarihleri"""
+        self._sil(lambda b, t: (bolge is None or b == bolge) and (gun is None or t.weekday() == gun))
+
+    def istisna_degisti(self, eski=None, yeni=None):
+        """İstisna eklendi / silindi / değişti: yalnızca kapsadığı tarihler"""
+        if eski is not None:
+            self._istisnalar.pop(eski.id, None)
+            self._unut(eski)
+        if yeni is not None:
+            self._istisnalar[yeni.id] = yeni
+            self._unut(yeni)
+
+    def kural_degisti(self, eski=None, yeni=None):
+        """Kural eklendi / silindi / değişti: yalnızca dönemine (ve bölgesine) düşen tarihler"""
+        for kural in (eski, yeni):
+            if kural is not None:
+                self._sil(lambda b, t, k=kural: (k.bolge is None or b == k.bolge) and
+                          (k.bas is None or t >= k.bas) and (k.bit is None or t <= k.bit))
+        if eski is not None:
+            self._kurallar.pop(eski.id, None)
+        if yeni is not None:
+            self._kurallar[yeni.id] = yeni
+        self._kural_sirasi()
+
+    def plan_degisti(self, plan, gun, ziller):
+        """Planın bir günü (None → her gün) değişti: yalnızca o planı kullanan tarihler"""
+        gunler = self._planlar.setdefault(plan, {})
+        if ziller:
+            gunler[gun] = tuple(ziller)
+        else:
+            gunler.pop(gun, None)
+        if not gunler:
+            del self._planlar[plan]
+        for i in self._istisnalar.values():
+            if i.tur == PLAN and i.plan == plan:
+                self._unut(i)
+        self._sil(lambda b, t: (gun is None or t.weekday() == gun) and self.plan_adi(b, t) == plan)
+
+    def _unut(self, istisna):
+        if (istisna.bit - istisna.bas).days > len(self._tarihler) + len(self._lru):
+            # uzun aralık: saklı tarihleri taramak aralığı gezmekten ucuz
+            self._sil(lambda b, t: istisna.kapsar(t, b))
+            return
+        bolgeler = {istisna.bolge} if istisna.bolge is not None else \
+            {b for b, _ in self._tarihler} | {b for b, _ in self._lru}
+        for tarih in istisna.tarihler():
+            for bolge in bolgeler:
+                self._tarihler.pop((bolge, tarih), None)
+                self._lru.pop((bolge, tarih), None)
+
+    # ---------- okuma ----------
+    def istisnalar(self, tarih=None, bolge=None):
+        """Tüm istisnalar (id sıralı) ya da tarihi kapsayanlar"""
+        return [i for _, i in sorted(self._istisnalar.items())
+                if tarih is None or i.bas <= tarih <= i.bit and (bolge is None or i.bolge in (None, bolge))]
+
+    def kurallar(self):
+        return [k for _, k in sorted(self._kurallar.items())]
+
+    def planlar(self):
+        """{plan adı: {gun | None: ((tur, bas_saat, sure), ...)}}"""
+        return {ad: dict(gunler) for ad, gunler in self._planlar.items()}
+
+
+# ---------- komut satırı ----------
+def _plan_zili(metin):
+    try:
+        tur, bas_saat, sure = metin.split(",")
+        saat_dakika(bas_saat)
+        return tur.strip().upper(), bas_saat.strip(), int(sure)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'TUR,HH:MM,SURE' bekleniyor: {metin}") from None
+
+
+def main(argv=None):
+    from program_onbellek import ProgramOnbellegi, init_db
+
+    p = argparse.ArgumentParser(description="Tatil / sınav / yarım gün istisnaları, dönüşüm planları")
+    alt = p.add_subparsers(dest="komut", required=True)
+    a = alt.add_parser("liste", help="istisnaları, kuralları ve planları listele")
+    a.add_argument("db")
+    a = alt.add_parser("ekle", help="istisna ekle")
+    a.add_argument("db")
+    a.add_argument("bas")
+    a.add_argument("bit", nargs="?")
+    a.add_argument("tur", choices=TURLER)
+    a.add_argument("--plan")
+    a.add_argument("--kayma", type=int, default=0, help="dakika (+ ileri, - geri)")
+    a.add_argument("--bolge")
+    a.add_argument("--aciklama", default="")
+    a = alt.add_parser("sil", help="istisna sil")
+    a.add_argument("db")
+    a.add_argument("id", type=int)
+    a = alt.add_parser("plan", help="adlandırılmış planı tanımla (zil verilmezse siler)")
+    a.add_argument("db")
+    a.add_argument("ad")
+    a.add_argument("--gun", type=int, choices=range(7), help="0 Pazartesi … 6 Pazar (verilmezse her gün)")
+    a.add_argument("ziller", nargs="*", type=_plan_zili, metavar="TUR,HH:MM,SURE")
+    a = alt.add_parser("kural", help="dönüşüm kuralı ekle: dönemde her N haftanın bir haftasında plan")
+    a.add_argument("db")
+    a.add_argument("plan")
+    a.add_argument("--bas", help="dönem başı YYYY-MM-DD (haftalar buradan sayılır)")
+    a.add_argument("--bit", help="dönem sonu YYYY-MM-DD (dahil)")
+    a.add_argument("--her", type=int, default=1, metavar="N", help="her N haftada bir")
+    a.add_argument("--faz", type=int, default=0, help="0 … N-1: kaçıncı hafta")
+    a.add_argument("--bolge")
+    a.add_argument("--oncelik", type=int, default=0)
+    a = alt.add_parser("kural-sil", help="dönüşüm kuralını sil")
+    a.add_argument("db")
+    a.add_argument("id", type=int)
+    a = alt.add_parser("goster", help="bir tarihin etkin programı")
+    a.add_argument("db")
+    a.add_argument("tarih")
+    a.add_argument("--bolge", default=None)
+    a = p.parse_args(argv)
+
+    try:
+        init_db(a.db)
+        program = ProgramOnbellegi(a.db)
+        if a.komut == "liste":
+            for i in program.istisnalar():
+                print(i)
+            for k in program.kurallar():
+                print(k)
+            for ad, gunler in sorted(program.planlar().items()):
+                for gun, ziller in sorted(gunler.items(), key=lambda g: -1 if g[0] is None else g[0]):
+                    gun_adi = "her gün" if gun is None else GUNLER[gun]
+                    print(f"plan {ad} ({gun_adi}): " + ", ".join(f"{t} {s} ({d} dk)" for t, s, d in ziller))
+        elif a.komut == "ekle":
+            print(f"istisna #{program.istisna_ekle(a.bas, a.bit, a.tur, a.plan, a.kayma, a.bolge, a.aciklama)}")
+        elif a.komut == "sil":
+            if not program.istisna_sil(a.id):
+                print(f"[HATA] istisna yok: #{a.id}")
+                return 1
+        elif a.komut == "plan":
+            program.plan_ayarla(a.ad, a.ziller, a.gun)
+        elif a.komut == "kural":
+            print(f"kural #{program.kural_ekle(a.plan, a.bas, a.bit, a.her, a.faz, a.bolge, a.oncelik)}")
+        elif a.komut == "kural-sil":
+            if not program.kural_sil(a.id):
+                print(f"[HATA] kural yok: #{a.id}")
+                return 1
+        else:
+            tarih = tarih_coz(a.tarih)
+            bolge = a.bolge or VARSAYILAN_BOLGE
+            plan = program.plan_adi(tarih, bolge)
+            print(f"{tarih} {GUNLER[tarih.weekday()]}: {f'plan {plan}' if plan else 'haftalık program'}")
+            for i in program.istisnalar(tarih, bolge):
+                print(i)
+            for tur, bas_saat, sure in program.tarih(tarih, bolge):
+                print(f"{bas_saat}  {tur:<9} {sure} dk")
+    except ValueError as e:
+        print(f"[HATA] {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Başarım kıyaslaması – sentetik büyük programlarla veritabanı, zamanlayıcı ve arayüz yolları
+10 … 1.000.000 kayıtlık, çok bölgeli sentetik programlar geçici bir
+klasörde üretilir; her yol için en iyi süre ve tracemalloc tepe belleği
+ölçülür. Sonuçlar JSON taban olarak kaydedilir; sonraki bir çalıştırma
+tabanla karşılaştırılır, toleransı aşan gerileme varsa çıkış kodu 1'dir.
+
+  python kiyaslama.py [--boyut 10,1000,100000] [--bolge-sayisi N] [--tekrar 3]
+                      [--kaydet taban.json] [--karsilastir taban.json] [--tolerans 1.5]
+
+Qt yolları (doldur, load_all_data, acilis) QT_QPA_PLATFORM=offscreen ile pencere
+açmadan çalışır; PyQt5 yoksa atlanır. tracemalloc yalnızca Python
+ayırmalarını görür, Qt'nin C++ belleği sayılmaz.
+"""
+
+import os, sys, gc, json, time, argparse, platform, tempfile, tracemalloc
+from datetime import date, datetime, timedelta
+from zaman_cizelgesi import GUNLER, GUN_DK
+from zamanlayici import ZilZamanlayici, SanalSaat, VARSAYILAN_BOLGE
+from program_onbellek import ProgramOnbellegi, init_db
+from simulasyon import simule_et
+
+BOYUTLAR      = (10, 1000, 100000)      # 1_000_000 --boyut ile
+GUNLUK_ZIL    = 40          # bölge başına günlük zil – bölge sayısı verilmezse buna göre bölünür
+TEKRAR        = 3
+TOLERANS      = 1.5         # süre tabanın bu katını aşarsa gerileme
+BELLEK_TOLERANS = 1.25
+MIN_FARK_SN   = 0.002       # küçük boyutlarda ölçüm gürültüsü gerileme sayılmaz
+MIN_FARK_KB   = 64
+TABAN_SURUM   = 1
+YOLLAR        = ("toplu_ekle", "onbellek_yukle", "zamanlayici_kur", "gun_oynat",
+                 "zilleri_getir", "doldur", "load_all_data", "acilis")
+QT_YOLLARI    = YOLLAR[4:]      # PyQt5 modüllerini içe aktarır
+
+
+# ---------- sentetik program ----------
+def sentetik_program(boyut, bolge_sayisi=None):
+    """
+    boyut kayıt: [(gun, tur, bas_saat, sure, bolge), ...] – bölge / gün başına
+    çakışmasız, DERS / TENEFFUS dönüşümlü. İlk bölge VARSAYILAN_BOLGE'dir.
+    Bir güne sığmayacaksa bölge sayısı artırılır.
+    """
+    bolge_sayisi = max(bolge_sayisi or boyut // (7 * GUNLUK_ZIL) or 1, -(-boyut // (7 * GUN_DK)))
+    gunluk = -(-boyut // (7 * bolge_sayisi))
+    adim = max(1, min(60, GUN_DK // gunluk))
+    ilk = 7 * 60 if gunluk * adim <= GUN_DK - 7 * 60 else GUN_DK - gunluk * adim
+    ziller = []
+    for i in range(boyut):
+        bolge, kalan = divmod(i, 7 * gunluk)
+        gun, sira = divmod(kalan, gunluk)
+        dk = ilk + sira * adim
+        ziller.append((gun, "DERS" if sira % 2 == 0 else "TENEFFUS", f"{dk // 60:02d}:{dk % 60:02d}",
+                       adim, VARSAYILAN_BOLGE if bolge == 0 else f"b{bolge}"))
+    return ziller
+
+
+def zil_programi_satirlari(ziller):
+    """Aynı program, zil_programi.py tablosu biçiminde: (gun, tip, baslik, baslangic, bitis, sure)"""
+    satirlar = []
+    for gun, tur, bas_saat, sure, bolge in ziller:
+        bit = int(bas_saat[:2]) * 60 + int(bas_saat[3:]) + sure
+        satirlar.append((GUNLER[gun], "Ders" if tur == "DERS" else "Teneffüs", f"{bolge} {bas_saat}",
+                         bas_saat, f"{bit // 60 % 24:02d}:{bit % 60:02d}", sure))
+    return satirlar
+
+
+# ---------- ölçüm ----------
+def olc(is_, tekrar=TEKRAR, hazirlik=None):
+    """
+    is_() → (en iyi süre sn, tepe bellek KB). Süre tracemalloc kapalıyken
+    ölçülür, bellek ayrı bir çalıştırmada; hazirlik() her çalıştırmadan önce
+    çağrılır ve süreye girmez.
+    """
+    sureler = []
+    for _ in range(tekrar):
+        if hazirlik:
+            hazirlik()
+        gc.collect()
+        t0 = time.perf_counter()
+        is_()
+        sureler.append(time.perf_counter() - t0)
+    if hazirlik:
+        hazirlik()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        is_()
+        tepe = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(sureler), tepe / 1024
+
+
+def _qt_uygulamasi():
+    """Ekransız QApplication ya da PyQt5 yoksa None"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return None
+    return QApplication.instance() or QApplication([])
+
+
+def kiyasla(boyut, bolge_sayisi=None, tekrar=TEKRAR, yollar=YOLLAR):
+    """Tek boyut için seçili yolları ölç: {yol: {"sn", "tepe_kb", ...}}"""
+    sonuclar = {}
+    ziller = sentetik_program(boyut, bolge_sayisi)
+    bolgeler = len({z[4] for z in ziller})
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="kiyaslama_") as klasor:
+        os.chdir(klasor)     # zil_programi.py varsayılan dosya adıyla açar
+        try:
+            db_file = os.path.join(klasor, "zil_programi.db")
+            init_db(db_file)
+            yazici = ProgramOnbellegi(db_file)
+
+            def kaydet(yol, sonuc, **ek):
+                sonuclar[yol] = {"sn": round(sonuc[0], 6), "tepe_kb": round(sonuc[1], 1),
+                                 "bolge": bolgeler, **ek}
+
+            # toplu ekleme: tek transaction + değişiklik günlüğü + önbelleğin yeniden kurulması
+            if "toplu_ekle" in yollar:
+                kaydet("toplu_ekle", olc(lambda: yazici.toplu_degistir(ziller), tekrar))
+            else:
+                yazici.toplu_degistir(ziller)
+
+            if "onbellek_yukle" in yollar:
+                kaydet("onbellek_yukle", olc(lambda: ProgramOnbellegi(db_file).gun(0), tekrar))
+
+            bugun = date.today()
+            bugun += timedelta(days=-bugun.weekday() % 7)     # önümüzdeki pazartesi: boyuttan bağımsız aynı gün
+            kaynak = lambda b, t: yazici.tarih(t, b)
+            adlar = yazici.bolgeler()
+            if "zamanlayici_kur" in yollar:
+                # tüm bölgelerin bugünkü + yarınki kuyrukları kurulup sıradaki zil seçilir
+                motor = []
+                def hazirla():
+                    saat = SanalSaat(datetime(bugun.year, bugun.month, bugun.day, 6).timestamp())
+                    motor[:] = [ZilZamanlayici(saat=saat)]
+                    motor[0].bolgeleri_esitle(adlar, kaynak, lambda ad: lambda tur, sure: None)
+                kaydet("zamanlayici_kur", olc(lambda: motor[0].sonraki(), tekrar, hazirla))
+            if "gun_oynat" in yollar:
+                # sanal saatle bir günün bütün zilleri: olay başına sıradaki zilin seçimi
+                calan = []
+                sonuc = olc(lambda: calan.__setitem__(slice(None), simule_et(kaynak, adlar, bugun, bugun)), tekrar)
+                kaydet("gun_oynat", sonuc, zil=len(calan))
+
+            qt_yollari = [y for y in QT_YOLLARI if y in yollar]
+            if qt_yollari and _qt_uygulamasi() is None:
+                qt_yollari = []
+            if "doldur" in qt_yollari:
+                import main
+                main.DB_FILE = db_file
+                pencere = main.MainWindow(zil_cal=False)
+                kaydet("doldur", olc(pencere.doldur, tekrar), satir=pencere.liste.count())
+                pencere.close()
+            if {"zilleri_getir", "load_all_data", "acilis"} & set(qt_yollari):
+                import zil_programi
+                db = zil_programi.DatabaseManager()
+                with db.transaction() as conn:
+                    conn.executemany("INSERT INTO zil_programi (gun, tip, baslik, baslangic_saat, bitis_saat, sure) "
+                                     "VALUES (?, ?, ?, ?, ?, ?)", zil_programi_satirlari(ziller))
+                if "zilleri_getir" in qt_yollari:
+                    kaydet("zilleri_getir", olc(db.zilleri_getir, tekrar))
+                db.kapat()
+                if "load_all_data" in qt_yollari:
+                    pencere = zil_programi.OkulZilProgrami(zil_cal=False)
+                    kaydet("load_all_data", olc(pencere.load_all_data, tekrar))
+                    pencere.close()
+                if "acilis" in qt_yollari:
+                    # pencere kurulumu; veri ilk olay döngüsü turunda yüklenir – boyuttan bağımsız kalmalı
+                    pencereler = []
+                    kaydet("acilis", olc(lambda: pencereler.append(zil_programi.OkulZilProgrami(zil_cal=False)), tekrar))
+                    for pencere in pencereler:
+                        pencere.close()
+        finally:
+            os.chdir(cwd)
+    return sonuclar
+
+
+# ---------- taban ----------
+def taban_yaz(dosya, olcumler):
+    with open(dosya, "w", encoding="utf-8") as f:
+        json.dump({"surum": TABAN_SURUM,
+                   "ortam": {"python": platform.python_version(), "platform": platform.platform(),
+                             "tarih": datetime.now().isoformat(timespec="seconds")},
+                   "olcumler": olcumler}, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def taban_oku(dosya):
+    with open(dosya, encoding="utf-8") as f:
+        taban = json.load(f)
+    if taban.get("surum") != TABAN_SURUM:
+        raise ValueError(f"{dosya}: desteklenmeyen taban sürümü {taban.get('surum')!r}")
+    return taban["olcumler"]
+
+
+def karsilastir(taban, olcumler, tolerans=TOLERANS, bellek_tolerans=BELLEK_TOLERANS):
+    """
+    olcumler / taban: {"yol/boyut": {"sn", "tepe_kb", ...}} → gerileme satırları.
+    Yalnızca ikisinde de bulunan ölçümler karşılaştırılır.
+    """
+    gerilemeler = []
+    for anahtar in sorted(set(taban) & set(olcumler)):
+        t, o = taban[anahtar], olcumler[anahtar]
+        if o["sn"] > t["sn"] * tolerans and o["sn"] - t["sn"] > MIN_FARK_SN:
+            gerilemeler.append(f"{anahtar}: süre {t['sn'] * 1000:.2f} → {o['sn'] * 1000:.2f} ms "
+                               f"({o['sn'] / max(t['sn'], 1e-9):.2f}x)")
+        if o["tepe_kb"] > t["tepe_kb"] * bellek_tolerans and o["tepe_kb"] - t["tepe_kb"] > MIN_FARK_KB:
+            gerilemeler.append(f"{anahtar}: tepe bellek {t['tepe_kb']:,.0f} → {o['tepe_kb']:,.0f} KB "
+                               f"({o['tepe_kb'] / max(t['tepe_kb'], 1e-9):.2f}x)")
+    return gerilemeler
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Sentetik büyük programlarla başarım kıyaslaması")
+    p.add_argument("--boyut", default=",".join(map(str, BOYUTLAR)),
+                   help="virgülle ayrılmış kayıt sayıları (ör. 10,1000,1000000)")
+    p.add_argument("--bolge-sayisi", type=int, help=f"varsayılan: bölge başına günde {GUNLUK_ZIL} zil")
+    p.add_argument("--tekrar", type=int, default=TEKRAR, help="süre için en iyisi alınan çalıştırma sayısı")
+    p.add_argument("--yol", action="append", choices=YOLLAR, help="yalnızca bu yol(lar)")
+    p.add_argument("--kaydet", metavar="JSON", help="sonuçları taban olarak yaz")
+    p.add_argument("--karsilastir", metavar="JSON", help="tabanla karşılaştır; gerileme varsa çıkış kodu 1")
+    p.add_argument("--tolerans", type=float, default=TOLERANS)
+    p.add_argument("--bellek-tolerans", type=float, default=BELLEK_TOLERANS)
+    a = p.parse_args(argv)
+
+    try:
+        boyutlar = [int(b) for b in a.boyut.split(",") if b.strip()]
+        if not boyutlar or min(boyutlar) < 1:
+            raise ValueError("boyut pozitif tamsayı olmalı")
+        taban = taban_oku(a.karsilastir) if a.karsilastir else None
+    except (ValueError, OSError) as e:
+        print(f"[HATA] {e}")
+        return 1
+
+    yollar = a.yol or YOLLAR
+    qt_yollari = [y for y in QT_YOLLARI if y in yollar]
+    if qt_yollari and _qt_uygulamasi() is None:
+        print("[UYARI] PyQt5 bulunamadı – " + ", ".join(qt_yollari) + " atlanıyor")
+    olcumler = {}
+    for boyut in boyutlar:
+        for yol, sonuc in kiyasla(boyut, a.bolge_sayisi, max(1, a.tekrar), yollar).items():
+            olcumler[f"{yol}/{boyut}"] = sonuc
+            ek = "".join(f"  {k}={v}" for k, v in sonuc.items() if k not in ("sn", "tepe_kb"))
+            print(f"[KIYAS] {yol:<16} {boyut:>9,}  {sonuc['sn'] * 1000:>10.2f} ms  "
+                  f"{sonuc['tepe_kb']:>12,.0f} KB{ek}")
+
+    if a.kaydet:
+        taban_yaz(a.kaydet, olcumler)
+        print(f"[KIYAS] taban yazıldı: {a.kaydet}")
+    if taban is not None:
+        eksik = sorted(set(taban) - set(olcumler))
+        if eksik:
+            print(f"[UYARI] tabandaki {len(eksik)} ölçüm bu çalıştırmada yok: {', '.join(eksik)}")
+        gerilemeler = karsilastir(taban, olcumler, a.tolerans, a.bellek_tolerans)
+        for s in gerilemeler:
+            print(f"[GERİLEME] {s}")
+        print(f"[KIYAS] {'gerileme yok' if not gerilemeler else f'{len(gerilemeler)} gerileme'}")
+        return 1 if gerilemeler else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
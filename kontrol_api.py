@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel HTTP/JSON kontrol arayüzü – zil programını ağdan okuma / yazma
+asyncio ile tek thread'de çok sayıda istemciye hizmet verir; zamanlayıcı ve
+Qt olay döngüsü bloklanmaz. Program okumaları da yazmalar gibi yürütücü
+thread'de yapılır: önbellek kilidini tutan toplu bir değişiklik olay
+döngüsünü, dolayısıyla diğer istemcileri bekletmez. Yanıtlar program sürümünden türetilen ETag
+taşır: If-None-Match ile yoklayan istemci değişiklik yoksa 304 alır,
+If-Match ile yazan istemci araya giren değişiklikte 412 alır. Çakışan ya da
+ters aralıklı yazmalar 409 ile reddedilir.
+
+Yerel olmayan bir adreste (ör. 0.0.0.0) sunucu ancak bir API anahtarıyla
+(ZIL_API_ANAHTARI) başlar; anahtar verildiyse her istek
+`Authorization: Bearer <anahtar>` taşımalıdır, yoksa 401.
+
+  GET    /program[?bolge=&gun=]   programı listele
+  GET    /program?tarih=YYYY-MM-DD[&bolge=]  o tarihin etkin programı (istisnalar uygulanmış)
+  GET    /program/<id>            tek kayıt
+  POST   /program                 {gun, tur, bas_saat, sure[, bolge]} ekle
+  PUT    /program                 {ziller: [...][, bolge]} toplu değiştir
+  PUT    /program/<id>            {bas_saat?, sure?} güncelle
+  DELETE /program/<id>            sil
+  GET    /durum                   bölge başına şu anki ve sıradaki zil, tetik sapması
+  POST   /cal                     {tur[, bolge]} zili hemen çal
+  GET    /metrics                 Prometheus metin biçiminde ölçümler (olcum.py)
+  POST   /olcum                   {etkin: true|false} ölçümü aç / kapat
+  POST   /profil                  {islem: "baslat"[, aralik_ms] | "durdur"} örnekleyici profil
+"""
+
+import asyncio, hmac, ipaddress, json, os, re, threading, time
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from zaman_cizelgesi import GUNLER, GUN_DK, hafta_saniyesi, saat_dakika
+from zamanlayici import VARSAYILAN_BOLGE
+from aralik_denetimi import hafta_tara
+from istisna_takvimi import tarih_coz
+import olcum
+
+VARSAYILAN_ADRES = ("127.0.0.1", 8765)
+TURLER           = ("DERS", "TENEFFUS")
+MAKS_GOVDE       = 1 << 20      # bayt
+BOSTA_SN         = 30.0         # boşta kalan bağlantı kapatılır
+ANAHTAR_ORTAMI   = "ZIL_API_ANAHTARI"
+
+_SAAT = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+_DURUMLAR = {200: "OK", 201: "Created", 202: "Accepted", 204: "No Content", 304: "Not Modified",
+             400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+             409: "Conflict", 412: "Precondition Failed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class IstekHatasi(Exception):
+    def __init__(self, kod, mesaj):
+        super().__init__(mesaj)
+        self.kod = kod
+
+
+def adres_coz(metin):
+    """'8765' | 'host:8765' | 'host' → (host, port)"""
+    host, _, port = (metin or "").rpartition(":")
+    if not host and not port.isdigit():
+        host, port = port, ""
+    return host or VARSAYILAN_ADRES[0], int(port) if port else VARSAYILAN_ADRES[1]
+
+
+def yerel_mi(host):
+    """Yalnızca bu bilgisayardan erişilebilen adres mi (127.0.0.0/8, ::1, localhost)"""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def kayit_sozlugu(k):
+    return {"id": k.id, "gun": k.gun, "tur": k.tur, "bas_saat": k.bas_saat, "sure": k.sure, "bolge": k.bolge}
+
+
+def zil_dogrula(veri, bolge=None):
+    """JSON nesnesi → (gun, tur, bas_saat, sure, bolge); hatalıysa IstekHatasi(400)"""
+    if not isinstance(veri, dict):
+        raise IstekHatasi(400, "zil bir JSON nesnesi olmalı")
+    gun, tur, bas_saat, sure = (veri.get(a) for a in ("gun", "tur", "bas_saat", "sure"))
+    if not isinstance(gun, int) or isinstance(gun, bool) or not 0 <= gun <= 6:
+        raise IstekHatasi(400, "gun 0 (Pazartesi) … 6 (Pazar) olmalı")
+    if tur not in TURLER:
+        raise IstekHatasi(400, f"tur {' | '.join(TURLER)} olmalı")
+    return (gun, tur, saat_dogrula(bas_saat), sure_dogrula(sure),
+            bolge_dogrula(veri.get("bolge", bolge or VARSAYILAN_BOLGE)))
+
+
+def saat_dogrula(bas_saat):
+    if not isinstance(bas_saat, str) or not _SAAT.match(bas_saat):
+        raise IstekHatasi(400, "bas_saat 'HH:MM' olmalı")
+    return bas_saat
+
+
+def sure_dogrula(sure):
+    if not isinstance(sure, int) or isinstance(sure, bool) or not 1 <= sure <= GUN_DK:
+        raise IstekHatasi(400, "sure 1 … 1440 dakika olmalı")
+    return sure
+
+
+def bolge_dogrula(bolge):
+    if not isinstance(bolge, str) or not bolge.strip():
+        raise IstekHatasi(400, "bolge boş olmayan bir metin olmalı")
+    return bolge.strip()
+
+
+class KontrolAPI:
+    """
+    program: ProgramOnbellegi
+    motor:   ZilZamanlayici (sıradaki zil için; yoksa /durum yalnızca çizelgeden cevaplar)
+    cal:     cal(tur, bolge) – /cal isteğinde olay döngüsü dışında çağrılır
+    anahtar: API anahtarı (None → ZIL_API_ANAHTARI ortam değişkeni); yerel olmayan adreste zorunlu
+    """
+
+    def __init__(self, program, motor=None, cal=None, host=VARSAYILAN_ADRES[0], port=VARSAYILAN_ADRES[1],
+                 anahtar=None):
+        self.program, self.motor, self.cal = program, motor, cal
+        self.host, self.port = host, port
+        self.anahtar = anahtar or os.environ.get(ANAHTAR_ORTAMI) or None
+        self._belirtec = format(time.time_ns() & 0xFFFFFFFFFF, "x")   # yeniden başlatmada eski ETag'ler geçersiz
+        self._dongu = None
+        self._sunucu = None
+        self._thread = None
+        self._baglantilar = set()   # açık bağlantıların görevleri – kapanışta iptal edilir
+        self._yazma_kilidi = threading.Lock()   # API yazmaları sırayla: If-Match denetimi ile yazma arasına girilmez
+
+    # ---------- yaşam döngüsü ----------
+    def baslat(self):
+        """
+        Sunucuyu kendi thread'inde başlat; dinlemeye başlayınca (host, port) döner.
+        Yerel olmayan adreste anahtar yoksa ValueError
+        """
+        if not yerel_mi(self.host) and not self.anahtar:
+            raise ValueError(f"{self.host} yerel bir adres değil – yazma ve /cal uçları ağa açılacağından "
+                             f"{ANAHTAR_ORTAMI} ile bir API anahtarı verin")
+        hazir = threading.Event()
+        hata = []
+
+        def calis():
+            self._dongu = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._dongu)
+            try:
+                self._sunucu = self._dongu.run_until_complete(
+                    asyncio.start_server(self._baglanti, self.host, self.port))
+                self.port = self._sunucu.sockets[0].getsockname()[1]
+            except OSError as e:
+                hata.append(e)
+                hazir.set()
+                return
+            hazir.set()
+            try:
+                self._dongu.run_forever()
+            finally:
+                self._dongu.run_until_complete(self._kapat())
+                self._dongu.close()
+
+        self._thread = threading.Thread(target=calis, name="kontrol-api", daemon=True)
+        self._thread.start()
+        hazir.wait()
+        if hata:
+            raise hata[0]
+        return self.host, self.port
+
+    def durdur(self):
+        if self._dongu is not None and self._dongu.is_running():
+            self._dongu.call_soon_threadsafe(self._dongu.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    async def _kapat(self):
+        self._sunucu.close()
+        for gorev in list(self._baglantilar):
+            gorev.cancel()
+        await asyncio.gather(*self._baglantilar, return_exceptions=True)
+        await self._sunucu.wait_closed()
+
+    # ---------- HTTP ----------
+    async def _baglanti(self, reader, writer):
+        gorev = asyncio.current_task()
+        self._baglantilar.add(gorev)
+        try:
+            while True:
+                try:
+                    baslik = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), BOSTA_SN)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                    break
+                satirlar = baslik.decode("latin-1").split("\r\n")
+                try:
+                    yontem, hedef, surum = satirlar[0].split(" ", 2)
+                except ValueError:
+                    await self._yaz(writer, 400, {"hata": "istek satırı hatalı"}, kapat=True)
+                    break
+                basliklar = {}
+                for satir in satirlar[1:]:
+                    ad, _, deger = satir.partition(":")
+                    if ad:
+                        basliklar[ad.strip().lower()] = deger.strip()
+                uzunluk = basliklar.get("content-length") or "0"
+                if not uzunluk.isdigit():
+                    await self._yaz(writer, 400, {"hata": "Content-Length hatalı"}, kapat=True)
+                    break
+                uzunluk = int(uzunluk)
+                if uzunluk > MAKS_GOVDE:
+                    await self._yaz(writer, 413, {"hata": "gövde çok büyük"}, kapat=True)
+                    break
+                govde = await reader.readexactly(uzunluk) if uzunluk else b""
+                kapat = (basliklar.get("connection", "").lower() == "close"
+                         or surum == "HTTP/1.0" and basliklar.get("connection", "").lower() != "keep-alive")
+                try:
+                    kod, veri, etag = await self._isle(yontem, hedef, basliklar, govde)
+                except IstekHatasi as e:
+                    kod, veri, etag = e.kod, {"hata": str(e)}, None
+                except Exception as e:
+                    print(f"[UYARI] kontrol API isteği işlenemedi – {e}")
+                    olcum.hata("api", e)
+                    kod, veri, etag = 500, {"hata": "sunucu hatası"}, None
+                await self._yaz(writer, kod, veri, etag, kapat, govdesiz=yontem == "HEAD")
+                if kapat:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass                    # kapanış: görev sessizce bitsin
+        finally:
+            self._baglantilar.discard(gorev)
+            writer.close()
+
+    async def _yaz(self, writer, kod, veri, etag=None, kapat=False, govdesiz=False):
+        # str → düz metin (/metrics), diğerleri JSON
+        metin = isinstance(veri, str)
+        govde = b"" if veri is None or kod in (204, 304) else \
+            veri.encode("utf-8") if metin else json.dumps(veri, ensure_ascii=False).encode("utf-8")
+        basliklar = [f"HTTP/1.1 {kod} {_DURUMLAR.get(kod, '')}",
+                     "Content-Type: " + ("text/plain; version=0.0.4; charset=utf-8" if metin
+                                         else "application/json; charset=utf-8"),
+                     f"Content-Length: {len(govde)}",
+                     "Cache-Control: no-cache"]
+        if etag:
+            basliklar.append(f"ETag: {etag}")
+        if kapat:
+            basliklar.append("Connection: close")
+        writer.write(("\r\n".join(basliklar) + "\r\n\r\n").encode("latin-1") + (b"" if govdesiz else govde))
+        await writer.drain()
+
+    # ---------- yönlendirme ----------
+    def etag(self, ek=""):
+        return f'"{self._belirtec}-{self.program.surum}{ek}"'
+
+    async def _isle(self, yontem, hedef, basliklar, govde):
+        url = urlsplit(hedef)
+        sorgu = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parcalar = [p for p in url.path.split("/") if p]
+        okuma = yontem in ("GET", "HEAD")
+        if self.anahtar is not None and not _yetkili(basliklar.get("authorization"), self.anahtar):
+            raise IstekHatasi(401, "yetkisiz – Authorization: Bearer <anahtar> gerekli")
+
+        if parcalar == ["program"] or parcalar[:1] == ["program"] and len(parcalar) == 2:
+            zil_id = None
+            if len(parcalar) == 2:
+                if not parcalar[1].isdigit():
+                    raise IstekHatasi(404, "kayıt bulunamadı")
+                zil_id = int(parcalar[1])
+            if okuma:
+                etag = self.etag()
+                if _eslesir(basliklar.get("if-none-match"), etag):
+                    return 304, None, etag
+                return 200, await self._arkada(self._program_oku, zil_id, sorgu), etag
+            if yontem not in (("POST", "PUT") if zil_id is None else ("PUT", "DELETE")):
+                raise IstekHatasi(405, "yöntem desteklenmiyor")
+            veri = _json(govde) if yontem != "DELETE" else None
+            kod, sonuc = await self._arkada(self._program_yaz, yontem, zil_id, veri, basliklar.get("if-match"))
+            return kod, sonuc, self.etag()
+
+        if parcalar == ["durum"] and okuma:
+            # dakika değişince de ETag değişir: şu anki ders yoklamada güncel kalır
+            etag = self.etag(f"-{int(time.time() // 60)}")
+            if _eslesir(basliklar.get("if-none-match"), etag):
+                return 304, None, etag
+            return 200, await self._arkada(self.durum), etag
+
+        if parcalar == ["cal"] and yontem == "POST":
+            if self.cal is None:
+                raise IstekHatasi(405, "bu süreç zil çalmıyor")
+            veri = _json(govde) or {}
+            tur = veri.get("tur") if isinstance(veri, dict) else None
+            if tur not in TURLER:
+                raise IstekHatasi(400, f"tur {' | '.join(TURLER)} olmalı")
+            bolge = bolge_dogrula(veri.get("bolge", VARSAYILAN_BOLGE))
+            asyncio.get_running_loop().run_in_executor(None, self.cal, tur, bolge).add_done_callback(_cal_bitti)
+            return 202, {"tur": tur, "bolge": bolge}, None
+
+        if parcalar == ["metrics"] and okuma:
+            return 200, olcum.metin(), None
+
+        if parcalar == ["olcum"] and yontem == "POST":
+            veri = _json(govde)
+            if not isinstance(veri, dict) or not isinstance(veri.get("etkin"), bool):
+                raise IstekHatasi(400, "etkin true | false olmalı")
+            olcum.etkinlestir(veri["etkin"])
+            return 200, {"etkin": olcum.etkin()}, None
+
+        if parcalar == ["profil"] and yontem == "POST":
+            return 200, self._profil(_json(govde)), None
+
+        if parcalar and parcalar[0] in ("program", "durum", "cal", "metrics", "olcum", "profil"):
+            raise IstekHatasi(405, "yöntem desteklenmiyor")
+        raise IstekHatasi(404, "bulunamadı")
+
+    async def _arkada(self, fn, *args):
+        """Önbellek kilidi alan işi yürütücü thread'de yap; olay döngüsü diğer istemcilere döner"""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    # ---------- işlemler ----------
+    def _program_oku(self, zil_id, sorgu):
+        if zil_id is not None:
+            kayit = self.program.kayit(zil_id)
+            if kayit is None:
+                raise IstekHatasi(404, "kayıt bulunamadı")
+            return kayit_sozlugu(kayit)
+        bolge = sorgu.get("bolge")
+        if "tarih" in sorgu:
+            try:
+                tarih = tarih_coz(sorgu["tarih"])
+            except ValueError as e:
+                raise IstekHatasi(400, str(e))
+            bolge = bolge or VARSAYILAN_BOLGE
+            return {"tarih": tarih.isoformat(), "bolge": bolge, "plan": self.program.plan_adi(tarih, bolge),
+                    "istisnalar": [str(i) for i in self.program.istisnalar(tarih, bolge)],
+                    "ziller": [{"tur": t, "bas_saat": s, "sure": d} for t, s, d in self.program.tarih(tarih, bolge)]}
+        if "gun" in sorgu:
+            if not sorgu["gun"].isdigit() or int(sorgu["gun"]) > 6:
+                raise IstekHatasi(400, "gun 0 … 6 olmalı")
+            kayitlar = self.program.gun(int(sorgu["gun"]), bolge or VARSAYILAN_BOLGE)
+        else:
+            kayitlar = self.program.kayitlar(bolge)
+        return {"ziller": [kayit_sozlugu(k) for k in kayitlar]}
+
+    def _program_yaz(self, yontem, zil_id, veri, on_kosul=None):
+        """
+        Yürütücü thread'inde çalışır (veritabanı yazımı olay döngüsünü bloklamaz).
+        If-Match (on_kosul) yazma kilidi altında program sürümüyle karşılaştırılır:
+        aynı ETag'le gelen eşzamanlı yazmalardan yalnızca ilki geçer.
+        """
+        with self._yazma_kilidi:
+            if on_kosul is not None and not _eslesir(on_kosul, self.etag()):
+                raise IstekHatasi(412, "program bu arada değişti")
+            return self._program_uygula(yontem, zil_id, veri)
+
+    def _program_uygula(self, yontem, zil_id, veri):
+        if zil_id is None and yontem == "POST":
+            gun, tur, bas_saat, sure, bolge = zil = zil_dogrula(veri)
+            _engelle(self.program.denetle(gun, bas_saat, sure, bolge))
+            yeni_id = self.program.ekle(*zil)
+            return 201, kayit_sozlugu(self.program.kayit(yeni_id))
+        if zil_id is None:
+            if not isinstance(veri, dict) or not isinstance(veri.get("ziller"), list):
+                raise IstekHatasi(400, "{\"ziller\": [...]} bekleniyor")
+            bolge = veri.get("bolge")
+            if bolge is not None:
+                bolge = bolge_dogrula(bolge)
+            ziller = [zil_dogrula(z, bolge) for z in veri["ziller"]]
+            if bolge is not None and any(z[4] != bolge for z in ziller):
+                raise IstekHatasi(400, "ziller yalnızca belirtilen bölgeye ait olabilir")
+            _engelle(hafta_tara((i, (z[4], z[0]), saat_dakika(z[2]), saat_dakika(z[2]) + z[3])
+                                for i, z in enumerate(ziller)))
+            self.program.toplu_degistir(ziller, bolge)
+            return 200, {"adet": len(ziller)}
+        kayit = self.program.kayit(zil_id)
+        if kayit is None:
+            raise IstekHatasi(404, "kayıt bulunamadı")
+        if yontem == "DELETE":
+            self.program.sil(zil_id)
+            return 204, None
+        if not isinstance(veri, dict):
+            raise IstekHatasi(400, "zil bir JSON nesnesi olmalı")
+        bas_saat = saat_dogrula(veri.get("bas_saat", kayit.bas_saat))
+        sure = sure_dogrula(veri.get("sure", kayit.sure))
+        _engelle(self.program.denetle(kayit.gun, bas_saat, sure, kayit.bolge, haric=zil_id))
+        self.program.guncelle(zil_id, bas_saat, sure)
+        return 200, kayit_sozlugu(self.program.kayit(zil_id))
+
+    def durum(self):
+        """Bölge başına şu anki kayıt ve sıradaki zil"""
+        simdi = datetime.now()
+        dk = int(hafta_saniyesi(simdi) // 60)
+        sonraki = self.motor.sonraki_hepsi() if self.motor is not None else {}
+        bolgeler = {}
+        for bolge in self.program.bolgeler():
+            guncel = self.program.cizelge(bolge).guncel(dk)
+            s = sonraki.get(bolge)
+            bolgeler[bolge] = {
+                "guncel": kayit_sozlugu(guncel) if guncel is not None else None,
+                "sonraki": {"zaman": datetime.fromtimestamp(s[0]).isoformat(timespec="seconds"),
+                            "tur": s[1], "sure": s[2]} if s else None}
+        sonuc = {"zaman": simdi.isoformat(timespec="seconds"), "gun": GUNLER[simdi.weekday()],
+                 "bolgeler": bolgeler}
+        if self.motor is not None:
+            sonuc["zamanlayici"] = self.motor.istatistik()     # sayaçlar + tetik sapması histogramı
+        return sonuc
+
+    def _profil(self, veri):
+        """Örnekleyici profil: baslat → {calisiyor}, durdur → özet + katlanmış yığınlar"""
+        islem = veri.get("islem") if isinstance(veri, dict) else None
+        if islem == "baslat":
+            aralik = veri.get("aralik_ms", olcum.ORNEK_SN * 1000)
+            if not isinstance(aralik, (int, float)) or isinstance(aralik, bool) or not 1 <= aralik <= 1000:
+                raise IstekHatasi(400, "aralik_ms 1–1000 olmalı")
+            if not olcum.profil_baslat(aralik / 1000.0):
+                raise IstekHatasi(409, "profil zaten çalışıyor")
+            return {"calisiyor": True}
+        if islem == "durdur":
+            profil = olcum.profil_durdur()
+            if profil is None:
+                raise IstekHatasi(409, "profil çalışmıyor")
+            return {**profil.ozet(), "katlanmis": profil.katlanmis()}
+        raise IstekHatasi(400, "islem baslat | durdur olmalı")
+
+
+def _engelle(bulgular):
+    """Çakışma / ters aralık → 409; boşluklar kabul edilir"""
+    engeller = [str(b) for b in bulgular if b.engel]
+    if engeller:
+        raise IstekHatasi(409, "; ".join(engeller[:20]))
+
+
+def _cal_bitti(gelecek):
+    # /cal yanıtı beklemeden döner; çalma hatası burada kaydedilir
+    if gelecek.cancelled() or gelecek.exception() is None:
+        return
+    print(f"[UYARI] /cal zili çalınamadı – {gelecek.exception()}")
+    olcum.hata("api_cal", gelecek.exception())
+
+
+def _yetkili(baslik, anahtar):
+    tur, _, deger = (baslik or "").partition(" ")
+    return tur.lower() == "bearer" and hmac.compare_digest(deger.strip().encode("utf-8"), anahtar.encode("utf-8"))
+
+
+def _json(govde):
+    if not govde:
+        return None
+    try:
+        return json.loads(govde.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        raise IstekHatasi(400, "geçersiz JSON")
+
+
+def _eslesir(baslik, etag):
+    if not baslik:
+        return False
+    adaylar = {e.strip()[2:] if e.strip().startswith("W/") else e.strip() for e in baslik.split(",")}
+    return "*" in adaylar or etag in adaylar
@@ -3,118 +3,202 @@
 """
 Okul Zil Programı – PyQt5 + SQLite3
 7 gün, ders/teneffüs tanım + düzenle + sil
-Ses: zil_sesleri/ders.wav  |  teneffus.wav
+Ses: zil_sesleri/ders.wav|.mp3  |  teneffus.wav|.mp3
+
+  python main.py                 → pencere + zil
+  python main.py --duzenleyici   → yalnızca pencere (zilleri servis çalar)
+  python main.py --headless      → pencere olmadan zil servisi (zil_servisi.py)
+  python main.py --api [host:]port → ek olarak HTTP/JSON kontrol arayüzü (kontrol_api.py)
+  python main.py --ses-sureci    → sesi pencereden bağımsız bir işçi sürecinde çal (ses_sureci.py)
+  python main.py --olcum [--olcum-dosya YOL] → ölçüm (GET /metrics, Prometheus metin dosyası; olcum.py)
 """
 
-import sys, sqlite3, os, threading, time
-from datetime import datetime, timedelta
+import sys, os, time, sqlite3, queue
+
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    # başsız servis: PyQt5 hiç yüklenmez
+    from zil_servisi import main as servis_main
+    sys.exit(servis_main(sys.argv[1:]))
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QTimeEdit, QSpinBox,
                              QLabel, QComboBox, QListWidget, QMessageBox,
                              QGroupBox, QGridLayout, QFileDialog)
-from PyQt5.QtCore import QTime, pyqtSignal, QObject, Qt, QUrl
-from PyQt5.QtMultimedia import QSoundEffect
+from PyQt5.QtCore import QTime, QTimer, pyqtSignal, QObject, Qt, QBuffer, QByteArray, QIODevice
+from PyQt5.QtMultimedia import QAudio, QAudioFormat, QAudioOutput
+from zamanlayici import VARSAYILAN_BOLGE
+from zil_cekirdegi import ZilCekirdegi
+from program_onbellek import onbellek, init_db, ZilKaydi
+from aralik_denetimi import AralikDenetcisi
+from zaman_cizelgesi import saat_dakika
+from yazma_kuyrugu import YazmaKuyrugu
+from durum_paneli import DurumPaneli
+from ses_bankasi import SesBankasi, SesIzleyici, GecikmeKaydi, TUR_ANAHTAR
+from olcum import olculen
+import olcum
+import program_aktarim
 
 DB_FILE       = "zil_programi.db"
 SES_KLASORU   = "zil_sesleri"
-
-# ---------- VT ----------
-def dict_factory(cursor, row):
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
-
-def init_db():
-    with sqlite3.connect(DB_FILE) as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS zil (
-                id        INTEGER PRIMARY KEY AUTOINCREMENT,
-                gun       INTEGER NOT NULL,
-                tur       TEXT NOT NULL,
-                bas_saat  TEXT NOT NULL,
-                sure      INTEGER NOT NULL
-            )
-        """)
-        conn.commit()
+TAZELE_MS     = 2000        # başka süreçlerin değişikliklerini yoklama aralığı
+TUR_ADLARI    = {"DERS": "Ders", "TENEFFUS": "Teneffüs"}
+AKTARIM_FILTRESI = "Zil programı (*.csv *.json *.jsonl *.ics);;Tüm dosyalar (*)"
 
 # ---------- Ses ----------
 class ZilPlayer(QObject):
+    """Ses bankasındaki çözülmüş PCM'i hazır bekleyen QAudioOutput'lardan çalar"""
+    sesler_hazir = pyqtSignal(object)       # izleyici thread'inden → GUI thread'i
+
     def __init__(self, klasor=SES_KLASORU):
         super().__init__()
         self.klasor = klasor
-        self.ders_se  = QSoundEffect()
-        self.ten_se   = QSoundEffect()
-        self._yukle()
-
-    def _yukle(self):
-        ders_wav = os.path.join(self.klasor, "ders.wav")
-        ten_wav  = os.path.join(self.klasor, "teneffus.wav")
-        for wav, obj, ad in [(ders_wav, self.ders_se, "ders"),
-                             (ten_wav,  self.ten_se, "teneffus")]:
-            if os.path.isfile(wav):
-                obj.setSource(QUrl.fromLocalFile(wav))
-                obj.setVolume(1.0)
-            else:
-                print(f"[UYARI] {wav} bulunamadı – bip kullanılacak")
-                obj = None
+        self.gecikme = GecikmeKaydi()
+        self._cikislar = {}     # anahtar → (QAudioOutput, QByteArray, SesVerisi)
+        self._calan = {}        # QAudioOutput → [QBuffer, tur, tetik]
+        self._emekli = set()    # yerine yenisi gelmiş, çalması bitince silinecek çıkışlar
+        self.banka = SesBankasi(self.klasor)
+        self._degistir(self.banka.sesler)
+        self.sesler_hazir.connect(self._degistir)
+        self.izleyici = SesIzleyici(self.banka, self.sesler_hazir.emit)
+        self.izleyici.start()
+
+    def klasor_degistir(self, klasor):
+        """Bloklamaz: yeni klasör izleyici thread'inde çözülür, hazır olunca devreye girer"""
+        self.klasor = klasor
+        self.izleyici.klasor_degistir(klasor)
+
+    def _degistir(self, sesler):
+        """Yeni ses kümesini devreye al; çalmakta olan ziller eski tamponla biter"""
+        yeni = {}
+        for anahtar, ses in sesler.items():
+            eski = self._cikislar.get(anahtar)
+            yeni[anahtar] = eski if eski is not None and eski[2] is ses else self._cikis_hazirla(ses)
+        for anahtar, (cikis, _, _) in self._cikislar.items():
+            if yeni.get(anahtar, (None,))[0] is not cikis:
+                self._emekli_et(cikis)
+        self._cikislar = yeni
+        for ad in TUR_ANAHTAR.values():
+            if ad not in self._cikislar:
+                print(f"[UYARI] {os.path.join(self.klasor, ad)}.wav bulunamadı – bip kullanılacak")
 
-    def cal(self, tur: str, _sure: int):
-        se = self.ten_se if tur == "TENEFFUS" else self.ders_se
-        if se and se.source().isValid():
-            se.play()
+    def _emekli_et(self, cikis):
+        if cikis in self._calan:
+            self._emekli.add(cikis)
         else:
+            cikis.deleteLater()
+
+    def durdur(self):
+        self.izleyici.stop()
+
+    def _cikis_hazirla(self, ses):
+        fmt = QAudioFormat()
+        fmt.setSampleRate(ses.ornek_hizi)
+        fmt.setChannelCount(ses.kanal)
+        fmt.setSampleSize(ses.ornek_genisligi * 8)
+        fmt.setCodec("audio/pcm")
+        fmt.setByteOrder(QAudioFormat.LittleEndian)
+        fmt.setSampleType(QAudioFormat.UnSignedInt if ses.ornek_genisligi == 1 else QAudioFormat.SignedInt)
+        cikis = QAudioOutput(fmt, self)
+        cikis.stateChanged.connect(lambda durum, c=cikis: self._durum_degisti(c, durum))
+        return cikis, QByteArray(ses.pcm), ses
+
+    @olculen("ses_cal")
+    def cal(self, tur: str, _sure: int, tetik: float = 0.0):
+        tetik = tetik or time.perf_counter()
+        hazir = self._cikislar.get(TUR_ANAHTAR.get(tur, tur.lower()))
+        if hazir is None:
             try:
                 import winsound
                 winsound.Beep(1000, 700)
             except Exception:
                 pass
+            self.gecikme.kaydet(tur, tetik, time.perf_counter())
+            return
+        cikis, veri, _ = hazir
+        cikis.stop()
+        tampon = QBuffer(self)
+        tampon.setData(veri)            # QByteArray paylaşımlı – kopya yok
+        tampon.open(QIODevice.ReadOnly)
+        self._calan[cikis] = [tampon, tur, tetik]
+        cikis.start(tampon)
+
+    def _durum_degisti(self, cikis, durum):
+        kayit = self._calan.get(cikis)
+        if kayit is None:
+            return
+        if durum == QAudio.ActiveState and kayit[2]:
+            self.gecikme.kaydet(kayit[1], kayit[2], time.perf_counter())
+            kayit[2] = 0.0
+        elif durum in (QAudio.IdleState, QAudio.StoppedState):
+            del self._calan[cikis]          # stop() aynı sinyali yeniden tetikler
+            if durum == QAudio.IdleState:
+                cikis.stop()
+            kayit[0].close()
+            kayit[0].deleteLater()
+            if cikis in self._emekli:
+                self._emekli.discard(cikis)
+                cikis.deleteLater()
 
 # ---------- Thread ----------
-class ZilThread(threading.Thread, QObject):
-    ring = pyqtSignal(str, int)
-    def __init__(self, player: ZilPlayer):
-        threading.Thread.__init__(self, daemon=True)
-        QObject.__init__(self)
+def gunluk_ziller(bolge, tarih):
+    """Zamanlayıcı kaynağı: tarihin (tur, bas_saat, sure) listesi – istisnalar çözülmüş, önbellekten"""
+    return onbellek(DB_FILE).tarih(tarih, bolge)
+
+class ZilThread(QObject):
+    """Programı ortak çekirdeğin zamanlayıcısına bağlar; thread'i ZilCekirdegi çalıştırır"""
+    ring = pyqtSignal(str, int, float)      # tur, sure, tetik (perf_counter)
+    def __init__(self, player):
+        super().__init__()
         self.player = player
-        self.ring.connect(self.player.cal)
-        self._running = True
-    def run(self):
-        while self._running:
-            now = datetime.now()
-            weekday = now.weekday()
-            with sqlite3.connect(DB_FILE) as conn:
-                conn.row_factory = dict_factory
-                cur = conn.execute(
-                    "SELECT * FROM zil WHERE gun=? ORDER BY bas_saat", (weekday,)
-                )
-                rows = cur.fetchall()
-            for row in rows:
-                bas = datetime.strptime(row["bas_saat"], "%H:%M")
-                bas = now.replace(hour=bas.hour, minute=bas.minute, second=0, microsecond=0)
-                bitis = bas + timedelta(minutes=row["sure"])
-                if bas <= now < bitis:
-                    self.ring.emit(row["tur"], row["sure"])
-                    delta = (bitis - now).total_seconds()
-                    time.sleep(max(delta, 1))
-                    break
-            time.sleep(5)
+        # ZilPlayer GUI thread'inde çalar; süreç dışı oynatıcı doğrudan bu thread'den çağrılır
+        self.dogrudan = not isinstance(player, QObject)
+        if not self.dogrudan:
+            self.ring.connect(self.player.cal)
+        self.cekirdek = ZilCekirdegi(DB_FILE)
+        self.motor = self.cekirdek.motor
+        self.program_degisti()
+        onbellek(DB_FILE).dinleyici_ekle(self.program_degisti)
+    def start(self):
+        """Zil kilidi başka süreçteyse (zilleri o çalıyor) False"""
+        return self.cekirdek.baslat()
+    def tetikle(self, tur, sure):
+        if self.dogrudan:
+            self.player.cal(tur, sure, time.perf_counter())
+        else:
+            self.ring.emit(tur, sure, time.perf_counter())
+    def program_degisti(self, bolge=None):
+        # tüm bölgeler bu bilgisayarın tek çıkışından çalar; bölge başına çıkış için --headless
+        self.motor.bolgeleri_esitle(onbellek(DB_FILE).bolgeler(), gunluk_ziller, lambda _: self.tetikle)
+        self.motor.yenile(bolge)
     def stop(self):
-        self._running = False
+        self.cekirdek.durdur()
 
 # ---------- GUI ----------
 class MainWindow(QMainWindow):
-    def __init__(self):
+    yazildi = pyqtSignal(list)      # yazma kuyruğu thread'inden → GUI thread'i: [(no, sonuc, hata), ...]
+
+    def __init__(self, zil_cal=True, api_adresi=None, ses_sureci=False):
         super().__init__()
         self.setWindowTitle("Okul Zil Programı")
         self.resize(500, 700)
-        init_db()
-        self.player = ZilPlayer()
+        init_db(DB_FILE)
+        self.onbellek = onbellek(DB_FILE)
+        self.player = None
+        if zil_cal:
+            if ses_sureci:
+                from zil_cekirdegi import SesOynatici
+                self.player = SesOynatici(SES_KLASORU, ses_sureci=True)
+            else:
+                self.player = ZilPlayer()
         self.ses_klasoru = SES_KLASORU
 
         top = QGroupBox("Zil Tanımları")
         lay_top = QGridLayout(top)
 
+        self.cmb_bolge = QComboBox(); self.cmb_bolge.setEditable(True)
+        self.cmb_bolge.addItems(self.onbellek.bolgeler())
+        self.cmb_bolge.setCurrentText(VARSAYILAN_BOLGE)
+
         self.cmb_gun = QComboBox()
         self.cmb_gun.addItems(["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"])
 
@@ -126,82 +210,209 @@ class MainWindow(QMainWindow):
         self.btn_sil    = QPushButton("Seçileni Sil")
         self.btn_guncel = QPushButton("Güncelle")
         self.btn_ses_kl = QPushButton("Ses Klasörü Seç…")
+        self.btn_ice    = QPushButton("İçe Aktar…")
+        self.btn_disa   = QPushButton("Dışa Aktar…")
 
         # ------ yükseklik & stil ------
         TUM_YUKSEKLIK, BUTON_FONT = 36, "14px"
         buton_stil = f"QPushButton{{font-size:{BUTON_FONT};padding:6px;}}"
-        for w in (self.btn_ders, self.btn_ten, self.btn_sil, self.btn_guncel, self.btn_ses_kl):
+        for w in (self.btn_ders, self.btn_ten, self.btn_sil, self.btn_guncel, self.btn_ses_kl,
+                  self.btn_ice, self.btn_disa):
             w.setFixedHeight(TUM_YUKSEKLIK); w.setStyleSheet(buton_stil)
-        for w in (self.cmb_gun, self.time_bas, self.spin_sure):
+        for w in (self.cmb_bolge, self.cmb_gun, self.time_bas, self.spin_sure):
             w.setFixedHeight(TUM_YUKSEKLIK)
         # --------------------------------
 
-        lay_top.addWidget(QLabel("Gün:"), 0, 0); lay_top.addWidget(self.cmb_gun, 0, 1)
-        lay_top.addWidget(QLabel("Başlangıç:"), 1, 0); lay_top.addWidget(self.time_bas, 1, 1)
-        lay_top.addWidget(QLabel("Süre:"), 2, 0); lay_top.addWidget(self.spin_sure, 2, 1)
-        lay_top.addWidget(self.btn_ders, 3, 0); lay_top.addWidget(self.btn_ten, 3, 1)
-        lay_top.addWidget(self.btn_sil, 4, 0); lay_top.addWidget(self.btn_guncel, 4, 1)
-        lay_top.addWidget(self.btn_ses_kl, 5, 0, 1, 2)
+        lay_top.addWidget(QLabel("Bölge:"), 0, 0); lay_top.addWidget(self.cmb_bolge, 0, 1)
+        lay_top.addWidget(QLabel("Gün:"), 1, 0); lay_top.addWidget(self.cmb_gun, 1, 1)
+        lay_top.addWidget(QLabel("Başlangıç:"), 2, 0); lay_top.addWidget(self.time_bas, 2, 1)
+        lay_top.addWidget(QLabel("Süre:"), 3, 0); lay_top.addWidget(self.spin_sure, 3, 1)
+        lay_top.addWidget(self.btn_ders, 4, 0); lay_top.addWidget(self.btn_ten, 4, 1)
+        lay_top.addWidget(self.btn_sil, 5, 0); lay_top.addWidget(self.btn_guncel, 5, 1)
+        lay_top.addWidget(self.btn_ses_kl, 6, 0, 1, 2)
+        lay_top.addWidget(self.btn_ice, 7, 0); lay_top.addWidget(self.btn_disa, 7, 1)
 
         self.liste = QListWidget()
         self.liste.itemDoubleClicked.connect(self.listeye_tikla)
         self.liste.setFixedHeight(220)
 
+        self.durum_paneli = DurumPaneli(self.gun_akisi)
+
         central = QWidget()
         v = QVBoxLayout(central)
-        v.addWidget(top); v.addWidget(self.liste)
+        v.addWidget(top); v.addWidget(self.durum_paneli); v.addWidget(self.liste)
         self.setCentralWidget(central)
-        self.status = self.statusBar(); self.status.showMessage(f"Ses klasörü: {self.ses_klasoru}")
+        self.status = self.statusBar()
+        self.status.showMessage(f"Ses klasörü: {self.ses_klasoru}" if zil_cal
+                                else "Düzenleyici modu – zilleri zil servisi çalıyor")
 
         # bağlantılar
         self.cmb_gun.currentIndexChanged.connect(self.doldur)
+        self.cmb_bolge.currentTextChanged.connect(self.doldur)
         self.btn_ders.clicked.connect(lambda: self.ekle("DERS"))
         self.btn_ten.clicked.connect(lambda: self.ekle("TENEFFUS"))
         self.btn_sil.clicked.connect(self.sil)
         self.btn_guncel.clicked.connect(self.guncelle)
         self.btn_ses_kl.clicked.connect(self.ses_klasoru_sec)
+        self.btn_ice.clicked.connect(self.ice_aktar)
+        self.btn_disa.clicked.connect(self.disa_aktar)
+
+        # düzenlemeler arka planda toplu yazılır; yazılana kadar listede iyimser görünür
+        self.bekleyen = {}          # işlem no → işlem (gönderim sırasıyla)
+        self.yazildi.connect(self.yazma_bitti)
+        self.yazici = YazmaKuyrugu(self.onbellek, self.yazildi.emit)
 
         self.doldur()
-        self.zil_thread = ZilThread(self.player)
-        self.zil_thread.start()
+        self.zil_thread = None
+        if zil_cal:
+            self.zil_thread = ZilThread(self.player)
+            if not self.zil_thread.start():
+                # aynı veritabanını başka bir pencere / servis çalıyor: düzenleyici olarak devam
+                self.zil_thread = None
+                self.player.durdur()
+                self.player = None
+                self.status.showMessage("Düzenleyici modu – zilleri başka bir süreç çalıyor")
         self.duzenleme_id = None
 
+        self.api = None
+        if api_adresi is not None:
+            from kontrol_api import KontrolAPI
+            motor = self.zil_thread.motor if self.zil_thread is not None else None
+            cal = (lambda tur, _bolge: self.zil_thread.tetikle(tur, 0)) if self.zil_thread is not None else None
+            self.api = KontrolAPI(self.onbellek, motor, cal, *api_adresi)
+            try:
+                host, port = self.api.baslat()
+                self.status.showMessage(f"{self.status.currentMessage()}  |  API: http://{host}:{port}")
+            except (OSError, ValueError) as e:
+                print(f"[UYARI] kontrol arayüzü başlatılamadı – {e}")
+                self.api = None
+
+        self.gosterilen_surum = self.onbellek.surum
+        self.tazele_timer = QTimer(self)
+        self.tazele_timer.timeout.connect(self.dis_degisiklik)
+        self.tazele_timer.start(TAZELE_MS)
+        self.saat_timer = QTimer(self)
+        self.saat_timer.timeout.connect(self.durum_paneli.tik)
+        self.saat_timer.start(1000)
+
     # ---------- fonksiyonlar ----------
+    @olculen("doldur")
     def doldur(self):
         self.liste.clear()
         gun = self.cmb_gun.currentIndex()
-        with sqlite3.connect(DB_FILE) as conn:
-            conn.row_factory = dict_factory
-            cur = conn.execute("SELECT * FROM zil WHERE gun=? ORDER BY bas_saat", (gun,))
-            self.gunluk_veri = cur.fetchall()
-            for row in self.gunluk_veri:
-                self.liste.addItem(f"{row['bas_saat']}  {row['tur']}  ({row['sure']} dk)")
+        self.gunluk_veri = self.gorunen(gun, self.bolge())
+        self.gosterilen_surum = self.onbellek.surum
+        yaziliyor = {islem[1] for islem in self.bekleyen.values() if islem[0] == "guncelle"}
+        for row in self.gunluk_veri:
+            ek = "  (kaydediliyor…)" if row.id is None or row.id in yaziliyor else ""
+            self.liste.addItem(f"{row.bas_saat}  {row.tur}  ({row.sure} dk){ek}")
+        self.durum_paneli.yenile()
+
+    def gun_akisi(self, tarih):
+        """Durum paneli kaynağı: seçili bölgenin o tarihteki etkin programı (önbellekten)"""
+        return [(saat_dakika(bas_saat), saat_dakika(bas_saat) + sure, TUR_ADLARI.get(tur, tur))
+                for tur, bas_saat, sure in self.onbellek.tarih(tarih, self.bolge())]
+
+    def gorunen(self, gun, bolge):
+        """Önbellekteki gün + henüz yazılmamış düzenlemeler (yeni kayıtların id'si None)"""
+        satirlar = list(self.onbellek.gun(gun, bolge))
+        for islem in self.bekleyen.values():
+            if islem[0] == "ekle":
+                # yazılmış ama sonucu henüz gelmemiş kayıt iki kez görünmesin
+                if (islem[5], islem[1]) == (bolge, gun) and not any(
+                        (k.tur, k.bas_saat, k.sure) == islem[2:5] for k in satirlar):
+                    satirlar.append(ZilKaydi(None, *islem[1:]))
+                continue
+            i = next((i for i, k in enumerate(satirlar) if k.id == islem[1]), None)
+            if i is None:
+                continue
+            if islem[0] == "sil":
+                del satirlar[i]
+            else:
+                k = satirlar[i]
+                satirlar[i] = ZilKaydi(k.id, k.gun, k.tur, islem[2], islem[3], k.bolge)
+        satirlar.sort(key=lambda k: k.bas_saat)
+        return satirlar
+
+    def denetle(self, gun, saat, sure, bolge, haric=None):
+        """Kaydedilmeden önceki denetim; bekleyen yazma varsa listede görünen güne göre"""
+        if not self.bekleyen:
+            return self.onbellek.denetle(gun, saat, sure, bolge, haric)
+        denetci = AralikDenetcisi(
+            (k.id if k.id is not None else ("bekleyen", i), (bolge, gun),
+             saat_dakika(k.bas_saat), saat_dakika(k.bas_saat) + k.sure)
+            for i, k in enumerate(self.gorunen(gun, bolge)))
+        bas = saat_dakika(saat)
+        return denetci.denetle((bolge, gun), bas, bas + sure, haric)
+
+    def yaz(self, islem):
+        """Düzenlemeyi yazma kuyruğuna koy ve listede hemen göster; kuyruk doluysa False"""
+        try:
+            self.bekleyen[self.yazici.gonder(islem)] = islem
+        except queue.Full:
+            QMessageBox.warning(self, "Kaydedilmedi",
+                                "Veritabanı yanıt vermiyor, yazma kuyruğu dolu. Biraz sonra yeniden deneyin.")
+            return False
+        self.doldur()
+        return True
+
+    def yazma_bitti(self, sonuclar):
+        hatalar = []
+        for no, _, hata in sonuclar:
+            islem = self.bekleyen.pop(no, None)
+            if hata is not None and islem is not None:
+                hatalar.append(f"{islem[0]} ({', '.join(map(str, islem[1:]))}): {hata}")
+        self.doldur()
+        if hatalar:
+            QMessageBox.warning(self, "Kaydedilemedi", "\n".join(hatalar))
+
+    def bolge(self):
+        return self.cmb_bolge.currentText().strip() or VARSAYILAN_BOLGE
+
+    def dis_degisiklik(self):
+        if self.bekleyen:
+            return      # yazıcı önbelleği tutuyor olabilir; sonucu gelince liste zaten yenilenir
+        # başka süreç (data_version) ya da bu süreçteki kontrol arayüzü (surum) değiştirmiş olabilir
+        if self.onbellek.tazele() or self.onbellek.surum != self.gosterilen_surum:
+            self.doldur()
 
     def ekle(self, tur):
         gun = self.cmb_gun.currentIndex()
         saat = self.time_bas.time().toString("HH:mm")
         sure = self.spin_sure.value()
-        with sqlite3.connect(DB_FILE) as conn:
-            conn.execute("INSERT INTO zil (gun, tur, bas_saat, sure) VALUES (?,?,?,?)", (gun, tur, saat, sure))
-            conn.commit()
-        self.doldur()
+        if not self.denetim_onayi(self.denetle(gun, saat, sure, self.bolge())):
+            return
+        self.yaz(("ekle", gun, tur, saat, sure, self.bolge()))
+
+    def denetim_onayi(self, bulgular):
+        """Çakışma / ters aralık varsa kaydetme; boşluklar yalnızca durum çubuğunda"""
+        engeller = [str(b) for b in bulgular if b.engel]
+        if engeller:
+            QMessageBox.warning(self, "Kaydedilmedi", "\n".join(engeller))
+            return False
+        if bulgular:
+            self.status.showMessage("Uyarı: " + "; ".join(str(b) for b in bulgular), 8000)
+        return True
 
     def sil(self):
         sec = self.liste.currentRow()
         if sec < 0: return
-        sil_id = self.gunluk_veri[sec]["id"]
-        with sqlite3.connect(DB_FILE) as conn:
-            conn.execute("DELETE FROM zil WHERE id=?", (sil_id,))
-            conn.commit()
-        self.doldur()
+        row = self.gunluk_veri[sec]
+        if row.id is None:
+            self.status.showMessage("Kayıt henüz yazılıyor, birazdan yeniden deneyin", 4000)
+            return
+        self.yaz(("sil", row.id))
 
     def listeye_tikla(self, item):
         sec = self.liste.row(item)
         if sec < 0: return
         row = self.gunluk_veri[sec]
-        self.duzenleme_id = row["id"]
-        self.time_bas.setTime(QTime.fromString(row["bas_saat"], "HH:mm"))
-        self.spin_sure.setValue(row["sure"])
+        if row.id is None:
+            self.status.showMessage("Kayıt henüz yazılıyor, birazdan yeniden deneyin", 4000)
+            return
+        self.duzenleme_id = row.id
+        self.time_bas.setTime(QTime.fromString(row.bas_saat, "HH:mm"))
+        self.spin_sure.setValue(row.sure)
         self.btn_guncel.setStyleSheet("background-color: #aaffaa;")
 
     def guncelle(self):
@@ -210,27 +421,89 @@ class MainWindow(QMainWindow):
             return
         saat = self.time_bas.time().toString("HH:mm")
         sure = self.spin_sure.value()
-        with sqlite3.connect(DB_FILE) as conn:
-            conn.execute("UPDATE zil SET bas_saat=?, sure=? WHERE id=?", (saat, sure, self.duzenleme_id))
-            conn.commit()
+        kayit = self.onbellek.kayit(self.duzenleme_id)
+        if kayit is not None and not self.denetim_onayi(
+                self.denetle(kayit.gun, saat, sure, kayit.bolge, haric=kayit.id)):
+            return
+        if not self.yaz(("guncelle", self.duzenleme_id, saat, sure)):
+            return
         self.duzenleme_id = None
         self.btn_guncel.setStyleSheet("")
-        self.doldur()
 
     def ses_klasoru_sec(self):
         new_dir = QFileDialog.getExistingDirectory(self, "Ses Klasörü Seç", self.ses_klasoru)
         if new_dir:
             self.ses_klasoru = new_dir
-            self.player = ZilPlayer(self.ses_klasoru)
+            if self.player is not None:
+                self.player.klasor_degistir(self.ses_klasoru)
             self.status.showMessage(f"Ses klasörü: {self.ses_klasoru}")
 
+    def ice_aktar(self):
+        dosya, _ = QFileDialog.getOpenFileName(self, "Programı İçe Aktar", "", AKTARIM_FILTRESI)
+        if not dosya:
+            return
+        bolge = self.bolge()        # bölge sütunu olmayan kayıtlar seçili bölgeye
+        try:
+            bolgeler = program_aktarim.dosya_bolgeleri(dosya, bolge=bolge)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "İçe Aktarma Hatası", str(e))
+            return
+        degistir = QMessageBox.question(
+            self, "İçe Aktar", f"Değiştirilecek bölgeler: {', '.join(bolgeler) or bolge}\n"
+            "Bu bölgelerin mevcut programı silinip yerine dosyadaki program yazılsın mı? "
+            "Diğer bölgelere dokunulmaz.\n"
+            "(Hayır: dosyadaki kayıtlar mevcut programa eklenir)") == QMessageBox.Yes
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        self.yazici.bosalt()        # bekleyen düzenlemeler içe aktarımdan önce yazılsın
+        try:
+            eklenen, _, bulgular = program_aktarim.ice_aktar(DB_FILE, dosya, "zil", bolge=bolge, degistir=degistir)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, "İçe Aktarma Hatası", str(e))
+            return
+        # tek transaction'dı: önbellek ve zamanlayıcı bir kez tazelenir
+        self.onbellek.tazele()
+        mevcut = self.bolge()
+        self.cmb_bolge.blockSignals(True)
+        self.cmb_bolge.clear(); self.cmb_bolge.addItems(self.onbellek.bolgeler())
+        self.cmb_bolge.setCurrentText(mevcut)
+        self.cmb_bolge.blockSignals(False)
+        self.doldur()
+        QApplication.restoreOverrideCursor()
+        ek = f" – {len(bulgular)} uyarı (boşluk)" if bulgular else ""
+        self.status.showMessage(f"{eklenen} kayıt içe aktarıldı{ek}")
+
+    def disa_aktar(self):
+        dosya, _ = QFileDialog.getSaveFileName(self, "Programı Dışa Aktar", "zil_programi.csv", AKTARIM_FILTRESI)
+        if not dosya:
+            return
+        try:
+            yazilan = program_aktarim.disa_aktar(DB_FILE, dosya, "zil")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            QMessageBox.warning(self, "Dışa Aktarma Hatası", str(e))
+            return
+        self.status.showMessage(f"{yazilan} kayıt dışa aktarıldı: {dosya}")
+
     def closeEvent(self, event):
-        self.zil_thread.stop()
+        self.yazici.kapat()         # kuyrukta kalan düzenlemeler yazılmadan çıkılmaz
+        if self.api is not None:
+            self.api.durdur()
+        if self.zil_thread is not None:
+            self.zil_thread.stop()
+            self.player.durdur()
         event.accept()
 
 # ---------- main ----------
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    w = MainWindow()
+    olcum.argv_uygula(sys.argv[1:])
+    api_adresi = None
+    if "--api" in sys.argv[1:]:
+        from kontrol_api import adres_coz
+        i = sys.argv.index("--api")
+        deger = sys.argv[i + 1] if i + 1 < len(sys.argv) else ""
+        api_adresi = adres_coz("" if deger.startswith("--") else deger)
+    w = MainWindow(zil_cal="--duzenleyici" not in sys.argv[1:], api_adresi=api_adresi,
+                   ses_sureci="--ses-sureci" in sys.argv[1:])
     w.show()
     sys.exit(app.exec_())
\ No newline at end of file
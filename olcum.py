@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ölçüm ve profil yüzeyi – zamanlayıcı, veritabanı, arayüz ve ses sıcak yolları
+Sayaçlar, süre histogramları ve son hata göstergeleri süreç genelinde tek
+kayıtta toplanır; Prometheus metin biçiminde kontrol API'sinden
+(GET /metrics) okunur ya da bir dosyaya (node_exporter textfile) düzenli
+yazılır.
+
+Kapalıyken (varsayılan) her ölçüm noktası tek bir bayrak denetimidir: sure()
+paylaşılan boş bir bağlam döndürür, say() / gozle() / hata() hemen döner.
+etkinlestir() ile çalışma anında açılıp kapatılır (--olcum, POST /olcum).
+
+Profil: Ornekleyici açıkken ayrı bir thread ORNEK_SN aralıkla tüm
+thread'lerin yığınını örnekler (cProfile yalnızca kendisini açan thread'i
+görür; zil zamanlayıcı, ses ve API thread'lerinde geçer). Durdurulunca en
+sık görülen fonksiyonlar ve katlanmış yığınlar (flamegraph.pl / speedscope)
+döner. POST /profil ya da başsız serviste SIGUSR1 ile açılıp kapatılır.
+
+  python main.py --olcum [--olcum-dosya /var/lib/node_exporter/zil.prom] [--api 8765]
+  curl localhost:8765/metrics
+  curl -X POST localhost:8765/profil -d '{"islem": "baslat"}'
+"""
+
+import os, sys, threading, time, functools
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+
+SINIRLAR   = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)   # sn
+ORNEK_SN   = 0.005      # profil örnekleme aralığı
+YAZ_SN     = 15.0       # --olcum-dosya yazma aralığı
+EN_COK     = 20         # profil özetindeki fonksiyon sayısı
+MESAJ_SINIRI = 200
+
+_YARDIM = {
+    "zil_sure_saniye":              ("histogram", "Sıcak yolların süresi (veritabanı, arayüz yenileme, zamanlayıcı kurulumu, ses)"),
+    "zil_ses_gecikme_saniye":       ("histogram", "Zil tetiği → sesin çalmaya başlaması"),
+    "zil_tetik_sapma_saniye":       ("histogram", "Planlanan zil anı → zamanlayıcının tetiklemesi"),
+    "zil_hata_toplam":              ("counter", "Yol başına hata sayısı"),
+    "zil_son_hata_zamani_saniye":   ("gauge", "Yolun son hatasının zamanı (Unix sn)"),
+    "zil_son_hata_bilgi":           ("gauge", "Yolun son hata mesajı (etikette)"),
+}
+
+_etkin = False
+_baslangic = time.time()
+_kilit = threading.Lock()
+_sayaclar = {}          # (ad, etiketler) → sayı
+_histogramlar = {}      # (ad, etiketler) → [kova sayıları…, toplam, adet]
+_hatalar = {}           # yol → (zaman, mesaj)
+_gostergeler = {}       # ad → (tip, yardım, fn)  fn() → sayı | {etiketler: sayı}
+_profil = None          # çalışan Ornekleyici
+_dosya_yazici = None
+
+
+# ---------- kayıt ----------
+def etkinlestir(acik=True):
+    global _etkin
+    _etkin = bool(acik)
+
+
+def etkin():
+    return _etkin
+
+
+def _anahtar(ad, etiketler):
+    return ad, tuple(sorted(etiketler.items()))
+
+
+def say(ad, n=1, **etiketler):
+    if not _etkin:
+        return
+    k = _anahtar(ad, etiketler)
+    with _kilit:
+        _sayaclar[k] = _sayaclar.get(k, 0) + n
+
+
+def gozle(ad, deger, **etiketler):
+    """Histograma bir değer (sn) ekle"""
+    if not _etkin:
+        return
+    k = _anahtar(ad, etiketler)
+    with _kilit:
+        h = _histogramlar.get(k)
+        if h is None:
+            h = _histogramlar[k] = [0] * (len(SINIRLAR) + 1) + [0.0, 0]
+        h[bisect_left(SINIRLAR, deger)] += 1
+        h[-2] += deger
+        h[-1] += 1
+
+
+def hata(yol, e):
+    """Yolun hata sayacını artır, son hata zamanını / mesajını güncelle"""
+    if not _etkin:
+        return
+    with _kilit:
+        k = _anahtar("zil_hata_toplam", {"yol": yol})
+        _sayaclar[k] = _sayaclar.get(k, 0) + 1
+        _hatalar[yol] = (time.time(), str(e)[:MESAJ_SINIRI])
+
+
+def gosterge_ekle(ad, fn, yardim, tip="gauge"):
+    """Okuma anında hesaplanan ölçü; aynı adla yeniden eklenen öncekinin yerini alır"""
+    with _kilit:
+        _gostergeler[ad] = (tip, yardim, fn)
+
+
+class _Sure:
+    __slots__ = ("yol", "bas")
+
+    def __init__(self, yol):
+        self.yol = yol
+
+    def __enter__(self):
+        self.bas = time.perf_counter()
+        return self
+
+    def __exit__(self, tur, deger, iz):
+        gozle("zil_sure_saniye", time.perf_counter() - self.bas, yol=self.yol)
+        if deger is not None and isinstance(deger, Exception):
+            hata(self.yol, deger)
+        return False
+
+
+class _Bos:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tur, deger, iz):
+        return False
+
+
+_BOS = _Bos()
+
+
+def sure(yol):
+    """with sure("doldur"): … → zil_sure_saniye{yol="doldur"}; içerideki hata son hataya yazılır"""
+    return _Sure(yol) if _etkin else _BOS
+
+
+def olculen(yol):
+    """Fonksiyon / metot süzgeci: sure(yol) ile sarar; kapalıyken yalnızca bayrak denetimi"""
+    def sar(fn):
+        @functools.wraps(fn)
+        def sarili(*args, **kwargs):
+            if not _etkin:
+                return fn(*args, **kwargs)
+            with _Sure(yol):
+                return fn(*args, **kwargs)
+        return sarili
+    return sar
+
+
+# ---------- Prometheus metni ----------
+def _kacis(deger):
+    return str(deger).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _etiket(etiketler, ek=()):
+    ciftler = list(etiketler) + list(ek)
+    return "{" + ",".join(f'{k}="{_kacis(v)}"' for k, v in ciftler) + "}" if ciftler else ""
+
+
+def _sayi(deger):
+    return repr(float(deger)) if isinstance(deger, float) else str(deger)
+
+
+def _baslik(satirlar, ad, tip, yardim):
+    satirlar.append(f"# HELP {ad} {yardim}")
+    satirlar.append(f"# TYPE {ad} {tip}")
+
+
+def metin():
+    """Prometheus metin biçimi (0.0.4)"""
+    with _kilit:
+        sayaclar = dict(_sayaclar)
+        histogramlar = {k: list(v) for k, v in _histogramlar.items()}
+        hatalar = dict(_hatalar)
+        gostergeler = dict(_gostergeler)
+    satirlar = []
+    _baslik(satirlar, "zil_olcum_etkin", "gauge", "Ölçüm açık mı (1/0)")
+    satirlar.append(f"zil_olcum_etkin {int(_etkin)}")
+    _baslik(satirlar, "zil_calisma_suresi_saniye", "gauge", "Süreç açılalı geçen süre")
+    satirlar.append(f"zil_calisma_suresi_saniye {time.time() - _baslangic:.3f}")
+
+    adlar = {}
+    for (ad, etiketler), n in sayaclar.items():
+        adlar.setdefault(ad, []).append((etiketler, n))
+    for ad in sorted(adlar):
+        _baslik(satirlar, ad, "counter", _YARDIM.get(ad, ("", ad))[1])
+        for etiketler, n in sorted(adlar[ad]):
+            satirlar.append(f"{ad}{_etiket(etiketler)} {_sayi(n)}")
+
+    adlar = {}
+    for (ad, etiketler), h in histogramlar.items():
+        adlar.setdefault(ad, []).append((etiketler, h))
+    for ad in sorted(adlar):
+        _baslik(satirlar, ad, "histogram", _YARDIM.get(ad, ("", ad))[1])
+        for etiketler, h in sorted(adlar[ad]):
+            birikim = 0
+            for sinir, n in zip(SINIRLAR, h):
+                birikim += n
+                satirlar.append(f"{ad}_bucket{_etiket(etiketler, [('le', sinir)])} {birikim}")
+            satirlar.append(f"{ad}_bucket{_etiket(etiketler, [('le', '+Inf')])} {h[-1]}")
+            satirlar.append(f"{ad}_sum{_etiket(etiketler)} {h[-2]!r}")
+            satirlar.append(f"{ad}_count{_etiket(etiketler)} {h[-1]}")
+
+    if hatalar:
+        for ad in ("zil_son_hata_zamani_saniye", "zil_son_hata_bilgi"):
+            _baslik(satirlar, ad, "gauge", _YARDIM[ad][1])
+            for yol, (zaman, mesaj) in sorted(hatalar.items()):
+                if ad == "zil_son_hata_zamani_saniye":
+                    satirlar.append(f"{ad}{_etiket([('yol', yol)])} {zaman:.3f}")
+                else:
+                    satirlar.append(f"{ad}{_etiket([('yol', yol), ('mesaj', mesaj)])} 1")
+
+    for ad, (tip, yardim, fn) in sorted(gostergeler.items()):
+        try:
+            deger = fn()
+        except Exception as e:
+            print(f"[UYARI] {ad} ölçüsü okunamadı – {e}")
+            continue
+        if deger is None:
+            continue
+        _baslik(satirlar, ad, tip, yardim)
+        if isinstance(deger, dict):
+            for etiketler, n in sorted(deger.items()):
+                satirlar.append(f"{ad}{_etiket(etiketler)} {_sayi(n)}")
+        else:
+            satirlar.append(f"{ad} {_sayi(deger)}")
+    return "\n".join(satirlar) + "\n"
+
+
+def dosyaya_yaz(yol):
+    """Metni geçici dosyaya yazıp yerine taşı: okuyucu yarım dosya görmez"""
+    gecici = f"{yol}.{os.getpid()}.tmp"
+    with open(gecici, "w", encoding="utf-8") as f:
+        f.write(metin())
+    os.replace(gecici, yol)
+
+
+def dosya_yazici_baslat(yol, aralik=YAZ_SN):
+    """Ölçümü aç, metni aralik saniyede bir yol'a yaz (daemon thread)"""
+    global _dosya_yazici
+    etkinlestir()
+    if _dosya_yazici is not None:
+        return
+
+    def calis():
+        while True:
+            try:
+                dosyaya_yaz(yol)
+            except OSError as e:
+                print(f"[UYARI] ölçüm dosyası yazılamadı – {e}")
+            time.sleep(aralik)
+
+    _dosya_yazici = threading.Thread(target=calis, name="olcum-dosyasi", daemon=True)
+    _dosya_yazici.start()
+
+
+def argv_uygula(argv):
+    """Pencereler için: --olcum, --olcum-dosya YOL"""
+    if "--olcum" in argv:
+        etkinlestir()
+    if "--olcum-dosya" in argv:
+        i = argv.index("--olcum-dosya")
+        if i + 1 < len(argv) and not argv[i + 1].startswith("--"):
+            dosya_yazici_baslat(argv[i + 1])
+        else:
+            print("[UYARI] --olcum-dosya için dosya yolu verilmedi")
+
+
+# ---------- profil ----------
+class Ornekleyici:
+    """Tüm thread'lerin yığınını aralik saniyede bir sayar (kendi thread'i hariç)"""
+
+    def __init__(self, aralik=ORNEK_SN):
+        self.aralik = aralik
+        self.yiginlar = Counter()       # "thread;dosya:fonksiyon;…" → örnek sayısı
+        self.ornek = 0
+        self._dur = threading.Event()
+        self._bas = time.perf_counter()
+        self._thread = threading.Thread(target=self._calis, name="profil", daemon=True)
+
+    def baslat(self):
+        self._thread.start()
+        return self
+
+    def _calis(self):
+        kendi = threading.get_ident()
+        while not self._dur.wait(self.aralik):
+            adlar = {t.ident: t.name for t in threading.enumerate()}
+            for tid, cerceve in sys._current_frames().items():
+                if tid == kendi:
+                    continue
+                yigin = []
+                while cerceve is not None:
+                    kod = cerceve.f_code
+                    yigin.append(f"{os.path.basename(kod.co_filename)}:{kod.co_name}")
+                    cerceve = cerceve.f_back
+                yigin.append(adlar.get(tid, str(tid)))
+                self.yiginlar[";".join(reversed(yigin))] += 1
+            self.ornek += 1
+
+    def durdur(self):
+        self._dur.set()
+        self._thread.join()
+        return self.ozet()
+
+    def ozet(self):
+        """{'ornek', 'sure_sn', 'en_cok': [{'fonksiyon', 'oran', 'kendi_orani'}, …]}"""
+        toplam, kendi = Counter(), Counter()
+        for yigin, n in self.yiginlar.items():
+            parcalar = yigin.split(";")[1:]
+            for f in set(parcalar):
+                toplam[f] += n
+            if parcalar:
+                kendi[parcalar[-1]] += n
+        ornek_sayisi = max(sum(self.yiginlar.values()), 1)
+        return {"ornek": self.ornek, "sure_sn": round(time.perf_counter() - self._bas, 3),
+                "en_cok": [{"fonksiyon": f, "oran": round(n / ornek_sayisi, 4),
+                            "kendi_orani": round(kendi[f] / ornek_sayisi, 4)}
+                           for f, n in toplam.most_common(EN_COK)]}
+
+    def katlanmis(self):
+        """flamegraph.pl / speedscope girdisi: 'yığın sayı' satırları"""
+        return "".join(f"{y} {n}\n" for y, n in self.yiginlar.most_common())
+
+
+def profil_baslat(aralik=ORNEK_SN):
+    """Çalışıyorsa False"""
+    global _profil
+    with _kilit:
+        if _profil is not None:
+            return False
+        _profil = Ornekleyici(aralik).baslat()
+    return True
+
+
+def profil_durdur():
+    """Çalışan profili durdur → Ornekleyici ya da None"""
+    global _profil
+    with _kilit:
+        profil, _profil = _profil, None
+    if profil is not None:
+        profil.durdur()
+    return profil
+
+
+def profil_calisiyor():
+    return _profil is not None
+
+
+def profil_degistir(dizin="."):
+    """Aç / kapat (SIGUSR1); kapatınca katlanmış yığınları dizin'e yazar, özeti yazdırır"""
+    if profil_baslat():
+        print("[ZIL] profil başladı")
+        return
+    profil = profil_durdur()
+    if profil is None:
+        return
+    dosya = os.path.join(dizin, f"zil_profil_{datetime.now():%Y%m%d-%H%M%S}.txt")
+    try:
+        with open(dosya, "w", encoding="utf-8") as f:
+            f.write(profil.katlanmis())
+    except OSError as e:
+        print(f"[UYARI] profil yazılamadı – {e}")
+        dosya = None
+    ozet = profil.ozet()
+    print(f"[ZIL] profil: {ozet['ornek']} örnek, {ozet['sure_sn']} sn" + (f" → {dosya}" if dosya else ""))
+    for s in ozet["en_cok"][:10]:
+        print(f"[ZIL]   {s['oran'] * 100:5.1f}%  (kendi {s['kendi_orani'] * 100:4.1f}%)  {s['fonksiyon']}")
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zil programını toplu içe / dışa aktarma (CSV, JSON, JSON Lines, iCalendar)
+Girdi satır satır okunur ve doğrulanır, parça parça executemany ile tek
+transaction'da yazılır; bellek kullanımı dosya boyutundan bağımsızdır.
+Çalışan uygulamalar değişikliği commit'ten sonra tek seferde görür.
+
+  python program_aktarim.py ice zil_programi.db program.csv [--tablo zil] [--bolge B] [--degistir] [--atla]
+                                                           [--cakisma-uyar]
+  python program_aktarim.py disa zil_programi.db program.ics [--tablo zil] [--bolge B]
+
+Ortak alanlar: gun (0–6 ya da gün adı), tur (DERS | TENEFFUS), baslik,
+baslangic ('HH:MM'), bitis ('HH:MM') ya da sure (dakika), bolge.
+Bitişi başlangıçtan önce olan kayıt ters aralıktır ve reddedilir; gece
+yarısını aşan kayıt ancak sure bunu doğrularsa ya da gece alanı doluysa
+(1 / evet / true) kabul edilir.
+Commit'ten önce hafta (mevcut program + dosya) çakışmalara karşı taranır.
+"""
+
+import os, sys, csv, json, sqlite3, argparse
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from birlesik_program import gun_no, dakika, tur_kodu
+from zaman_cizelgesi import GUNLER, GUN_DK, gece_asar
+from zamanlayici import VARSAYILAN_BOLGE
+from degisiklik_gunlugu import gunluk_kur, yakala
+from aralik_denetimi import hafta_tara, gecerli
+
+BICIMLER = ("csv", "json", "jsonl", "ics")
+ALANLAR  = ("gun", "tur", "baslik", "baslangic", "bitis", "sure", "bolge")
+PARCA    = 5000             # tek executemany çağrısındaki satır sayısı
+
+# eski / farklı adlandırılmış sütunlar → ortak alan
+_ESANLAMLI = {"bas_saat": "baslangic", "baslangic_saat": "baslangic", "start": "baslangic",
+              "start_time": "baslangic", "bitis_saat": "bitis", "end": "bitis", "end_time": "bitis",
+              "tip": "tur", "type": "tur", "kind": "tur", "day": "gun", "title": "baslik",
+              "name": "baslik", "duration": "sure", "duration_minutes": "sure", "zone": "bolge"}
+_TIP_ADI = {"DERS": "Ders", "TENEFFUS": "Teneffüs"}
+_EVET = {"1", "evet", "e", "true", "yes"}
+_ICS_GUNLER = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+class AktarimHatasi(ValueError):
+    def __init__(self, konum, mesaj):
+        super().__init__(f"{konum}: {mesaj}")
+        self.konum = konum
+
+
+# ---------- ortak kayıt ----------
+def kayit_coz(alanlar, bolge=None):
+    """Ham alan sözlüğü → (gun, tur, baslik, bas_dk, bit_dk, bolge); hatalıysa ValueError"""
+    alanlar = {_ESANLAMLI.get(k.strip().lower(), k.strip().lower()): v
+               for k, v in alanlar.items() if k is not None}
+    gun = gun_no(alanlar.get("gun"))
+    baslik = str(alanlar.get("baslik") or "").strip()
+    ham_tur = str(alanlar.get("tur") or "").strip().upper()
+    tur = ham_tur if ham_tur in _TIP_ADI else tur_kodu(ham_tur, baslik)
+    if not alanlar.get("baslangic"):
+        raise ValueError("başlangıç saati yok")
+    bas = dakika(alanlar["baslangic"])
+    if alanlar.get("bitis"):
+        bit = dakika(alanlar["bitis"])
+        sure = str(alanlar.get("sure") or "").strip()
+        if bit <= bas and (str(alanlar.get("gece") or "").strip().lower() in _EVET
+                           or sure and int(sure) == bit + GUN_DK - bas):
+            bit += GUN_DK       # açıkça işaretli, gece yarısını aşan kayıt
+        if bit <= bas:
+            raise ValueError(f"ters aralık {_saat(bas)}–{_saat(bit)}: bitiş başlangıçtan sonra olmalı "
+                             f"(gece yarısını aşan kayıt için sure ya da gece alanı)")
+    elif str(alanlar.get("sure") or "").strip():
+        bit = bas + int(alanlar["sure"])
+    else:
+        raise ValueError("bitiş saati ya da süre yok")
+    if not gecerli(bas, bit):
+        raise ValueError(f"geçersiz aralık {_saat(bas)}–{_saat(bit)}")
+    return gun, tur, baslik, bas, bit, str(alanlar.get("bolge") or bolge or VARSAYILAN_BOLGE).strip()
+
+
+def _saat(dk):
+    return f"{dk % GUN_DK // 60:02d}:{dk % 60:02d}"
+
+
+# tablo → (kayıt → satır, satır → kayıt, SELECT)
+def _zil_satiri(k):
+    gun, tur, _, bas, bit, bolge = k
+    return gun, tur, _saat(bas), bit - bas, bolge
+
+def _zil_kaydi(satir):
+    gun, tur, bas_saat, sure, bolge = satir
+    bas = dakika(bas_saat)
+    return gun, tur, "", bas, bas + sure, bolge
+
+def _zil_programi_satiri(k):
+    gun, tur, baslik, bas, bit, _ = k
+    return GUNLER[gun], _TIP_ADI[tur], baslik or _TIP_ADI[tur], _saat(bas), _saat(bit), bit - bas
+
+def _zil_programi_kaydi(satir):
+    gun, tip, baslik, bas_saat, bit_saat, sure = satir
+    bas, bit = dakika(bas_saat), dakika(bit_saat)
+    if gece_asar(bas_saat, bit_saat, sure):
+        bit += GUN_DK
+    return gun_no(gun), tur_kodu(tip), baslik, bas, bit, VARSAYILAN_BOLGE
+
+TABLOLAR = {
+    "zil": (_zil_satiri, _zil_kaydi,
+            "INSERT INTO zil (gun, tur, bas_saat, sure, bolge) VALUES (?, ?, ?, ?, ?)",
+            "SELECT gun, tur, bas_saat, sure, bolge FROM zil {} ORDER BY bolge, gun, bas_saat"),
+    "zil_programi": (_zil_programi_satiri, _zil_programi_kaydi,
+                     "INSERT INTO zil_programi (gun, tip, baslik, baslangic_saat, bitis_saat, sure) "
+                     "VALUES (?, ?, ?, ?, ?, ?)",
+                     "SELECT gun, tip, baslik, baslangic_saat, bitis_saat, sure FROM zil_programi {} "
+                     "ORDER BY id"),
+}
+
+
+# ---------- okuyucular: (konum, ham alan sözlüğü) üretir ----------
+def _oku_csv(f):
+    ornek = f.read(4096)
+    f.seek(0)
+    try:
+        lehce = csv.Sniffer().sniff(ornek, delimiters=",;\t")
+    except csv.Error:
+        lehce = csv.excel
+    okuyucu = csv.DictReader(f, dialect=lehce)
+    for satir in okuyucu:
+        yield f"satır {okuyucu.line_num}", satir
+
+
+def _oku_jsonl(f):
+    for no, satir in enumerate(f, 1):
+        if satir.strip():
+            try:
+                yield f"satır {no}", json.loads(satir)
+            except ValueError as e:
+                raise AktarimHatasi(f"satır {no}", f"geçersiz JSON – {e}")
+
+
+def _oku_json(f, tampon_boyu=1 << 16):
+    """[{...}, {...}] dizisini bütün dosyayı belleğe almadan öğe öğe çöz"""
+    cozucu = json.JSONDecoder()
+    tampon, konum, no = "", 0, 0
+    basladi = False
+    while True:
+        parca = f.read(tampon_boyu)
+        tampon = tampon[konum:] + parca
+        konum = 0
+        while True:
+            while konum < len(tampon) and tampon[konum] in " \t\r\n,":
+                konum += 1
+            if not basladi:
+                if konum == len(tampon):
+                    break
+                if tampon[konum] != "[":
+                    raise AktarimHatasi("öğe 0", "JSON dizisi ([...]) bekleniyor")
+                basladi, konum = True, konum + 1
+                continue
+            if konum < len(tampon) and tampon[konum] == "]":
+                return
+            try:
+                nesne, son = cozucu.raw_decode(tampon, konum)
+            except ValueError as e:
+                if not parca:
+                    raise AktarimHatasi(f"öğe {no + 1}", f"geçersiz JSON – {e}")
+                break               # öğe tamponda yarım kaldı: devamını oku
+            no += 1
+            yield f"öğe {no}", nesne
+            konum = son
+        if not parca:
+            if basladi:
+                raise AktarimHatasi(f"öğe {no + 1}", "JSON dizisi kapanmadı")
+            return
+
+
+def _ics_satirlari(f):
+    """RFC 5545 katlanmış satırları birleştir"""
+    onceki = None
+    for satir in f:
+        satir = satir.rstrip("\r\n")
+        if satir[:1] in (" ", "\t") and onceki is not None:
+            onceki += satir[1:]
+            continue
+        if onceki is not None:
+            yield onceki
+        onceki = satir
+    if onceki is not None:
+        yield onceki
+
+
+def _ics_zaman(deger):
+    """'20240902T083000' (Z / TZID yok sayılır) → datetime"""
+    return datetime.strptime(deger.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+
+
+def _ics_sure(deger):
+    """'PT40M', 'PT1H10M' → dakika"""
+    dk, sayi = 0, ""
+    for c in deger.lstrip("+").lstrip("P").replace("T", ""):
+        if c.isdigit():
+            sayi += c
+        elif c in "WDHMS":
+            dk += int(sayi or 0) * {"W": 7 * GUN_DK, "D": GUN_DK, "H": 60, "M": 1, "S": 0}[c]
+            sayi = ""
+    return dk
+
+
+def _oku_ics(f):
+    olay, no = None, 0
+    for satir in _ics_satirlari(f):
+        if satir == "BEGIN:VEVENT":
+            olay, no = {}, no + 1
+            continue
+        if olay is None:
+            continue
+        if satir == "END:VEVENT":
+            konum = f"olay {no}"
+            try:
+                bas = _ics_zaman(olay["DTSTART"])
+                if "DTEND" in olay:
+                    sure = int((_ics_zaman(olay["DTEND"]) - bas).total_seconds() // 60)
+                else:
+                    sure = _ics_sure(olay.get("DURATION", ""))
+            except (KeyError, ValueError) as e:
+                raise AktarimHatasi(konum, f"DTSTART/DTEND okunamadı – {e}")
+            kural = dict(p.split("=", 1) for p in olay.get("RRULE", "").split(";") if "=" in p)
+            gunler = [_ICS_GUNLER.index(g[-2:]) for g in kural.get("BYDAY", "").split(",")
+                      if g[-2:] in _ICS_GUNLER] or [bas.weekday()]
+            for gun in gunler:
+                yield konum, {"gun": gun, "tur": olay.get("CATEGORIES", ""), "baslik": olay.get("SUMMARY", ""),
+                              "baslangic": bas.strftime("%H:%M"), "sure": sure,
+                              "bolge": olay.get("X-ZIL-BOLGE") or olay.get("LOCATION")}
+            olay = None
+            continue
+        ad, _, deger = satir.partition(":")
+        olay[ad.split(";", 1)[0].upper()] = deger.replace("\\,", ",").replace("\\;", ";").replace("\\n", " ")
+
+
+OKUYUCULAR = {"csv": _oku_csv, "json": _oku_json, "jsonl": _oku_jsonl, "ics": _oku_ics}
+
+
+# ---------- yazıcılar: kayıt akışını dosyaya yazar ----------
+def _sozluk(k):
+    gun, tur, baslik, bas, bit, bolge = k
+    return {"gun": gun, "tur": tur, "baslik": baslik, "baslangic": _saat(bas), "bitis": _saat(bit),
+            "sure": bit - bas, "bolge": bolge}
+
+
+def _yaz_csv(f, kayitlar):
+    w = csv.DictWriter(f, fieldnames=ALANLAR, lineterminator="\n")
+    w.writeheader()
+    for k in kayitlar:
+        w.writerow(_sozluk(k))
+
+
+def _yaz_jsonl(f, kayitlar):
+    for k in kayitlar:
+        f.write(json.dumps(_sozluk(k), ensure_ascii=False) + "\n")
+
+
+def _yaz_json(f, kayitlar):
+    f.write("[")
+    ayrac = "\n"
+    for k in kayitlar:
+        f.write(ayrac + json.dumps(_sozluk(k), ensure_ascii=False))
+        ayrac = ",\n"
+    f.write("\n]\n")
+
+
+def _ics_kacis(metin):
+    return metin.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _yaz_ics(f, kayitlar, hafta=None):
+    """Her kayıt haftalık tekrarlanan bir olay; tarih olarak bu haftanın günü kullanılır"""
+    pazartesi = hafta or date.today() - timedelta(days=date.today().weekday())
+    damga = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//ZilProgrami//TR\r\nCALSCALE:GREGORIAN\r\n")
+    for no, (gun, tur, baslik, bas, bit, bolge) in enumerate(kayitlar, 1):
+        bas_zaman = datetime.combine(pazartesi + timedelta(days=gun), datetime.min.time()) + timedelta(minutes=bas)
+        f.write("BEGIN:VEVENT\r\n"
+                f"UID:zil-{no}-{bolge}-{gun}-{bas}@zilprogrami\r\n"
+                f"DTSTAMP:{damga}\r\n"
+                f"DTSTART:{bas_zaman:%Y%m%dT%H%M%S}\r\n"
+                f"DURATION:PT{bit - bas}M\r\n"
+                f"RRULE:FREQ=WEEKLY;BYDAY={_ICS_GUNLER[gun]}\r\n"
+                f"SUMMARY:{_ics_kacis(baslik or _TIP_ADI[tur])}\r\n"
+                f"CATEGORIES:{tur}\r\n"
+                f"X-ZIL-BOLGE:{_ics_kacis(bolge)}\r\n"
+                "END:VEVENT\r\n")
+    f.write("END:VCALENDAR\r\n")
+
+
+YAZICILAR = {"csv": _yaz_csv, "json": _yaz_json, "jsonl": _yaz_jsonl, "ics": _yaz_ics}
+
+
+# ---------- içe / dışa aktarma ----------
+def bicim_bul(dosya, bicim=None):
+    bicim = (bicim or os.path.splitext(dosya)[1].lstrip(".")).lower()
+    bicim = {"ical": "ics", "ndjson": "jsonl"}.get(bicim, bicim)
+    if bicim not in BICIMLER:
+        raise ValueError(f"desteklenmeyen biçim: {bicim!r} ({', '.join(BICIMLER)})")
+    return bicim
+
+
+def tablo_bul(conn, tablo=None):
+    """Verilen ya da veritabanında bulunan zil tablosu"""
+    mevcut = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for aday in ([tablo] if tablo else list(TABLOLAR)):
+        if aday in TABLOLAR and aday in mevcut:
+            return aday
+    raise ValueError(f"veritabanında {tablo or ' / '.join(TABLOLAR)} tablosu yok – uygulamayı bir kez açın")
+
+
+def kayitlari_oku(f, bicim, bolge=None, hatali="dur", hatalar=None, konumlu=False):
+    """
+    Dosyadan doğrulanmış kayıt akışı; hatali='atla' ise bozuk kayıtlar hatalar
+    listesine. konumlu=True ise (konum, kayıt) üretir
+    """
+    for konum, alanlar in OKUYUCULAR[bicim](f):
+        try:
+            if not isinstance(alanlar, dict):
+                raise ValueError("kayıt bir nesne olmalı")
+            kayit = kayit_coz(alanlar, bolge)
+            yield (konum, kayit) if konumlu else kayit
+        except (ValueError, TypeError) as e:
+            if hatali != "atla":
+                raise AktarimHatasi(konum, e)
+            if hatalar is not None:
+                hatalar.append(f"{konum}: {e}")
+
+
+def dosya_bolgeleri(dosya, bicim=None, bolge=None):
+    """
+    Dosyadaki kayıtların bölgeleri, sıralı (bölge sütunu olmayan kayıt → bolge
+    ya da varsayılan bölge); bozuk kayıtlar sayılmaz
+    """
+    bicim = bicim_bul(dosya, bicim)
+    with open(dosya, encoding="utf-8-sig", newline="" if bicim == "csv" else None) as f:
+        return sorted({k[5] for k in kayitlari_oku(f, bicim, bolge, hatali="atla")})
+
+
+def _denetim_anahtari(tablo, kayit):
+    # zil_programi'de bölge yok: tüm kayıtlar aynı günde karşılaştırılır
+    return kayit[0] if tablo == "zil_programi" else (kayit[5], kayit[0])
+
+
+def ice_aktar(db_file, dosya, tablo=None, bicim=None, bolge=None, degistir=False, hatali="dur",
+              cakisma="dur"):
+    """
+    Dosyayı tabloya tek transaction'da aktar. degistir=True ise önce `zil`
+    tablosunda yalnızca dosyadaki bölgeler (bölge sütunu olmayan kayıtlar için
+    bolge), `zil_programi` tablosunda tüm tablo boşaltılır. Çakışan / ters aralıklı
+    kayıt varsa cakisma='dur' hiçbir şey yazmaz, 'uyar' yazar ve bildirir.
+    Dönüş: (eklenen, hatalar, bulgular)
+    """
+    bicim = bicim_bul(dosya, bicim)
+    hatalar = []
+    denetim = []                # (konum, gün anahtarı, bas, bit) – hafta taraması için
+    mevcut = set()              # tabloda zaten olan kayıtların konumları
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout=5000")
+    try:
+        tablo = tablo_bul(conn, tablo)
+        satira, _, ekle_sql, _ = TABLOLAR[tablo]
+        # dosyada olmayan bölgelere dokunulmaz; ön tarama yazma kilidi alınmadan yapılır
+        silinecek = dosya_bolgeleri(dosya, bicim, bolge) if degistir and tablo == "zil" else None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            gunluk_kur(conn, tablo)
+            if silinecek is not None:
+                conn.executemany("DELETE FROM zil WHERE bolge = ?", ((b,) for b in silinecek))
+            elif degistir:
+                conn.execute(f"DELETE FROM {tablo}")
+            _, kayda, _, secim_sql = TABLOLAR[tablo]
+            for satir in conn.execute(secim_sql.format("").replace("SELECT ", "SELECT id, ", 1)):
+                k = kayda(satir[1:])
+                konum = f"kayıt #{satir[0]}"
+                mevcut.add(konum)
+                denetim.append((konum, _denetim_anahtari(tablo, k), k[3], k[4]))
+            eklenen = 0
+            with open(dosya, encoding="utf-8-sig", newline="" if bicim == "csv" else None) as f:
+                kayitlar = _izle(kayitlari_oku(f, bicim, bolge, hatali, hatalar, konumlu=True), tablo, denetim)
+                if tablo == "zil_programi" and bolge:
+                    # bölge sütunu yok: çok kampüslü dosyadan yalnızca istenen bölge
+                    kayitlar = (k for k in kayitlar if k[5] == bolge)
+                while True:
+                    parca = [satira(k) for k in islice(kayitlar, PARCA)]
+                    if not parca:
+                        break
+                    conn.executemany(ekle_sql, parca)
+                    eklenen += len(parca)
+            # mevcut kayıtlar kendi aralarında değil, yalnızca dosyayla karşılaştırılır
+            bulgular = [b for b in hafta_tara(denetim)
+                        if b.anahtar not in mevcut or b.diger not in mevcut]
+            engeller = [str(b) for b in bulgular if b.engel]
+            if engeller and cakisma == "dur":
+                raise AktarimHatasi(f"{len(engeller)} çakışma", "; ".join(engeller[:10]))
+            yakala(conn, tablo)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return eklenen, hatalar, [str(b) for b in bulgular]
+
+
+def _izle(kayitlar, tablo, denetim):
+    """(konum, kayıt) akışından kayıtları geçirirken denetim listesine ekle"""
+    for konum, k in kayitlar:
+        denetim.append((konum, _denetim_anahtari(tablo, k), k[3], k[4]))
+        yield k
+
+
+def disa_aktar(db_file, dosya, tablo=None, bicim=None, bolge=None):
+    """Tabloyu (bölge verilmişse yalnızca o bölgeyi) dosyaya yaz; yazılan kayıt sayısı"""
+    bicim = bicim_bul(dosya, bicim)
+    conn = sqlite3.connect(db_file)
+    try:
+        tablo = tablo_bul(conn, tablo)
+        _, kayda, _, secim_sql = TABLOLAR[tablo]
+        if bolge and tablo == "zil":
+            imlec = conn.execute(secim_sql.format("WHERE bolge = ?"), (bolge,))
+        else:
+            imlec = conn.execute(secim_sql.format(""))
+        sayac = [0]
+
+        def kayitlar():
+            for satir in imlec:
+                sayac[0] += 1
+                yield kayda(satir)
+
+        with open(dosya, "w", encoding="utf-8", newline="" if bicim in ("csv", "ics") else None) as f:
+            YAZICILAR[bicim](f, kayitlar())
+    finally:
+        conn.close()
+    return sayac[0]
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Zil programı içe / dışa aktarma")
+    alt = p.add_subparsers(dest="komut", required=True)
+    for komut, yardim in (("ice", "dosyadan veritabanına"), ("disa", "veritabanından dosyaya")):
+        a = alt.add_parser(komut, help=yardim)
+        a.add_argument("db")
+        a.add_argument("dosya")
+        a.add_argument("--tablo", choices=list(TABLOLAR))
+        a.add_argument("--bicim", choices=BICIMLER)
+        a.add_argument("--bolge")
+        if komut == "ice":
+            a.add_argument("--degistir", action="store_true", help="önce dosyadaki bölgelerin mevcut programını sil")
+            a.add_argument("--atla", action="store_true", help="hatalı kayıtları atla")
+            a.add_argument("--cakisma-uyar", action="store_true",
+                           help="çakışan kayıtları reddetme, yalnızca bildir")
+    a = p.parse_args(argv)
+
+    try:
+        if a.komut == "ice":
+            eklenen, hatalar, bulgular = ice_aktar(a.db, a.dosya, a.tablo, a.bicim, a.bolge, a.degistir,
+                                                   "atla" if a.atla else "dur",
+                                                   "uyar" if a.cakisma_uyar else "dur")
+            for hata in hatalar[:20]:
+                print(f"[UYARI] atlandı – {hata}")
+            for bulgu in bulgular[:20]:
+                print(f"[UYARI] {bulgu}")
+            if len(bulgular) > 20:
+                print(f"[UYARI] … {len(bulgular) - 20} bulgu daha")
+            print(f"{eklenen} kayıt aktarıldı" + (f", {len(hatalar)} kayıt atlandı" if hatalar else ""))
+        else:
+            print(f"{disa_aktar(a.db, a.dosya, a.tablo, a.bicim, a.bolge)} kayıt yazıldı")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"[HATA] {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Süreç genelinde paylaşılan zil programı önbelleği
+`zil` tablosu (bölge, gün) anahtarlı, bas_saat sırasında tutulur. ekle/sil/
+guncelle önce veritabanına yazar sonra önbelleği günceller (write-through);
+başka bir sürecin yaptığı değişiklikler `PRAGMA data_version` ile fark edilir.
+"""
+
+import sqlite3, threading
+from bisect import insort
+from datetime import date
+from zaman_cizelgesi import HaftalikCizelge, zil_cizelgesi, zil_girdisi, saat_dakika
+from aralik_denetimi import AralikDenetcisi, hafta_tara
+from istisna_takvimi import (Istisna, PlanKurali, TarihOnbellegi, istisna_kur, istisna_dogrula,
+                             kural_dogrula, ILERI_GUN)
+from zamanlayici import VARSAYILAN_BOLGE
+from degisiklik_gunlugu import gunluk_kur, kaydet, yakala
+from olcum import olculen
+
+
+def init_db(db_file):
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS zil (
+                id        INTEGER PRIMARY KEY AUTOINCREMENT,
+                gun       INTEGER NOT NULL,
+                tur       TEXT NOT NULL,
+                bas_saat  TEXT NOT NULL,
+                sure      INTEGER NOT NULL,
+                bolge     TEXT NOT NULL DEFAULT 'ana'
+            )
+        """)
+        # eski veritabanları: bölge sütunu sonradan eklendi
+        if "bolge" not in {r[1] for r in conn.execute("PRAGMA table_info(zil)")}:
+            conn.execute("ALTER TABLE zil ADD COLUMN bolge TEXT NOT NULL DEFAULT 'ana'")
+        # bölge başına ses ayarı; satırı olmayan bölge varsayılan klasör/çıkışı kullanır
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bolge (
+                ad           TEXT PRIMARY KEY,
+                ses_klasoru  TEXT,
+                cikis        TEXT
+            )
+        """)
+        gunluk_kur(conn, "zil")
+        istisna_kur(conn)
+        conn.commit()
+
+
+class ZilKaydi:
+    __slots__ = ("id", "gun", "tur", "bas_saat", "sure", "bolge")
+
+    def __init__(self, id, gun, tur, bas_saat, sure, bolge=VARSAYILAN_BOLGE):
+        self.id, self.gun, self.tur, self.bas_saat, self.sure = id, gun, tur, bas_saat, sure
+        self.bolge = bolge
+
+    def __lt__(self, diger):
+        return (self.bas_saat, self.id) < (diger.bas_saat, diger.id)
+
+    def __repr__(self):
+        return f"ZilKaydi({self.id}, {self.gun}, {self.tur!r}, {self.bas_saat!r}, {self.sure}, {self.bolge!r})"
+
+
+class ProgramOnbellegi:
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._kilit = threading.RLock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._gunler = None         # {(bolge, gun): [ZilKaydi, ...]} – ilk erişimde dolar
+        self._idler = {}            # {id: ZilKaydi}
+        self._cizelgeler = {}       # {bolge: HaftalikCizelge} – kayıtlarla birlikte güncellenir
+        self._bolge_ayarlari = {}   # {bolge: (ses_klasoru, cikis)}
+        self._denetci = AralikDenetcisi()   # (bolge, gun) başına çakışma / boşluk denetimi
+        self._takvim = None         # TarihOnbellegi: (bolge, tarih) → kural + istisnalar uygulanmış program
+        self._hesap_gunu = None     # takvimin en son hangi günden itibaren önceden çözüldüğü
+        self._data_version = None
+        self._dinleyiciler = []
+        self.surum = 0              # her değişiklikte artar
+
+    # ---------- okuma ----------
+    def gun(self, gun, bolge=VARSAYILAN_BOLGE):
+        """Bölgenin o günkü kayıtları (bas_saat sıralı); diske gitmez"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return tuple(self._gunler.get((bolge, gun), ()))
+
+    def kayit(self, zil_id):
+        """id → ZilKaydi | None"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._idler.get(zil_id)
+
+    def kayitlar(self, bolge=None):
+        """Bölgenin (None → tüm bölgelerin) kayıtları; bölge, gün, bas_saat sıralı"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return [k for (b, _), gun in sorted(self._gunler.items())
+                    if bolge is None or b == bolge for k in gun]
+
+    def tarih(self, tarih, bolge=VARSAYILAN_BOLGE):
+        """
+        Bölgenin o tarihteki etkin programı: ((tur, bas_saat, sure), ...) – dönüşüm
+        kuralları (A/B haftası, dönem) ve tatil / plan / kaydırma istisnaları
+        uygulanmış; önümüzdeki haftalar önceden çözülüdür, diğer tarihler LRU'dadır
+        """
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._takvim.gun(bolge, tarih)
+
+    def istisnalar(self, tarih=None, bolge=None):
+        """Tüm istisnalar ya da tarihi (ve bölgeyi) kapsayanlar – Istisna listesi, id sıralı"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._takvim.istisnalar(tarih, bolge)
+
+    def plan_adi(self, tarih, bolge=VARSAYILAN_BOLGE):
+        """Tarihte dönüşüm kuralıyla geçerli planın adı ya da None (haftalık program)"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._takvim.plan_adi(bolge, tarih)
+
+    def kurallar(self):
+        """Dönüşüm kuralları – PlanKurali listesi, id sıralı"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._takvim.kurallar()
+
+    def planlar(self):
+        """{plan adı: {gun | None: ((tur, bas_saat, sure), ...)}} – None: her gün"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._takvim.planlar()
+
+    def denetle(self, gun, bas_saat, sure, bolge=VARSAYILAN_BOLGE, haric=None):
+        """Kayıt eklenir / güncellenirse oluşacak çakışma, boşluk, ters aralık bulguları"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            bas = saat_dakika(bas_saat)
+            return self._denetci.denetle((bolge, gun), bas, bas + sure, haric)
+
+    def bolgeler(self):
+        """Kaydı ya da ses ayarı olan bölgeler (varsayılan bölge her zaman var)"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return sorted({VARSAYILAN_BOLGE} | set(self._cizelgeler) | set(self._bolge_ayarlari))
+
+    def bolge_ayari(self, bolge):
+        """(ses_klasoru, cikis) – ayarlanmamış alanlar None"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._bolge_ayarlari.get(bolge, (None, None))
+
+    def cizelge(self, bolge=VARSAYILAN_BOLGE):
+        """Bölgenin derlenmiş haftalık çizelgesi (zaman_cizelgesi.HaftalikCizelge)"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            if bolge not in self._cizelgeler:
+                self._cizelgeler[bolge] = HaftalikCizelge()
+            return self._cizelgeler[bolge]
+
+    @olculen("onbellek_yukle")
+    def _yukle(self):
+        gunler, idler, bolgeler = {}, {}, {}
+        for row in self._conn.execute(
+                "SELECT id, gun, tur, bas_saat, sure, bolge FROM zil ORDER BY bolge, gun, bas_saat, id"):
+            kayit = idler[row[0]] = ZilKaydi(*row)
+            gunler.setdefault((kayit.bolge, kayit.gun), []).append(kayit)
+            bolgeler.setdefault(kayit.bolge, []).append(kayit)
+        self._gunler, self._idler = gunler, idler
+        self._denetci = AralikDenetcisi(_denetim_girdisi(k) for k in idler.values())
+        planlar = {}
+        for plan, gun, tur, bas_saat, sure in self._conn.execute(
+                "SELECT plan, gun, tur, bas_saat, sure FROM plan_zil ORDER BY plan, bas_saat, id"):
+            planlar.setdefault(plan, {}).setdefault(gun, ())
+            planlar[plan][gun] += ((tur, bas_saat, sure),)
+        self._takvim = TarihOnbellegi(
+            self._taban,
+            (Istisna(*r) for r in self._conn.execute(
+                "SELECT id, bas_tarih, bit_tarih, tur, plan, kayma, bolge, aciklama FROM istisna")),
+            planlar,
+            (PlanKurali(*r) for r in self._conn.execute(
+                "SELECT id, plan, bas_tarih, bit_tarih, aralik, faz, bolge, oncelik FROM plan_kurali")))
+        self._cizelgeler = {b: zil_cizelgesi(k) for b, k in bolgeler.items()}
+        self._bolge_ayarlari = {ad: (klasor, cikis) for ad, klasor, cikis in
+                                self._conn.execute("SELECT ad, ses_klasoru, cikis FROM bolge")}
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        self._onhesapla()
+
+    def _bolge_yukle(self, bolge):
+        """Yalnızca bölgenin kayıtlarını yeniden oku; diğer bölgelerin önbelleği olduğu gibi kalır"""
+        for kayit in [k for k in self._idler.values() if k.bolge == bolge]:
+            del self._idler[kayit.id]
+            self._denetci.sil(kayit.id)
+        for anahtar in [a for a in self._gunler if a[0] == bolge]:
+            del self._gunler[anahtar]
+        kayitlar = []
+        for row in self._conn.execute(
+                "SELECT id, gun, tur, bas_saat, sure, bolge FROM zil WHERE bolge=? ORDER BY gun, bas_saat, id",
+                (bolge,)):
+            kayit = self._idler[row[0]] = ZilKaydi(*row)
+            self._gunler.setdefault((bolge, kayit.gun), []).append(kayit)
+            self._denetci.ekle(*_denetim_girdisi(kayit))
+            kayitlar.append(kayit)
+        if kayitlar:
+            self._cizelgeler[bolge] = zil_cizelgesi(kayitlar)
+        else:
+            self._cizelgeler.pop(bolge, None)
+        self._takvim.program_degisti(bolge)
+        self._onhesapla((bolge,))
+
+    def _taban(self, bolge, gun):
+        # takvimin haftalık kaynağı; kilit altında çağrılır
+        return [(k.tur, k.bas_saat, k.sure) for k in self._gunler.get((bolge, gun), ())]
+
+    def _onhesapla(self, bolgeler=()):
+        """
+        Ufku bugünden itibaren ILERI_GUN güne taşı; yalnızca verilen (değişen)
+        bölgelerin günleri şimdi çözülür, diğerleri ilk sorulduğunda (tarih)
+        """
+        self._hesap_gunu = date.today()
+        self._takvim.onhesapla(bolgeler, self._hesap_gunu, ILERI_GUN)
+
+    @olculen("onbellek_tazele")
+    def tazele(self):
+        """Başka bir süreç veritabanını değiştirdiyse yeniden yükle; değiştiyse True"""
+        with self._kilit:
+            if self._gunler is None:
+                return False
+            if self._hesap_gunu != date.today():
+                self._onhesapla()       # gün döndü: ufuk bir gün ileri kayar
+            dv = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if dv == self._data_version:
+                return False
+            self._yukle()
+        self._degisti(None)
+        return True
+
+    # ---------- yazma (write-through) ----------
+    def ekle(self, gun, tur, bas_saat, sure, bolge=VARSAYILAN_BOLGE):
+        return self.toplu_islem([("ekle", gun, tur, bas_saat, sure, bolge)])[0]
+
+    def sil(self, zil_id):
+        self.toplu_islem([("sil", zil_id)])
+
+    def guncelle(self, zil_id, bas_saat, sure):
+        self.toplu_islem([("guncelle", zil_id, bas_saat, sure)])
+
+    @olculen("onbellek_yaz")
+    def toplu_islem(self, islemler):
+        """
+        Düzenlemeleri tek transaction'da yaz, önbelleği bir kez güncelle:
+          ("ekle", gun, tur, bas_saat, sure, bolge) | ("sil", id) | ("guncelle", id, bas_saat, sure)
+        Dönüş: işlem başına yeni id (ekle) ya da None. Hata olursa hiçbiri yazılmaz.
+        """
+        if not islemler:
+            return []
+        sonuclar, bolgeler = [], set()
+        with self._kilit:
+            with self._conn:
+                for islem in islemler:
+                    if islem[0] == "ekle":
+                        cur = self._conn.execute(
+                            "INSERT INTO zil (gun, tur, bas_saat, sure, bolge) VALUES (?,?,?,?,?)", islem[1:])
+                        zil_id = cur.lastrowid
+                        sonuclar.append(zil_id)
+                    elif islem[0] == "sil":
+                        zil_id = islem[1]
+                        self._conn.execute("DELETE FROM zil WHERE id=?", (zil_id,))
+                        sonuclar.append(None)
+                    elif islem[0] == "guncelle":
+                        zil_id = islem[1]
+                        self._conn.execute("UPDATE zil SET bas_saat=?, sure=? WHERE id=?", (*islem[2:], zil_id))
+                        sonuclar.append(None)
+                    else:
+                        raise ValueError(f"bilinmeyen işlem: {islem[0]!r}")
+                    kaydet(self._conn, "zil", islem[0], zil_id)
+            degisen = set()         # (bolge, gun): takvimde tek seferde geçersizlenir
+            for islem, zil_id in zip(islemler, sonuclar):
+                if islem[0] == "ekle":
+                    bolgeler.add(islem[5])
+                if self._gunler is not None:
+                    degisen.add(self._bellege_uygula(islem, zil_id))
+            degisen.discard(None)
+            if self._gunler is not None:
+                for bolge, gun in degisen:
+                    self._takvim.program_degisti(bolge, gun)
+                bolgeler |= {bolge for bolge, _ in degisen}
+                self._onhesapla(bolgeler)
+        self._degisti(bolgeler.pop() if len(bolgeler) == 1 else None)
+        return sonuclar
+
+    def _bellege_uygula(self, islem, yeni_id):
+        """Yazılmış tek işlemi önbelleğe uygula; etkilenen (bölge, gün) (kayıt yoksa None)"""
+        if islem[0] == "ekle":
+            _, gun, tur, bas_saat, sure, bolge = islem
+            kayit = self._idler[yeni_id] = ZilKaydi(yeni_id, gun, tur, bas_saat, sure, bolge)
+            insort(self._gunler.setdefault((bolge, gun), []), kayit)
+            self._denetci.ekle(*_denetim_girdisi(kayit))
+            self.cizelge(bolge).ekle(kayit.id, *zil_girdisi(gun, bas_saat, sure), kayit)
+        else:
+            kayit = self._cikar(islem[1])
+            if kayit is None:
+                return None
+            if islem[0] == "sil":
+                self._denetci.sil(kayit.id)
+                self._cizelgeler[kayit.bolge].sil(kayit.id)
+            else:
+                kayit.bas_saat, kayit.sure = islem[2:]
+                self._idler[kayit.id] = kayit
+                insort(self._gunler[(kayit.bolge, kayit.gun)], kayit)
+                self._denetci.guncelle(*_denetim_girdisi(kayit))
+                self._cizelgeler[kayit.bolge].guncelle(kayit.id, *zil_girdisi(kayit.gun, *islem[2:]), kayit)
+        return kayit.bolge, kayit.gun
+
+    def toplu_degistir(self, ziller, bolge=None):
+        """
+        Bölgenin (None → tüm programın) kayıtlarını tek transaction'da
+        ziller ile değiştir; ziller: [(gun, tur, bas_saat, sure, bolge), ...]
+        """
+        with self._kilit:
+            with self._conn:
+                if bolge is None:
+                    self._conn.execute("DELETE FROM zil")
+                else:
+                    self._conn.execute("DELETE FROM zil WHERE bolge=?", (bolge,))
+                self._conn.executemany(
+                    "INSERT INTO zil (gun, tur, bas_saat, sure, bolge) VALUES (?,?,?,?,?)", ziller)
+                yakala(self._conn, "zil")
+            if bolge is None or self._gunler is None:
+                self._yukle()
+            else:
+                self._bolge_yukle(bolge)
+        self._degisti(bolge)
+
+    def bolge_ayarla(self, bolge, ses_klasoru=None, cikis=None):
+        """Bölgenin ses klasörünü / çıkışını kaydet"""
+        with self._kilit:
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO bolge (ad, ses_klasoru, cikis) VALUES (?,?,?)",
+                                   (bolge, ses_klasoru, cikis))
+            if self._gunler is not None:
+                self._bolge_ayarlari[bolge] = (ses_klasoru, cikis)
+        self._degisti(bolge)
+
+    # ---------- istisnalar ----------
+    def istisna_ekle(self, bas, bit=None, tur="tatil", plan=None, kayma=0, bolge=None, aciklama=""):
+        """bas–bit (dahil, 'YYYY-MM-DD') aralığına istisna ekle; bolge None → tüm bölgeler"""
+        bas, bit = istisna_dogrula(bas, bit, tur, plan, kayma)
+        with self._kilit:
+            with self._conn:
+                cur = self._conn.execute(
+                    "INSERT INTO istisna (bas_tarih, bit_tarih, tur, plan, kayma, bolge, aciklama) "
+                    "VALUES (?,?,?,?,?,?,?)", (bas.isoformat(), bit.isoformat(), tur, plan, kayma, bolge, aciklama))
+                kaydet(self._conn, "istisna", "ekle", cur.lastrowid)
+            if self._gunler is not None:
+                self._takvim.istisna_degisti(yeni=Istisna(cur.lastrowid, bas, bit, tur, plan, kayma, bolge, aciklama))
+                self._onhesapla(_tek(bolge))
+        self._degisti(bolge)
+        return cur.lastrowid
+
+    def istisna_guncelle(self, istisna_id, bas, bit=None, tur="tatil", plan=None, kayma=0, bolge=None, aciklama=""):
+        """İstisnayı değiştir; eski ve yeni aralığın tarihleri yeniden çözülür"""
+        bas, bit = istisna_dogrula(bas, bit, tur, plan, kayma)
+        with self._kilit:
+            eski = self._istisna(istisna_id)
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE istisna SET bas_tarih=?, bit_tarih=?, tur=?, plan=?, kayma=?, bolge=?, aciklama=? "
+                    "WHERE id=?", (bas.isoformat(), bit.isoformat(), tur, plan, kayma, bolge, aciklama, istisna_id))
+                kaydet(self._conn, "istisna", "guncelle", istisna_id)
+            if self._gunler is not None:
+                self._takvim.istisna_degisti(eski, Istisna(istisna_id, bas, bit, tur, plan, kayma, bolge, aciklama))
+                self._onhesapla(_tek(bolge) if eski is not None and eski.bolge == bolge else ())
+        self._degisti(None if eski is None or eski.bolge != bolge else bolge)
+
+    def istisna_sil(self, istisna_id):
+        """İstisnayı sil; yoksa False"""
+        with self._kilit:
+            eski = self._istisna(istisna_id)
+            with self._conn:
+                silinen = self._conn.execute("DELETE FROM istisna WHERE id=?", (istisna_id,)).rowcount
+                kaydet(self._conn, "istisna", "sil", istisna_id)
+            if self._gunler is not None and eski is not None:
+                self._takvim.istisna_degisti(eski=eski)
+                self._onhesapla(_tek(eski.bolge))
+        if silinen:
+            self._degisti(eski.bolge if eski is not None else None)
+        return bool(silinen)
+
+    def plan_ayarla(self, plan, ziller, gun=None):
+        """
+        Adlandırılmış planın bir gününü (None → her gün satırları) ziller
+        [(tur, bas_saat, sure), ...] ile değiştir (boş → o günü sil); yalnızca
+        bu planı kullanan tarihler yeniden çözülür
+        """
+        if not plan:
+            raise ValueError("plan adı boş olamaz")
+        ziller = [(tur, bas_saat, int(sure)) for tur, bas_saat, sure in ziller]
+        engeller = [b for b in hafta_tara((i, plan, saat_dakika(s), saat_dakika(s) + d)
+                                          for i, (_, s, d) in enumerate(ziller)) if b.engel]
+        if engeller:
+            raise ValueError(f"{plan}: {engeller[0]}")
+        with self._kilit:
+            with self._conn:
+                eski = [r[0] for r in self._conn.execute(
+                    "SELECT id FROM plan_zil WHERE plan=? AND gun IS ?", (plan, gun))]
+                self._conn.execute("DELETE FROM plan_zil WHERE plan=? AND gun IS ?", (plan, gun))
+                for plan_id in eski:
+                    kaydet(self._conn, "plan_zil", "sil", plan_id)
+                for tur, bas_saat, sure in ziller:
+                    cur = self._conn.execute(
+                        "INSERT INTO plan_zil (plan, tur, bas_saat, sure, gun) VALUES (?,?,?,?,?)",
+                        (plan, tur, bas_saat, sure, gun))
+                    kaydet(self._conn, "plan_zil", "ekle", cur.lastrowid)
+            if self._gunler is not None:
+                self._takvim.plan_degisti(plan, gun, sorted(ziller, key=lambda z: z[1]))
+                self._onhesapla()
+        self._degisti(None)
+
+    def kural_ekle(self, plan, bas=None, bit=None, aralik=1, faz=0, bolge=None, oncelik=0):
+        """Dönüşüm kuralı: bas–bit döneminde her `aralik` haftanın `faz`. haftasında plan"""
+        bas, bit = kural_dogrula(plan, bas, bit, aralik, faz)
+        with self._kilit:
+            with self._conn:
+                cur = self._conn.execute(
+                    "INSERT INTO plan_kurali (plan, bas_tarih, bit_tarih, aralik, faz, bolge, oncelik) "
+                    "VALUES (?,?,?,?,?,?,?)",
+                    (plan, bas and bas.isoformat(), bit and bit.isoformat(), aralik, faz, bolge, oncelik))
+                kaydet(self._conn, "plan_kurali", "ekle", cur.lastrowid)
+            if self._gunler is not None:
+                self._takvim.kural_degisti(yeni=PlanKurali(cur.lastrowid, plan, bas, bit, aralik, faz, bolge, oncelik))
+                self._onhesapla(_tek(bolge))
+        self._degisti(bolge)
+        return cur.lastrowid
+
+    def kural_sil(self, kural_id):
+        """Dönüşüm kuralını sil; yoksa False"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            eski = next((k for k in self._takvim.kurallar() if k.id == kural_id), None)
+            with self._conn:
+                silinen = self._conn.execute("DELETE FROM plan_kurali WHERE id=?", (kural_id,)).rowcount
+                kaydet(self._conn, "plan_kurali", "sil", kural_id)
+            if eski is not None:
+                self._takvim.kural_degisti(eski=eski)
+                self._onhesapla(_tek(eski.bolge))
+        if silinen:
+            self._degisti(eski.bolge if eski is not None else None)
+        return bool(silinen)
+
+    def _istisna(self, istisna_id):
+        if self._gunler is None:
+            self._yukle()
+        return next((i for i in self._takvim.istisnalar() if i.id == istisna_id), None)
+
+    def _cikar(self, zil_id):
+        kayit = self._idler.pop(zil_id, None)
+        if kayit is not None:
+            self._gunler[(kayit.bolge, kayit.gun)].remove(kayit)
+        return kayit
+
+    # ---------- bildirim ----------
+    def dinleyici_ekle(self, fn):
+        """fn(bolge) her değişiklikten sonra çağrılır (değişikliği yapan thread'de); None → tüm bölgeler"""
+        self._dinleyiciler.append(fn)
+
+    def _degisti(self, bolge):
+        self.surum += 1
+        for fn in list(self._dinleyiciler):
+            fn(bolge)
+
+
+def _tek(bolge):
+    # tek bölgeye ait değişiklik o bölgede hemen çözülür; tüm bölgeler (None) tembel dolar
+    return () if bolge is None else (bolge,)
+
+
+def _denetim_girdisi(k):
+    bas = saat_dakika(k.bas_saat)
+    return k.id, (k.bolge, k.gun), bas, bas + k.sure
+
+
+_onbellekler = {}
+_onbellek_kilidi = threading.Lock()
+
+def onbellek(db_file):
+    """Veritabanı dosyası başına tek (süreç genelinde paylaşılan) önbellek"""
+    with _onbellek_kilidi:
+        if db_file not in _onbellekler:
+            _onbellekler[db_file] = ProgramOnbellegi(db_file)
+        return _onbellekler[db_file]
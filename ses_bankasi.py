@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ses bankası – zil seslerinin bellekte, çözülmüş (PCM) hali
+Klasördeki her desteklenen dosya yüklemede bir kez çözülür; çalma anında
+disk ya da çözme işi yapılmaz. WAV standart kütüphaneyle okunur, MP3 için
+PATH'te ffmpeg varsa PCM'e dönüştürülür. Aynı adlı WAV varsa o tercih edilir.
+"""
+
+import os, io, wave, shutil, subprocess, threading, time
+from collections import deque
+import olcum
+
+DESTEKLENEN = (".wav", ".mp3")          # öncelik sırası
+
+# zil türü → ses anahtarı (dosya adı, uzantısız)
+TUR_ANAHTAR = {"DERS": "ders", "TENEFFUS": "teneffus"}
+
+
+class SesVerisi:
+    __slots__ = ("anahtar", "kanal", "ornek_hizi", "ornek_genisligi", "pcm", "kaynak")
+
+    def __init__(self, anahtar, kanal, ornek_hizi, ornek_genisligi, pcm, kaynak):
+        self.anahtar, self.kanal, self.ornek_hizi = anahtar, kanal, ornek_hizi
+        self.ornek_genisligi, self.pcm, self.kaynak = ornek_genisligi, pcm, kaynak
+
+    @property
+    def sure(self):
+        return len(self.pcm) / (self.kanal * self.ornek_genisligi * self.ornek_hizi)
+
+    def wav_baytlari(self):
+        """Bellekte WAV dosyası (winsound.SND_MEMORY vb. için)"""
+        tampon = io.BytesIO()
+        with wave.open(tampon, "wb") as w:
+            w.setnchannels(self.kanal)
+            w.setsampwidth(self.ornek_genisligi)
+            w.setframerate(self.ornek_hizi)
+            w.writeframes(self.pcm)
+        return tampon.getvalue()
+
+
+def _wav_coz(yol_ya_da_dosya):
+    with wave.open(yol_ya_da_dosya, "rb") as w:
+        return w.getnchannels(), w.getframerate(), w.getsampwidth(), w.readframes(w.getnframes())
+
+
+def _mp3_coz(yol):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("MP3 için ffmpeg bulunamadı")
+    cikti = subprocess.run([ffmpeg, "-v", "error", "-i", yol, "-f", "wav", "-acodec", "pcm_s16le", "-"],
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+    return _wav_coz(io.BytesIO(cikti))
+
+
+def ses_coz(yol):
+    """Dosyayı çöz → (kanal, ornek_hizi, ornek_genisligi, pcm)"""
+    if yol.lower().endswith(".mp3"):
+        return _mp3_coz(yol)
+    return _wav_coz(yol)
+
+
+class SesBankasi:
+    def __init__(self, klasor):
+        self.klasor = klasor
+        self.sesler = {}            # anahtar → SesVerisi
+        self._damgalar = {}         # yol → (mtime_ns, boyut)
+        self.yukle()
+
+    def yukle(self):
+        """Klasördeki tüm desteklenen dosyaları baştan çöz"""
+        self._damgalar = {}
+        self.tara()
+
+    def tara(self):
+        """
+        Yalnızca değişen dosyaları çözer; değişmeyenlerin SesVerisi'si aynen
+        kullanılır. Yeni ses kümesi tek atamayla devreye girer. Değişiklik varsa True.
+        """
+        damgalar = {}
+        for yol in self.dosyalar():
+            try:
+                st = os.stat(yol)
+            except OSError:
+                continue
+            damgalar[yol] = (st.st_mtime_ns, st.st_size)
+        if damgalar == self._damgalar:
+            return False
+        eski = {s.kaynak: s for s in self.sesler.values()}
+        sesler = {}
+        for yol, damga in damgalar.items():
+            anahtar = os.path.splitext(os.path.basename(yol))[0].lower()
+            if anahtar in sesler:
+                continue
+            if yol in eski and self._damgalar.get(yol) == damga:
+                sesler[anahtar] = eski[yol]
+                continue
+            try:
+                sesler[anahtar] = SesVerisi(anahtar, *ses_coz(yol), yol)
+            except Exception as e:
+                print(f"[UYARI] {yol} çözülemedi – {e}")
+                olcum.hata("ses_coz", e)
+        degisti = sesler != self.sesler
+        self.sesler, self._damgalar = sesler, damgalar
+        return degisti
+
+    def klasor_ayarla(self, klasor):
+        """Klasörü değiştir; bir sonraki tara() her şeyi yeniden çözer"""
+        self.klasor = klasor
+        self._damgalar = {}
+
+    def dosyalar(self):
+        """Desteklenen dosyalar, aynı anahtar için öncelikli uzantı önce gelecek şekilde"""
+        try:
+            adlar = os.listdir(self.klasor)
+        except OSError:
+            return []
+        secilen = [ad for ad in adlar if os.path.splitext(ad)[1].lower() in DESTEKLENEN]
+        secilen.sort(key=lambda ad: (os.path.splitext(ad)[0].lower(),
+                                     DESTEKLENEN.index(os.path.splitext(ad)[1].lower())))
+        return [os.path.join(self.klasor, ad) for ad in secilen]
+
+    def sec(self, tur):
+        """Zil türü ('DERS', 'TENEFFUS', …) ya da doğrudan anahtar → SesVerisi | None"""
+        return self.sesler.get(TUR_ANAHTAR.get(tur, str(tur).lower()))
+
+
+class SesIzleyici(threading.Thread):
+    """
+    Ses klasörünü arka planda izler (stat/mtime), değişen dosyaları bu
+    thread'de çözer ve yeni ses kümesini geri_cagir(sesler) ile bildirir.
+    """
+
+    def __init__(self, banka, geri_cagir, aralik=2.0):
+        super().__init__(daemon=True)
+        self.banka = banka
+        self.geri_cagir = geri_cagir
+        self.aralik = aralik
+        self._kosul = threading.Condition()
+        self._yeni_klasor = None
+        self._calisiyor = True
+
+    def klasor_degistir(self, klasor):
+        """Bloklamaz; yükleme izleyici thread'inde yapılır"""
+        with self._kosul:
+            self._yeni_klasor = klasor
+            self._kosul.notify()
+
+    def stop(self):
+        with self._kosul:
+            self._calisiyor = False
+            self._kosul.notify()
+
+    def run(self):
+        while True:
+            with self._kosul:
+                if self._yeni_klasor is None and self._calisiyor:
+                    self._kosul.wait(self.aralik)
+                if not self._calisiyor:
+                    return
+                klasor, self._yeni_klasor = self._yeni_klasor, None
+            if klasor is not None:
+                self.banka.klasor_ayarla(klasor)
+            try:
+                if self.banka.tara() or klasor is not None:
+                    self.geri_cagir(self.banka.sesler)
+            except Exception as e:
+                print(f"[UYARI] ses klasörü taranamadı – {e}")
+
+
+# ---------- gecikme ölçümü ----------
+class GecikmeKaydi:
+    """Tetik → çalmanın başlaması arasındaki süreyi (ms) zil başına kaydeder"""
+
+    def __init__(self, butce_ms=100.0, boyut=500):
+        self.butce_ms = butce_ms
+        self._kayitlar = deque(maxlen=boyut)      # (zaman, tur, gecikme_ms)
+        self._kilit = threading.Lock()
+
+    def kaydet(self, tur, tetik, baslama):
+        """tetik, baslama: time.perf_counter() değerleri"""
+        ms = (baslama - tetik) * 1000.0
+        olcum.gozle("zil_ses_gecikme_saniye", ms / 1000.0, tur=tur)
+        with self._kilit:
+            self._kayitlar.append((time.time(), tur, ms))
+        if ms > self.butce_ms:
+            print(f"[UYARI] {tur} zili {ms:.1f} ms gecikmeyle başladı (bütçe {self.butce_ms:.0f} ms)")
+        return ms
+
+    def ozet(self):
+        """{'adet', 'p50', 'p95', 'maks', 'butce_asimi'} – ms"""
+        with self._kilit:
+            degerler = sorted(k[2] for k in self._kayitlar)
+        if not degerler:
+            return {"adet": 0, "p50": None, "p95": None, "maks": None, "butce_asimi": 0}
+        n = len(degerler)
+        return {"adet": n,
+                "p50": degerler[n // 2],
+                "p95": degerler[min(n - 1, int(n * 0.95))],
+                "maks": degerler[-1],
+                "butce_asimi": sum(1 for d in degerler if d > self.butce_ms)}
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Qt'siz ses çıkışı – başsız (headless) zil servisi için
+Ses bankasındaki PCM, platformun en basit oynatıcısıyla çalınır:
+Windows'ta winsound (bellekten), Linux'ta aplay/pw-play/paplay, macOS'ta afplay.
+Hiçbiri yoksa ya da test için "null" çıkış seçilebilir.
+
+Çıkışların cal(hazir, basladi=None) yöntemi ses gerçekten çıkışa verilmeye
+başladığında basladi()'yı çağırır; başlama gecikmesi o anla ölçülür.
+"""
+
+import os, sys, shutil, subprocess, tempfile, threading, time
+from ses_bankasi import GecikmeKaydi, TUR_ANAHTAR
+from olcum import olculen
+import olcum
+
+
+ILK_PARCA = 4096            # komut oynatıcısına başlamadan önce yazılan bayt (WAV başlığı + ilk PCM)
+
+
+class NullCikis:
+    """Ses kartı gerektirmez; çalınan her sesi kaydeder"""
+    ad = "null"
+
+    def __init__(self):
+        self.calinanlar = []        # (perf_counter, anahtar)
+
+    def hazirla(self, ses):
+        return ses.anahtar
+
+    def cal(self, hazir, basladi=None):
+        self.calinanlar.append((time.perf_counter(), hazir))
+        if basladi is not None:
+            basladi()
+
+
+class WinsoundCikis:
+    ad = "winsound"
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+
+    def hazirla(self, ses):
+        return ses.wav_baytlari()
+
+    def cal(self, hazir, basladi=None):
+        # SND_MEMORY eşzamansız çalamaz ve başlama bildirmez: en yakın an, çağrıdan hemen önce
+        if basladi is not None:
+            basladi()
+        self._winsound.PlaySound(hazir, self._winsound.SND_MEMORY)
+
+
+class KomutCikis:
+    """WAV'ı stdin'den okuyan komut satırı oynatıcısı (aplay -, pw-play -, paplay)"""
+
+    def __init__(self, komut):
+        self.komut = komut
+        self.ad = os.path.basename(komut[0])
+
+    def hazirla(self, ses):
+        return ses.wav_baytlari()
+
+    def cal(self, hazir, basladi=None):
+        p = subprocess.Popen(self.komut, stdin=subprocess.PIPE,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            # başlık + ilk PCM oynatıcıya geçince çalma başlamıştır; kalanı oynatıcı okudukça yazılır
+            p.stdin.write(hazir[:ILK_PARCA])
+            p.stdin.flush()
+            if basladi is not None:
+                basladi()
+            p.stdin.write(hazir[ILK_PARCA:])
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                p.stdin.close()
+            except BrokenPipeError:
+                pass
+            p.wait()
+
+
+class DosyaKomutCikis:
+    """Yalnızca dosyadan çalan oynatıcılar (afplay): WAV yüklemede geçici dosyaya yazılır"""
+
+    def __init__(self, komut):
+        self.komut = komut
+        self.ad = os.path.basename(komut[0])
+        self._klasor = tempfile.mkdtemp(prefix="zil_")
+
+    def hazirla(self, ses):
+        yol = os.path.join(self._klasor, f"{ses.anahtar}.wav")
+        with open(yol, "wb") as f:
+            f.write(ses.wav_baytlari())
+        return yol
+
+    def cal(self, hazir, basladi=None):
+        p = subprocess.Popen(self.komut + [hazir], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if basladi is not None:
+            basladi()           # dosyayı oynatıcı açar: en yakın an süreç başlatıldığı an
+        p.wait()
+
+
+def varsayilan_cikis(ad=None):
+    """
+    ad: None (otomatik) | 'null' | 'winsound' | 'aplay' | 'pw-play' | 'paplay' | 'afplay'
+    Komut oynatıcılarında cihaz eklenebilir: 'aplay:hw:1,0', 'paplay:alsa_output.usb-…'
+    """
+    tam_ad = ad
+    ad, _, cihaz = (ad or "").partition(":")
+    ad = ad or None
+    if ad == "null":
+        return NullCikis()
+    if ad in (None, "winsound") and sys.platform == "win32":
+        return WinsoundCikis()
+    adaylar = {"aplay":   (["aplay", "-q", "-"],  lambda c: ["-D", c]),
+               "pw-play": (["pw-play", "-"],      lambda c: ["--target", c]),
+               "paplay":  (["paplay"],            lambda c: [f"--device={c}"])}
+    for aday, (komut, cihaz_secenegi) in adaylar.items():
+        if ad in (None, aday) and shutil.which(komut[0]):
+            ek = cihaz_secenegi(cihaz) if cihaz else []
+            cikis = KomutCikis([shutil.which(komut[0])] + ek + komut[1:])
+            cikis.ad = tam_ad or aday
+            return cikis
+    if ad in (None, "afplay") and shutil.which("afplay"):
+        return DosyaKomutCikis([shutil.which("afplay")])
+    if ad is not None:
+        raise ValueError(f"ses çıkışı kullanılamıyor: {tam_ad}")
+    print("[UYARI] ses oynatıcısı bulunamadı – sessiz (null) çıkış kullanılacak")
+    return NullCikis()
+
+
+class ZilCalici:
+    """
+    Qt'siz ZilPlayer karşılığı: sesler önceden çıkışa hazırlanır, her zil ayrı
+    bir thread'de çalınır; zamanlayıcı thread'i bloklanmaz.
+    """
+
+    def __init__(self, banka, cikis=None):
+        self.banka = banka
+        self.cikis = cikis or varsayilan_cikis()
+        self.gecikme = GecikmeKaydi()
+        self._hazir = {}
+        self.sesler_degisti(banka.sesler)
+
+    def sesler_degisti(self, sesler):
+        """Yeni ses kümesini hazırla ve tek atamayla devreye al"""
+        hazir = {}
+        for anahtar, ses in sesler.items():
+            try:
+                hazir[anahtar] = self.cikis.hazirla(ses)
+            except Exception as e:
+                print(f"[UYARI] {anahtar} sesi hazırlanamadı – {e}")
+        self._hazir = hazir
+
+    @olculen("ses_cal")
+    def cal(self, tur, _sure, tetik=0.0):
+        tetik = tetik or time.perf_counter()
+        hazir = self._hazir.get(TUR_ANAHTAR.get(tur, str(tur).lower()))
+        if hazir is None:
+            print(f"[UYARI] {tur} için ses yok")
+            return
+        threading.Thread(target=self._cal, args=(tur, hazir, tetik), daemon=True).start()
+
+    def durdur(self):
+        """SurecCalici ile aynı arayüz; bırakılacak kaynak yok"""
+
+    def _cal(self, tur, hazir, tetik):
+        try:
+            self.cikis.cal(hazir, lambda: self.gecikme.kaydet(tur, tetik, time.perf_counter()))
+        except Exception as e:
+            print(f"[UYARI] {tur} zili çalınamadı – {e}")
+            olcum.hata("ses_cal", e)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Süreç dışı ses motoru – GUI ya da GIL duraklamaları zili geciktirmesin
+Zil sesleri ana süreçte bir kez çözülür, PCM'ler paylaşımlı belleğe
+(multiprocessing.shared_memory) yazılır; ayrı bir ses işçisi süreci onları
+oradan okuyup çıkışa (ses_cikisi: aplay / winsound / afplay / null) hazırlar.
+Zamanlayıcı thread'i Pipe üzerinden ("cal", no, anahtar) gönderir; işçi
+çalmayı başlattığı anı (perf_counter – sistem geneli monoton saat) geri
+bildirir, tetik → başlama gecikmesi o anla ölçülür.
+
+İşçi çökerse denetçi thread'i onu yeniden başlatır ve ses kümesini yeniden
+yollar; işçi ayakta değilken gelen zil süreç içinde (ZilCalici) çalınır.
+İşçi başlatılırken üst sürecin __main__'i (main.py – PyQt5, pencere
+sınıfları) çocukta yeniden yüklenmez; işçi yalnızca bu modülü içe aktarır.
+Python 3.8+ gerekir (shared_memory).
+"""
+
+import itertools, multiprocessing, os, sys, threading, time, types
+from multiprocessing import shared_memory
+from ses_bankasi import SesVerisi, GecikmeKaydi, TUR_ANAHTAR
+from ses_cikisi import ZilCalici, varsayilan_cikis
+from olcum import olculen
+import olcum
+
+DENETIM_SN        = 0.5     # işçi canlılık yoklaması
+YENIDEN_BEKLEME   = 30.0    # art arda çöken işçi için en uzun bekleme (sn)
+KARARLI_SN        = 60.0    # bu kadar ayakta kalan işçinin çökmesi "art arda" sayılmaz
+KAPANIS_SN        = 2.0
+
+
+# ---------- işçi süreci ----------
+def isci(baglanti, cikis_adi):
+    """Ses işçisi: Pipe'tan komut okur, her zili ayrı thread'de çalar, başlama anını bildirir"""
+    cikis = varsayilan_cikis(cikis_adi)
+    kilit = threading.Lock()
+    hazir, bellek = {}, None
+
+    def yolla(*mesaj):
+        with kilit:
+            baglanti.send(mesaj)
+
+    def cal(no, hazir_ses):
+        # başlama anı çıkış sesi gerçekten vermeye başlayınca (oynatıcı başlatılıp ilk veri yazılınca) bildirilir
+        try:
+            cikis.cal(hazir_ses, lambda: yolla("basladi", no, time.perf_counter()))
+        except Exception as e:
+            yolla("hata", no, str(e))
+
+    yolla("hazir", os.getpid(), cikis.ad)
+    while True:
+        try:
+            mesaj = baglanti.recv()
+        except (EOFError, OSError):
+            break
+        if mesaj[0] == "cal":
+            _, no, anahtar = mesaj
+            if anahtar not in hazir:
+                yolla("hata", no, f"{anahtar} sesi yok")
+                continue
+            threading.Thread(target=cal, args=(no, hazir[anahtar]), daemon=True).start()
+        elif mesaj[0] == "sesler":
+            _, ad, tanimlar, surum = mesaj
+            # bağlanan işçi de kaynak izleyicisine kaydolur; izleyici ana süreçle ortak
+            # olduğundan (spawn) bu yinelenen bir kayıttır, bloğu ana süreç siler
+            yeni_bellek, yeni = shared_memory.SharedMemory(name=ad), {}
+            for anahtar, ofset, uzunluk, kanal, ornek_hizi, ornek_genisligi, kaynak in tanimlar:
+                pcm = yeni_bellek.buf[ofset:ofset + uzunluk]
+                try:
+                    yeni[anahtar] = cikis.hazirla(SesVerisi(anahtar, kanal, ornek_hizi, ornek_genisligi, pcm, kaynak))
+                except Exception as e:
+                    yolla("hata", None, f"{anahtar} sesi hazırlanamadı – {e}")
+                finally:
+                    pcm.release()
+            hazir, eski, bellek = yeni, bellek, yeni_bellek
+            if eski is not None:
+                eski.close()
+            yolla("sesler_tamam", surum)
+        elif mesaj[0] == "kapat":
+            break
+    if bellek is not None:
+        bellek.close()
+
+
+# ---------- ana süreç tarafı ----------
+class SurecCalici:
+    """
+    ZilCalici ile aynı arayüz (sesler_degisti, cal, gecikme, cikis, durdur);
+    çalma ayrı bir süreçte. cal() herhangi bir thread'den çağrılabilir.
+    """
+
+    def __init__(self, banka, cikis=None):
+        self.banka = banka
+        self.cikis = cikis or varsayilan_cikis()    # işçide aynı adla yeniden kurulur
+        self.gecikme = GecikmeKaydi()
+        self.sayaclar = {"calan": 0, "yedek": 0, "hata": 0, "yeniden_baslatma": 0}
+        self._ctx = multiprocessing.get_context("spawn")     # Qt'li süreci çatallamaz
+        self._kilit = threading.RLock()
+        self._sira = itertools.count(1)
+        self._bekleyen = {}         # no → (tur, tetik)
+        self._bellekler = {}        # sürüm → SharedMemory (işçi yenisini alınca eskiler silinir)
+        self._ses_mesaji = None
+        self._anahtarlar = set()
+        self._surum = 0
+        self._yedek = None          # ZilCalici – işçi ayakta değilken
+        self._surec = self._baglanti = None
+        self._basladi = 0.0
+        self._calisiyor = True
+        self.sesler_degisti(banka.sesler)
+        self._baslat()
+        threading.Thread(target=self._denetle, name="ses-denetci", daemon=True).start()
+
+    # ---------- dış arayüz ----------
+    def sesler_degisti(self, sesler):
+        """PCM'leri yeni bir paylaşımlı bellek bloğuna yaz, işçiye bildir"""
+        bellek = shared_memory.SharedMemory(create=True, size=max(1, sum(len(s.pcm) for s in sesler.values())))
+        tanimlar, ofset = [], 0
+        for anahtar, ses in sesler.items():
+            bellek.buf[ofset:ofset + len(ses.pcm)] = ses.pcm
+            tanimlar.append((anahtar, ofset, len(ses.pcm), ses.kanal, ses.ornek_hizi, ses.ornek_genisligi, ses.kaynak))
+            ofset += len(ses.pcm)
+        with self._kilit:
+            self._surum += 1
+            self._bellekler[self._surum] = bellek
+            self._ses_mesaji = ("sesler", bellek.name, tanimlar, self._surum)
+            self._anahtarlar = set(sesler)
+            if self._surec is not None:
+                self._gonder(self._ses_mesaji)
+            yedek = self._yedek
+        if yedek is not None:
+            yedek.sesler_degisti(sesler)
+
+    @olculen("ses_cal")
+    def cal(self, tur, sure=0, tetik=0.0):
+        tetik = tetik or time.perf_counter()
+        anahtar = TUR_ANAHTAR.get(tur, str(tur).lower())
+        with self._kilit:
+            if anahtar not in self._anahtarlar:
+                print(f"[UYARI] {tur} için ses yok")
+                return
+            no = next(self._sira)
+            self._bekleyen[no] = (tur, tetik)
+            if self._gonder(("cal", no, anahtar)):
+                return
+            del self._bekleyen[no]
+            self.sayaclar["yedek"] += 1
+            olcum.say("zil_ses_yedek_toplam")
+            if self._yedek is None:
+                self._yedek = ZilCalici(self.banka, self.cikis)
+                self._yedek.gecikme = self.gecikme      # yedekte çalanlar da aynı kayda düşer
+            yedek = self._yedek
+        yedek.cal(tur, sure, tetik)
+
+    def durdur(self):
+        with self._kilit:
+            self._calisiyor = False
+            surec = self._surec
+            self._gonder(("kapat",))
+        if surec is not None:
+            surec.join(KAPANIS_SN)
+            if surec.is_alive():
+                surec.terminate()
+        with self._kilit:
+            for bellek in self._bellekler.values():
+                _birak(bellek)
+            self._bellekler.clear()
+
+    # ---------- işçi yönetimi ----------
+    def _baslat(self):
+        ana, cocuk = self._ctx.Pipe()
+        surec = self._ctx.Process(target=isci, args=(cocuk, self.cikis.ad), name="zil-ses-iscisi", daemon=True)
+        # spawn, __main__'in dosyasını çocukta yeniden çalıştırır (main.py → PyQt5, her yeniden
+        # başlatmada); hazırlık verisi start() içinde okunduğundan o an boş bir __main__ gösterilir
+        ana_modul = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            surec.start()
+        finally:
+            sys.modules["__main__"] = ana_modul
+        cocuk.close()
+        with self._kilit:
+            self._surec, self._baglanti, self._basladi = surec, ana, time.monotonic()
+            self._gonder(self._ses_mesaji)
+        threading.Thread(target=self._oku, args=(ana,), name="ses-yanitlari", daemon=True).start()
+
+    def _gonder(self, mesaj):
+        """Kilit altında çağrılır; işçi yoksa / boru kırıksa False"""
+        if self._surec is None or not self._surec.is_alive():
+            return False
+        try:
+            self._baglanti.send(mesaj)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _oku(self, baglanti):
+        while True:
+            try:
+                mesaj = baglanti.recv()
+            except (EOFError, OSError):
+                return
+            if mesaj[0] == "basladi":
+                with self._kilit:
+                    bekleyen = self._bekleyen.pop(mesaj[1], None)
+                    self.sayaclar["calan"] += 1
+                if bekleyen is not None:
+                    self.gecikme.kaydet(bekleyen[0], bekleyen[1], mesaj[2])
+            elif mesaj[0] == "hata":
+                with self._kilit:
+                    bekleyen = self._bekleyen.pop(mesaj[1], None)
+                    self.sayaclar["hata"] += 1
+                ad = f"{bekleyen[0]} zili çalınamadı – " if bekleyen else ""
+                print(f"[UYARI] ses işçisi: {ad}{mesaj[2]}")
+                olcum.hata("ses_isci", mesaj[2])
+            elif mesaj[0] == "sesler_tamam":
+                with self._kilit:
+                    for surum in [s for s in self._bellekler if s < mesaj[1]]:
+                        _birak(self._bellekler.pop(surum))
+
+    def _denetle(self):
+        """İşçi çökerse bekleyip yeniden başlat; art arda çöküşlerde bekleme ikiye katlanır"""
+        ardisik = 0
+        while True:
+            time.sleep(DENETIM_SN)
+            with self._kilit:
+                if not self._calisiyor:
+                    return
+                surec = self._surec
+                if surec.is_alive():
+                    continue
+                ayakta = time.monotonic() - self._basladi
+                kayip = len(self._bekleyen)
+                self._bekleyen.clear()
+                self.sayaclar["yeniden_baslatma"] += 1
+                olcum.hata("ses_isci", f"işçi durdu (çıkış kodu {surec.exitcode})")
+            ardisik = 0 if ayakta >= KARARLI_SN else ardisik + 1
+            bekleme = min(YENIDEN_BEKLEME, 2.0 ** ardisik - 1)
+            ek = f", {kayip} zilin başladığı bildirilmedi" if kayip else ""
+            print(f"[UYARI] ses işçisi durdu (çıkış kodu {surec.exitcode}{ek}) – "
+                  f"{bekleme:.0f} sn sonra yeniden başlatılıyor; bu arada ziller süreç içinde çalar")
+            if bekleme:
+                time.sleep(bekleme)
+            with self._kilit:
+                if not self._calisiyor:
+                    return
+            self._baslat()
+
+
+def _birak(bellek):
+    for adim in (bellek.close, bellek.unlink):
+        try:
+            adim()
+        except (OSError, BufferError):
+            pass
+
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hızlandırılmış simülasyon – bir haftanın / dönemin / yılın zillerini saniyeler içinde oynat
+Gerçek zamanlayıcı (ZilZamanlayici) sanal saatle sürülür; kaynak, servisin
+kullandığı ProgramOnbellegi.tarih olduğundan dönüşüm kuralları ve
+istisnalar uygulanmış olarak çalar. Çıktı, her satırı bir zil olan bir
+izdir; beklenen izle karşılaştırılıp fark (unified diff) gösterilir. Ses
+kartı gerekmez.
+
+  python simulasyon.py zil_programi.db [--bas 2026-09-07] [--bit 2027-01-22] [--bolge ana]
+                                       [--yaz iz.txt] [--beklenen iz.txt] [--hiz N]
+  python simulasyon.py --yuk 200 [--zil 40] [--gun 7]      # sentetik program, yük testi
+"""
+
+import sys, time, argparse, difflib
+from datetime import date, datetime, timedelta
+from zamanlayici import ZilZamanlayici, SanalSaat, POLITIKALAR
+from zaman_cizelgesi import GUNLER, GUN_DK
+from istisna_takvimi import tarih_coz
+
+
+def _gece_yarisi(tarih):
+    return datetime(tarih.year, tarih.month, tarih.day).timestamp()
+
+
+def iz_satiri(t, bolge, tur, sure):
+    """Tek zil → 'YYYY-MM-DD Gün HH:MM bolge TUR sure' (saniye yok: program dakika çözünürlüklü)"""
+    an = datetime.fromtimestamp(t)
+    return f"{an:%Y-%m-%d} {GUNLER[an.weekday()]} {an:%H:%M} {bolge} {tur} {sure}"
+
+
+def simule_et(kaynak, bolgeler, bas, bit, politika="gec", hiz=None, saat=None):
+    """
+    kaynak(bolge, tarih) -> [(tur, bas_saat, sure), ...]; bas–bit (dahil) günlerini oynat.
+    Dönüş: [(zaman_damgasi, bolge, tur, sure), ...] çalma sırasıyla
+    """
+    saat = saat or SanalSaat(_gece_yarisi(bas), _gece_yarisi(bit + timedelta(days=1)), hiz)
+    motor = ZilZamanlayici(politika=politika, saat=saat)
+    calanlar = []
+    motor.bolgeleri_esitle(bolgeler, kaynak,
+                           lambda ad: lambda tur, sure: calanlar.append((saat.zaman(), ad, tur, sure)))
+    motor.calis()
+    return calanlar
+
+
+def program_simulasyonu(db_file, bas, bit, bolgeler=None, politika="gec", hiz=None):
+    """Veritabanındaki programı (kurallar + istisnalar) bas–bit arasında oynat"""
+    from program_onbellek import ProgramOnbellegi, init_db
+    init_db(db_file)
+    program = ProgramOnbellegi(db_file)
+    return simule_et(lambda b, t: program.tarih(t, b), bolgeler or program.bolgeler(), bas, bit, politika, hiz)
+
+
+def karsilastir(beklenen, gercek, beklenen_ad="beklenen", gercek_ad="simülasyon"):
+    """İki iz (satır listesi) → unified diff satırları; aynıysa boş liste"""
+    return list(difflib.unified_diff(beklenen, gercek, beklenen_ad, gercek_ad, lineterm=""))
+
+
+def sentetik_kaynak(zil_sayisi):
+    """Her gün 07:00'dan itibaren zil_sayisi zil (DERS/TENEFFUS dönüşümlü) – yük testi için"""
+    adim = max(1, (GUN_DK - 7 * 60) // max(1, zil_sayisi))
+    ziller = [("DERS" if i % 2 == 0 else "TENEFFUS",
+               f"{(7 * 60 + i * adim) // 60:02d}:{(7 * 60 + i * adim) % 60:02d}", adim)
+              for i in range(min(zil_sayisi, (GUN_DK - 7 * 60) // adim))]
+    return lambda bolge, tarih: ziller
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Zil programını sanal saatle hızlandırılmış oynat")
+    p.add_argument("db", nargs="?", default="zil_programi.db")
+    p.add_argument("--bas", help="ilk gün YYYY-MM-DD (varsayılan bu haftanın pazartesisi)")
+    p.add_argument("--bit", help="son gün YYYY-MM-DD, dahil (varsayılan bas + 6 gün)")
+    p.add_argument("--bolge", action="append", help="yalnızca bu bölge(ler)")
+    p.add_argument("--kacan", choices=POLITIKALAR, default="gec")
+    p.add_argument("--hiz", type=float, default=None,
+                   help="gerçek zamanın N katı hızla (varsayılan: beklemeden, olaydan olaya)")
+    p.add_argument("--yaz", metavar="IZ", help="izi dosyaya yaz")
+    p.add_argument("--beklenen", metavar="IZ", help="beklenen izle karşılaştır; fark varsa çıkış kodu 1")
+    p.add_argument("--yuk", type=int, metavar="BOLGE", help="veritabanı yerine BOLGE sayıda sentetik bölge")
+    p.add_argument("--zil", type=int, default=40, help="sentetik bölge başına günlük zil sayısı")
+    p.add_argument("--gun", type=int, default=7, help="--bit verilmezse oynatılacak gün sayısı")
+    a = p.parse_args(argv)
+
+    try:
+        bas = tarih_coz(a.bas) if a.bas else date.today() - timedelta(days=date.today().weekday())
+        bit = tarih_coz(a.bit) if a.bit else bas + timedelta(days=a.gun - 1)
+        if bit < bas:
+            raise ValueError("bitiş tarihi başlangıçtan önce olamaz")
+        t0 = time.perf_counter()
+        if a.yuk:
+            calanlar = simule_et(sentetik_kaynak(a.zil), [f"b{i}" for i in range(a.yuk)], bas, bit, a.kacan, a.hiz)
+        else:
+            calanlar = program_simulasyonu(a.db, bas, bit, a.bolge, a.kacan, a.hiz)
+        sure = time.perf_counter() - t0
+    except ValueError as e:
+        print(f"[HATA] {e}")
+        return 1
+
+    iz = [iz_satiri(*c) for c in calanlar]
+    sanal = (bit - bas).days + 1
+    print(f"[SIM] {bas} – {bit} ({sanal} gün): {len(iz)} zil, {sure:.2f} sn "
+          f"(gerçek zamanın {sanal * 86400 / max(sure, 1e-9):,.0f} katı, {len(iz) / max(sure, 1e-9):,.0f} zil/sn)")
+    if a.yaz:
+        with open(a.yaz, "w", encoding="utf-8") as f:
+            f.writelines(s + "\n" for s in iz)
+    elif not a.beklenen and not a.yuk:
+        for s in iz:
+            print(s)
+    if a.beklenen:
+        with open(a.beklenen, encoding="utf-8") as f:
+            beklenen = [s.rstrip("\n") for s in f if s.strip()]
+        fark = karsilastir(beklenen, iz, a.beklenen)
+        for s in fark:
+            print(s)
+        print(f"[SIM] {'iz beklenenle aynı' if not fark else 'iz beklenenden farklı'}")
+        return 1 if fark else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Testler depo kökündeki düz modülleri içe aktarır"""
+
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
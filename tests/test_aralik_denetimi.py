@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""aralik_denetimi: ters aralık ve açıkça işaretli gece aşımı kuralı zaman_cizelgesi / zil_cekirdegi / aktarımla aynı"""
+
+import pytest
+from aralik_denetimi import AralikDenetcisi, hafta_tara, CAKISMA, BOSLUK, TERS
+from zaman_cizelgesi import GUN_DK, gun_araligi, zil_programi_girdisi
+from zil_cekirdegi import zil_programi_zilleri
+from program_aktarim import kayit_coz
+
+
+def turler(bulgular):
+    return sorted((b.tur, b.diger) for b in bulgular)
+
+
+def test_gece_yarisini_asan_kayit_gecerli():
+    d = AralikDenetcisi([("a", ("ana", 0), 20 * 60, 23 * 60)])
+    assert turler(d.denetle(("ana", 0), 23 * 60 + 50, 23 * 60 + 50 + 40)) == [(BOSLUK, "a")]
+    assert turler(d.denetle(("ana", 0), 23 * 60, 23 * 60 + GUN_DK + 1)) == [(TERS, None)]
+    assert turler(d.denetle(("ana", 0), 600, 600)) == [(TERS, None)]
+
+
+def test_asan_kisim_ertesi_gunle_cakisir():
+    d = AralikDenetcisi([("gece", ("ana", 0), 23 * 60 + 50, GUN_DK + 30),
+                         ("pazar", ("ana", 6), 23 * 60, GUN_DK + 20)])
+    # salı 00:10 pazartesi gecesinden taşan kısımla, pazartesi 00:00 pazar gecesiyle çakışır
+    assert turler(d.denetle(("ana", 1), 10, 50)) == [(CAKISMA, "gece")]
+    assert turler(d.denetle(("ana", 0), 0, 10)) == [(CAKISMA, "pazar")]
+    # taşan kısımdan sonraki sabah dersi gece boyunca süren boşluk için uyarı almaz
+    assert d.denetle(("ana", 1), 8 * 60, 8 * 60 + 40) == []
+    assert d.bosluklar(("ana", 1)) == []
+    d.sil("gece")
+    assert d.denetle(("ana", 1), 10, 50) == []
+
+
+def test_hafta_tara_ayni_kural():
+    bulgular = hafta_tara([("a", 0, 23 * 60 + 50, GUN_DK + 30), ("b", 1, 0, 40), ("c", 1, 8 * 60, 9 * 60),
+                           ("d", 2, 23 * 60, GUN_DK + 60), ("e", 3, 8 * 60, 9 * 60)])
+    # b ile c aynı günün kayıtları: boşluk uyarısı; d'nin taşan kısmı ile e arası gece, uyarı yok
+    assert [(b.tur, b.anahtar, b.diger) for b in bulgular] == [(CAKISMA, "b", "a"), (BOSLUK, "c", "b")]
+
+
+def test_zil_programi_ile_ayni_aralik():
+    bas, bit = zil_programi_girdisi("Pazartesi", "23:50", "00:30", 40)
+    assert (bas, bit) == (23 * 60 + 50, GUN_DK + 30)
+    assert AralikDenetcisi().denetle(0, bas, bit) == []
+    gunler = zil_programi_zilleri([("Pazartesi", "Ders", "23:50", "00:30", 40)])
+    assert gunler[0] == [("DERS", "23:50", 40)] and gunler[1] == [("TENEFFUS", "00:30", 0)]
+
+
+def test_bitisi_once_olan_kayit_ters():
+    # işaretsiz 09:00→08:45 gece aşımı sayılmaz: ters aralık
+    bas, bit = gun_araligi("09:00", "08:45")
+    assert turler(AralikDenetcisi().denetle(0, bas, bit)) == [(TERS, None)]
+    assert [b.tur for b in hafta_tara([("x", 0, *zil_programi_girdisi("Pazartesi", "09:00", "08:45"))])] == [TERS]
+    # eski sürümün 23 sa 45 dk olarak sakladığı satır da en uzun gece aşımını geçer
+    assert turler(AralikDenetcisi().denetle(0, *gun_araligi("09:00", "08:45", gece=True))) == [(TERS, None)]
+    assert zil_programi_zilleri([("Pazartesi", "Ders", "09:00", "08:45", 1425)])[0] == [("DERS", "09:00", 0)]
+    with pytest.raises(ValueError, match="ters aralık"):
+        kayit_coz({"gun": 0, "tur": "DERS", "baslangic": "09:00", "bitis": "08:45"})
+    # gece aşımı ancak açıkça işaretlenirse
+    assert kayit_coz({"gun": 0, "tur": "DERS", "baslangic": "23:50", "bitis": "00:30", "sure": 40})[3:5] == \
+        (23 * 60 + 50, GUN_DK + 30)
+    assert kayit_coz({"gun": 0, "tur": "DERS", "baslangic": "23:50", "bitis": "00:30", "gece": "evet"})[4] == \
+        GUN_DK + 30
+    with pytest.raises(ValueError):
+        kayit_coz({"gun": 0, "tur": "DERS", "baslangic": "20:00", "bitis": "09:00", "gece": "1"})
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""birlesik_program: gece yarısını aşan satır taşınır, tekrar aktarım atlanır, şemaya uymayan satır aktarımı durdurur"""
+
+import sqlite3
+import pytest
+from birlesik_program import aktar, gunluk
+
+
+def zil_programi_db(yol, satirlar):
+    with sqlite3.connect(yol) as conn:
+        conn.execute("CREATE TABLE zil_programi (id INTEGER PRIMARY KEY, gun TEXT, tip TEXT, baslik TEXT, "
+                     "baslangic_saat TEXT, bitis_saat TEXT, sure INTEGER)")
+        conn.executemany("INSERT INTO zil_programi (gun, tip, baslik, baslangic_saat, bitis_saat, sure) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", satirlar)
+    conn.close()
+
+
+def test_gece_yarisini_asan_satir_ve_tekrar(tmp_path):
+    kaynak, hedef = str(tmp_path / "okul_zil_programi.db"), str(tmp_path / "birlesik.db")
+    zil_programi_db(kaynak, [("Pazartesi", "Ders", "Gece", "23:30", "00:10", 40),
+                             ("Pazartesi", "Ders", "1. Ders", "08:00", "08:40", 40)])
+    anahtar = f"{kaynak}:zil_programi"
+    assert aktar(hedef, [kaynak]) == {anahtar: (2, 0)}
+    with sqlite3.connect(hedef) as conn:
+        assert [r[3:] for r in gunluk(conn, 0)] == [(8 * 60, 8 * 60 + 40), (23 * 60 + 30, 24 * 60 + 10)]
+    conn.close()
+    assert aktar(hedef, [kaynak]) == {anahtar: (0, 2)}
+
+
+def test_semaya_uymayan_satir_aktarimi_durdurur(tmp_path):
+    iyi, bozuk, hedef = (str(tmp_path / ad) for ad in ("iyi.db", "bell.db", "birlesik.db"))
+    zil_programi_db(iyi, [("Salı", "Ders", "1. Ders", "08:00", "08:40", 40)])
+    with sqlite3.connect(bozuk) as conn:
+        conn.execute("CREATE TABLE bell_schedule (id INTEGER PRIMARY KEY, day TEXT, start_time TEXT, "
+                     "end_time TEXT, type TEXT)")
+        conn.execute("INSERT INTO bell_schedule VALUES (7, 'Salı', '09:00', '08:45', 'lesson')")
+    conn.close()
+    with pytest.raises(ValueError, match=r"bell\.db:bell_schedule:7"):
+        aktar(hedef, [iyi, bozuk])
+    with sqlite3.connect(hedef) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM program").fetchone()[0] == 0
+    conn.close()
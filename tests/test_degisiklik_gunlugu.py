@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""degisiklik_gunlugu: iki yerel veritabanı arasında artımlı çekme, çakışma ve silme"""
+
+import sqlite3
+import pytest
+from program_onbellek import ProgramOnbellegi, init_db
+from degisiklik_gunlugu import cek
+
+
+@pytest.fixture
+def iki_db(tmp_path):
+    merkez, dugum = str(tmp_path / "merkez.db"), str(tmp_path / "dugum.db")
+    init_db(merkez)
+    init_db(dugum)
+    program = ProgramOnbellegi(merkez)
+    for gun in range(5):
+        program.ekle(gun, "DERS", "09:00", 40)
+    return merkez, dugum
+
+
+def satirlar(db_file):
+    with sqlite3.connect(db_file) as conn:
+        return sorted(conn.execute("SELECT gun, tur, bas_saat, sure, bolge FROM zil"))
+
+
+def yerel_id(db_file, gun):
+    with sqlite3.connect(db_file) as conn:
+        return conn.execute("SELECT id FROM zil WHERE gun = ?", (gun,)).fetchone()[0]
+
+
+def test_artimli_cekme(iki_db):
+    merkez, dugum = iki_db
+    ilk = cek(merkez, dugum)
+    assert ilk["alinan"] == ilk["uygulanan"] == 5
+    assert satirlar(dugum) == satirlar(merkez)
+
+    assert cek(merkez, dugum)["alinan"] == 0
+
+    ProgramOnbellegi(merkez).ekle(5, "TENEFFUS", "09:40", 10)
+    ikinci = cek(merkez, dugum)
+    assert (ikinci["alinan"], ikinci["uygulanan"]) == (1, 1)
+    assert ikinci["son_seq"] == ilk["son_seq"] + 1
+    assert satirlar(dugum) == satirlar(merkez)
+
+
+def test_eszamanli_degisiklik_ayni_satira_yerlesir(iki_db):
+    merkez, dugum = iki_db
+    cek(merkez, dugum)
+    # iki düğümün hibrit saati aynı damgayı üretsin: karar düğüm kimliğine kalır
+    for db_file in (merkez, dugum):
+        with sqlite3.connect(db_file) as conn:
+            conn.execute("UPDATE dugum SET saat = ? WHERE tek = 1", (1 << 60,))
+    ProgramOnbellegi(merkez).guncelle(yerel_id(merkez, 2), "10:00", 40)
+    ProgramOnbellegi(dugum).guncelle(yerel_id(dugum, 2), "11:00", 30)
+
+    sonuc = cek(merkez, dugum)
+    geri = cek(dugum, merkez)
+    assert satirlar(merkez) == satirlar(dugum)
+
+    kimlikler = {}
+    for ad, db_file in (("merkez", merkez), ("dugum", dugum)):
+        with sqlite3.connect(db_file) as conn:
+            kimlikler[ad] = conn.execute("SELECT kimlik FROM dugum").fetchone()[0]
+    kazanan = max(kimlikler, key=kimlikler.get)
+    beklenen = ("10:00", 40) if kazanan == "merkez" else ("11:00", 30)
+    assert [r[2:4] for r in satirlar(merkez) if r[0] == 2] == [beklenen]
+    assert len(sonuc["catismalar"] + geri["catismalar"]) >= 1
+
+
+def test_silme_mezar_tasi(iki_db):
+    merkez, dugum = iki_db
+    cek(merkez, dugum)
+    # düğümdeki eski düzenleme, merkezdeki sonraki silmeyi geri getirmez
+    ProgramOnbellegi(dugum).guncelle(yerel_id(dugum, 3), "09:10", 40)
+    ProgramOnbellegi(merkez).sil(yerel_id(merkez, 3))
+
+    cek(merkez, dugum)
+    cek(dugum, merkez)
+    assert [r[0] for r in satirlar(merkez)] == [0, 1, 2, 4]
+    assert satirlar(dugum) == satirlar(merkez)
+    with sqlite3.connect(dugum) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM kopya_satir WHERE tablo = 'zil' AND yerel_id IS NULL"
+                            ).fetchone()[0] == 1
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""kontrol_api: yerel istemciyle CRUD, ETag (304 / 412), çakışma (409) ve /durum"""
+
+import http.client, json, threading, time
+import pytest
+import olcum
+from program_onbellek import ProgramOnbellegi, init_db
+from zamanlayici import ZilZamanlayici
+from kontrol_api import KontrolAPI
+
+
+@pytest.fixture
+def api(tmp_path):
+    db_file = str(tmp_path / "zil_programi.db")
+    init_db(db_file)
+    program = ProgramOnbellegi(db_file)
+    for gun in range(7):
+        program.ekle(gun, "DERS", "12:00", 40)
+    motor = ZilZamanlayici()
+    motor.bolgeleri_esitle(program.bolgeler(), lambda b, t: program.tarih(t, b), lambda _: lambda tur, sure: None)
+    sunucu = KontrolAPI(program, motor, port=0)
+    sunucu.baslat()
+    yield sunucu
+    sunucu.durdur()
+
+
+def istek(api, yontem, yol, govde=None, **basliklar):
+    conn = http.client.HTTPConnection(api.host, api.port, timeout=5)
+    try:
+        veri = json.dumps(govde).encode("utf-8") if govde is not None else None
+        conn.request(yontem, yol, veri, {k.replace("_", "-"): v for k, v in basliklar.items()})
+        yanit = conn.getresponse()
+        icerik = yanit.read()
+        return yanit.status, json.loads(icerik) if icerik else None, yanit.getheader("ETag")
+    finally:
+        conn.close()
+
+
+def test_crud(api):
+    kod, veri, _ = istek(api, "POST", "/program", {"gun": 0, "tur": "TENEFFUS", "bas_saat": "12:40", "sure": 10})
+    assert kod == 201
+    zil_id = veri["id"]
+    assert veri == {"id": zil_id, "gun": 0, "tur": "TENEFFUS", "bas_saat": "12:40", "sure": 10, "bolge": "ana"}
+
+    kod, veri, _ = istek(api, "GET", f"/program/{zil_id}")
+    assert kod == 200 and veri["bas_saat"] == "12:40"
+
+    kod, veri, _ = istek(api, "PUT", f"/program/{zil_id}", {"sure": 15})
+    assert kod == 200 and veri["sure"] == 15
+
+    kod, veri, _ = istek(api, "GET", "/program?gun=0")
+    assert [(z["bas_saat"], z["sure"]) for z in veri["ziller"]] == [("12:00", 40), ("12:40", 15)]
+
+    kod, veri, _ = istek(api, "DELETE", f"/program/{zil_id}")
+    assert kod == 204 and veri is None
+    assert istek(api, "GET", f"/program/{zil_id}")[0] == 404
+
+    kod, veri, _ = istek(api, "PUT", "/program", {"ziller": [
+        {"gun": 1, "tur": "DERS", "bas_saat": "08:00", "sure": 40},
+        {"gun": 1, "tur": "TENEFFUS", "bas_saat": "08:40", "sure": 10}]})
+    assert kod == 200 and veri == {"adet": 2}
+    assert len(istek(api, "GET", "/program")[1]["ziller"]) == 2
+
+
+def test_gecersiz_gun_reddedilir(api):
+    for gun in (True, 7, "1"):
+        kod, veri, _ = istek(api, "POST", "/program", {"gun": gun, "tur": "DERS", "bas_saat": "09:00", "sure": 10})
+        assert kod == 400, gun
+
+
+def test_if_none_match_304(api):
+    kod, _, etag = istek(api, "GET", "/program")
+    assert kod == 200 and etag
+    kod, veri, etag2 = istek(api, "GET", "/program", If_None_Match=etag)
+    assert (kod, veri, etag2) == (304, None, etag)
+
+    istek(api, "POST", "/program", {"gun": 2, "tur": "TENEFFUS", "bas_saat": "12:40", "sure": 10})
+    kod, _, etag3 = istek(api, "GET", "/program", If_None_Match=etag)
+    assert kod == 200 and etag3 != etag
+
+
+def test_bayat_if_match_412(api):
+    _, _, etag = istek(api, "GET", "/program/1")
+    assert istek(api, "PUT", "/program/1", {"sure": 30}, If_Match=etag)[0] == 200
+    kod, veri, _ = istek(api, "PUT", "/program/1", {"sure": 20}, If_Match=etag)
+    assert kod == 412
+    assert istek(api, "GET", "/program/1")[1]["sure"] == 30
+
+
+def test_eszamanli_if_match_yalniz_biri_yazar(api):
+    _, _, etag = istek(api, "GET", "/program/2")
+    kodlar = []
+    baslangic = threading.Barrier(6)
+
+    def yaz(sure):
+        baslangic.wait()
+        kodlar.append(istek(api, "PUT", "/program/2", {"sure": sure}, If_Match=etag)[0])
+
+    threadler = [threading.Thread(target=yaz, args=(20 + i,)) for i in range(6)]
+    for t in threadler:
+        t.start()
+    for t in threadler:
+        t.join()
+    assert sorted(kodlar) == [200] + [412] * 5
+
+
+def test_cakisma_409(api):
+    kod, veri, _ = istek(api, "POST", "/program", {"gun": 0, "tur": "TENEFFUS", "bas_saat": "12:30", "sure": 10})
+    assert kod == 409 and "çakış" in veri["hata"]
+    kod, _, _ = istek(api, "PUT", "/program", {"ziller": [
+        {"gun": 3, "tur": "DERS", "bas_saat": "09:00", "sure": 40},
+        {"gun": 3, "tur": "DERS", "bas_saat": "09:20", "sure": 40}]})
+    assert kod == 409
+    assert len(istek(api, "GET", "/program")[1]["ziller"]) == 7
+
+
+def test_durum(api):
+    kod, veri, etag = istek(api, "GET", "/durum")
+    assert kod == 200 and etag
+    ana = veri["bolgeler"]["ana"]
+    assert ana["sonraki"]["tur"] == "DERS" and ana["sonraki"]["zaman"].endswith("12:00:00")
+    assert "sapma_ms" in veri["zamanlayici"]
+    assert istek(api, "GET", "/durum", If_None_Match=etag)[0] in (200, 304)     # dakika dönmüş olabilir
+
+
+def test_cal_hatasi_kaydedilir(api, monkeypatch):
+    def bozuk(tur, bolge):
+        raise RuntimeError("çıkış yok")
+    api.cal = bozuk
+    monkeypatch.setattr(olcum, "_etkin", True)
+    assert istek(api, "POST", "/cal", {"tur": "DERS"})[0] == 202
+    for _ in range(100):
+        if 'zil_hata_toplam{yol="api_cal"}' in olcum.metin():
+            break
+        time.sleep(0.01)
+    assert 'zil_hata_toplam{yol="api_cal"} 1' in olcum.metin()
+
+
+def test_gece_yarisini_asan_kayit(api):
+    kod, veri, _ = istek(api, "POST", "/program", {"gun": 0, "tur": "DERS", "bas_saat": "23:50", "sure": 40})
+    assert kod == 201 and veri["sure"] == 40
+    kod, veri, _ = istek(api, "POST", "/program", {"gun": 1, "tur": "DERS", "bas_saat": "00:10", "sure": 20})
+    assert kod == 409
+
+def test_kilit_tutulurken_diger_istemciler_beklemez(api):
+    # toplu değiştirme önbellek kilidini tutarken bir okuma bekler, olay döngüsü bloklanmaz
+    birakildi = threading.Event()
+    tutuldu = threading.Event()
+
+    def tut():
+        with api.program._kilit:
+            tutuldu.set()
+            birakildi.wait(5)
+
+    _, _, etag = istek(api, "GET", "/program")
+    threading.Thread(target=tut).start()
+    tutuldu.wait(5)
+    bekleyen = threading.Thread(target=istek, args=(api, "GET", "/program"))
+    try:
+        bekleyen.start()
+        time.sleep(0.05)
+        basla = time.monotonic()
+        assert istek(api, "GET", "/program", If_None_Match=etag)[0] == 304
+        assert time.monotonic() - basla < 1.0
+    finally:
+        birakildi.set()
+        bekleyen.join()
+
+
+def test_yerel_olmayan_adres_anahtar_ister(api, monkeypatch):
+    monkeypatch.delenv("ZIL_API_ANAHTARI", raising=False)
+    with pytest.raises(ValueError):
+        KontrolAPI(api.program, host="0.0.0.0", port=0).baslat()
+
+    ag = KontrolAPI(api.program, host="0.0.0.0", port=0, anahtar="gizli")
+    ag.baslat()
+    ag.host = "127.0.0.1"
+    try:
+        assert istek(ag, "GET", "/program")[0] == 401
+        assert istek(ag, "POST", "/cal", {"tur": "DERS"})[0] == 401
+        assert istek(ag, "GET", "/program", Authorization="Bearer yanlis")[0] == 401
+        assert istek(ag, "GET", "/program", Authorization="Bearer gizli")[0] == 200
+    finally:
+        ag.durdur()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""program_aktarim: --degistir yalnızca dosyadaki bölgeleri değiştirir"""
+
+import sqlite3
+from program_onbellek import ProgramOnbellegi, init_db
+from program_aktarim import ice_aktar, dosya_bolgeleri
+
+
+def test_degistir_yalniz_dosyadaki_bolgeler(tmp_path):
+    db_file = str(tmp_path / "zil_programi.db")
+    init_db(db_file)
+    program = ProgramOnbellegi(db_file)
+    for bolge in ("ana", "kampus1", "kampus2"):
+        program.ekle(0, "DERS", "08:00", 40, bolge)
+    csv_dosya = tmp_path / "program.csv"
+    csv_dosya.write_text("gun,tur,baslangic,sure\n1,DERS,09:00,40\n1,TENEFFUS,09:40,10\n", encoding="utf-8")
+
+    assert dosya_bolgeleri(str(csv_dosya), bolge="kampus1") == ["kampus1"]
+    eklenen, _, _ = ice_aktar(db_file, str(csv_dosya), "zil", bolge="kampus1", degistir=True)
+    assert eklenen == 2
+    with sqlite3.connect(db_file) as conn:
+        satirlar = sorted(conn.execute("SELECT bolge, gun, bas_saat FROM zil"))
+    assert satirlar == [("ana", 0, "08:00"), ("kampus1", 1, "09:00"), ("kampus1", 1, "09:40"),
+                        ("kampus2", 0, "08:00")]
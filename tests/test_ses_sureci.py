@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""ses_sureci: null çıkışlı işçiyle başlama bildirimi, işçi yokken süreç içi yedek, SIGKILL sonrası yeniden başlatma"""
+
+import os, signal, sys, time, types, wave
+import pytest
+import ses_sureci
+from ses_bankasi import SesBankasi
+from ses_cikisi import NullCikis
+from ses_sureci import SurecCalici
+
+
+def bekle(kosul, sn=10.0):
+    son = time.monotonic() + sn
+    while not kosul():
+        if time.monotonic() > son:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+@pytest.fixture
+def banka(tmp_path):
+    for ad in ("ders", "teneffus"):
+        with wave.open(str(tmp_path / f"{ad}.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 800)
+    return SesBankasi(str(tmp_path))
+
+
+@pytest.fixture
+def calici(banka, monkeypatch):
+    monkeypatch.setattr(ses_sureci, "DENETIM_SN", 0.05)
+    calici = SurecCalici(banka, NullCikis())
+    yield calici
+    calici.durdur()
+
+
+def test_baslama_bildirimi(calici):
+    calici.cal("DERS")
+    assert bekle(lambda: calici.sayaclar["calan"] == 1)
+    assert calici.gecikme.ozet()["adet"] == 1
+    assert calici.sayaclar["yedek"] == 0 and calici.cikis.calinanlar == []   # işçide çaldı
+
+
+def test_isci_yokken_surec_ici_calar(calici, monkeypatch):
+    monkeypatch.setattr(ses_sureci, "DENETIM_SN", 60.0)
+    time.sleep(0.1)                         # denetçi uzun uykuya geçsin, işçiyi hemen kaldırmasın
+    surec = calici._surec
+    os.kill(surec.pid, signal.SIGKILL)
+    surec.join(5)
+    calici.cal("TENEFFUS")
+    assert calici.sayaclar["yedek"] == 1
+    assert [anahtar for _, anahtar in calici.cikis.calinanlar] == ["teneffus"]
+    assert calici.gecikme.ozet()["adet"] == 1
+    assert calici.sayaclar["calan"] == 0
+
+
+def test_sigkill_sonrasi_yeniden_baslar(calici):
+    eski = calici._surec
+    os.kill(eski.pid, signal.SIGKILL)
+    assert bekle(lambda: calici.sayaclar["yeniden_baslatma"] == 1)
+    assert bekle(lambda: calici._surec is not eski and calici._surec.is_alive())
+    calici.cal("DERS")
+    assert bekle(lambda: calici.sayaclar["calan"] == 1)
+    assert calici.sayaclar["yedek"] == 0
+
+
+def test_isci_ana_modulu_yeniden_yuklemez(banka, tmp_path, monkeypatch):
+    # main.py gibi ağır bir __main__: çocukta çalışırsa iz dosyası bırakır
+    iz = tmp_path / "ana_yuklendi"
+    betik = tmp_path / "ana.py"
+    betik.write_text(f"open({str(iz)!r}, 'w').close()\n", encoding="utf-8")
+    ana = types.ModuleType("__main__")
+    ana.__file__ = str(betik)
+    monkeypatch.setitem(sys.modules, "__main__", ana)
+    calici = SurecCalici(banka, NullCikis())
+    try:
+        calici.cal("DERS")
+        assert bekle(lambda: calici.sayaclar["calan"] == 1)
+        assert not iz.exists()
+        assert sys.modules["__main__"] is ana
+    finally:
+        calici.durdur()
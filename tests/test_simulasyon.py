@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""simulasyon: bir haftalık programın zil izi saklanmış izle aynı olmalı"""
+
+import os
+from datetime import date
+from program_onbellek import ProgramOnbellegi, init_db
+from simulasyon import program_simulasyonu, iz_satiri, karsilastir
+
+BEKLENEN_IZ = os.path.join(os.path.dirname(__file__), "veri", "hafta_iz.txt")
+
+
+def hafta_programi(db_file):
+    """
+    Pazartesi–cuma üç zil; 2026-11-10 tatil, 11-11 yarım gün planı,
+    11-12 her zil 30 dk geç, kampus1 için 11-13 tatil
+    """
+    init_db(db_file)
+    program = ProgramOnbellegi(db_file)
+    for bolge in ("ana", "kampus1"):
+        for gun in range(5):
+            program.ekle(gun, "DERS", "09:00", 40, bolge)
+            program.ekle(gun, "TENEFFUS", "09:40", 10, bolge)
+            program.ekle(gun, "DERS", "09:50", 40, bolge)
+    program.plan_ayarla("yarim_gun", [("DERS", "09:00", 30), ("TENEFFUS", "09:30", 10)])
+    program.istisna_ekle("2026-11-10", tur="tatil", aciklama="resmi tatil")
+    program.istisna_ekle("2026-11-11", tur="plan", plan="yarim_gun")
+    program.istisna_ekle("2026-11-12", tur="kaydir", kayma=30)
+    program.istisna_ekle("2026-11-13", tur="tatil", bolge="kampus1")
+
+
+def test_hafta_izi(tmp_path):
+    db_file = str(tmp_path / "zil_programi.db")
+    hafta_programi(db_file)
+    iz = [iz_satiri(*c) for c in program_simulasyonu(db_file, date(2026, 11, 9), date(2026, 11, 15))]
+    with open(BEKLENEN_IZ, encoding="utf-8") as f:
+        beklenen = [s.rstrip("\n") for s in f if s.strip()]
+    assert karsilastir(beklenen, iz) == []
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""yazma_kuyrugu: beklenmeyen hata yazıcı thread'ini durdurmaz, bosalt() / kapat() beklemede kalmaz"""
+
+import threading
+from yazma_kuyrugu import YazmaKuyrugu
+
+
+class BozukProgram:
+    """İlk toplu_islem çağrısında beklenmeyen hata verir"""
+
+    def __init__(self):
+        self.cagri = 0
+
+    def toplu_islem(self, islemler):
+        self.cagri += 1
+        if self.cagri == 1:
+            raise RuntimeError("önbellek bozuk")
+        return [None] * len(islemler)
+
+
+def test_beklenmeyen_hata_kuyrugu_durdurmaz():
+    sonuclar = []
+    kuyruk = YazmaKuyrugu(BozukProgram(), sonuclar.extend, biriktirme=0.0)
+    ilk = kuyruk.gonder(("sil", 1))
+    bosalt = threading.Thread(target=kuyruk.bosalt, daemon=True)
+    bosalt.start()
+    bosalt.join(5)
+    assert not bosalt.is_alive()
+    assert [(no, type(hata)) for no, _, hata in sonuclar] == [(ilk, RuntimeError)]
+
+    ikinci = kuyruk.gonder(("sil", 2))
+    kapat = threading.Thread(target=kuyruk.kapat, daemon=True)
+    kapat.start()
+    kapat.join(5)
+    assert not kapat.is_alive()
+    assert sonuclar[-1] == (ikinci, None, None)
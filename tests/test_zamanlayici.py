@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""zamanlayici: çalma hatası döngüyü bitirmez"""
+
+from datetime import date, datetime
+from zamanlayici import ZilZamanlayici, SanalSaat
+
+
+def test_cal_hatasi_sonraki_zilleri_durdurmaz(capsys):
+    gun = date(2026, 10, 19)
+    saat = SanalSaat(datetime(2026, 10, 19).timestamp(), datetime(2026, 10, 20).timestamp())
+    motor = ZilZamanlayici(saat=saat)
+    calanlar = []
+
+    def cal(tur, sure):
+        calanlar.append(tur)
+        if len(calanlar) == 1:
+            raise RuntimeError("ses kartı yok")
+
+    program = [("DERS", "09:00", 40), ("TENEFFUS", "09:40", 10), ("DERS", "09:50", 40)]
+    motor.bolgeleri_esitle(["ana"], lambda b, t: program if t == gun else [], lambda ad: cal)
+    motor.calis()
+    assert calanlar == ["DERS", "TENEFFUS", "DERS"]
+    assert motor.istatistik()["hata"] == 1
+    assert "çalınamadı – ses kartı yok" in capsys.readouterr().out
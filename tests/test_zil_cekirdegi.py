@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""zil_cekirdegi: veritabanı başına kilit – aynı veritabanında tek çekirdek çalar, farklı veritabanları birlikte çalar"""
+
+import os
+import pytest
+import zil_cekirdegi
+from zil_cekirdegi import ZilCekirdegi
+
+
+@pytest.fixture(autouse=True)
+def kilit_klasoru(tmp_path, monkeypatch):
+    monkeypatch.setattr(zil_cekirdegi, "KILIT_KLASORU", str(tmp_path))
+
+
+def test_ayni_veritabani_tek_cekirdek(tmp_path):
+    db_file = str(tmp_path / "zil_programi.db")
+    birinci, ikinci = ZilCekirdegi(db_file), ZilCekirdegi(os.path.relpath(db_file))
+    try:
+        assert birinci.baslat() and birinci.calisiyor
+        assert not ikinci.baslat() and not ikinci.calisiyor
+        assert ikinci.kilit.sahibi() == os.getpid()
+
+        birinci.durdur()
+        assert ikinci.baslat() and ikinci.calisiyor
+    finally:
+        birinci.durdur()
+        ikinci.durdur()
+
+
+def test_farkli_veritabanlari_birlikte_calar(tmp_path):
+    ana = ZilCekirdegi(str(tmp_path / "zil_programi.db"))
+    okul = ZilCekirdegi(str(tmp_path / "okul_zil_programi.db"))
+    try:
+        assert ana.baslat() and okul.baslat()
+        assert ana.calisiyor and okul.calisiyor
+        assert ana.kilit.yol != okul.kilit.yol
+    finally:
+        ana.durdur()
+        okul.durdur()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""zil_servisi: SIGUSR1 ana thread olcum kilidini tutarken gelse de servis donmaz"""
+
+import os, signal, time
+import pytest
+import olcum
+from zil_servisi import profil_sinyali_kur
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 yok")
+def test_profil_sinyali_kilit_tutulurken():
+    eski = signal.getsignal(signal.SIGUSR1)
+    try:
+        profil_sinyali_kur()
+        with olcum._kilit:                  # ana thread say / gozle içindeyken sinyal gelir
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.05)                # işleyici burada çalışır ve dönmelidir
+            assert not olcum.profil_calisiyor()
+        son = time.monotonic() + 5
+        while not olcum.profil_calisiyor() and time.monotonic() < son:
+            time.sleep(0.01)
+        assert olcum.profil_calisiyor()
+    finally:
+        signal.signal(signal.SIGUSR1, eski)
+        olcum.profil_durdur()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arka plan yazma kuyruğu – arayüz düzenlemeleri GUI thread'ini bekletmez
+Düzenlemeler sınırlı bir kuyruğa konur; tek yazıcı thread'i art arda gelen
+işlemleri BIRIKTIRME_SN boyunca toplayıp ProgramOnbellegi.toplu_islem ile
+tek transaction'da (tek fsync) yazar. Toplu yazım hata verirse işlemler
+tek tek yeniden denenir: yalnızca hatalı olan düşer. Sonuç, yazıcı
+thread'inden bitti([(no, sonuc, hata), ...]) ile bildirilir.
+"""
+
+import itertools, queue, sqlite3, threading, time
+import olcum
+
+DERINLIK      = 256         # kuyruk dolunca gonder() queue.Full fırlatır
+BIRIKTIRME_SN = 0.05        # ilk işlemden sonra aynı transaction'a girecekleri bekleme
+TOPLU_SINIR   = 500         # bir transaction'daki en fazla işlem
+_DUR = object()
+
+
+class YazmaKuyrugu:
+    def __init__(self, program, bitti, derinlik=DERINLIK, biriktirme=BIRIKTIRME_SN):
+        self.program, self.bitti, self.biriktirme = program, bitti, biriktirme
+        self._kuyruk = queue.Queue(maxsize=derinlik)
+        self._sira = itertools.count(1)
+        self._thread = threading.Thread(target=self._calis, name="yazma-kuyrugu", daemon=True)
+        self._thread.start()
+
+    def gonder(self, islem):
+        """İşlemi kuyruğa koy (beklemez); işlem no'su döner, kuyruk doluysa queue.Full"""
+        no = next(self._sira)
+        self._kuyruk.put_nowait((no, islem))
+        return no
+
+    def bosalt(self):
+        """Kuyruğa o ana kadar konan her şey yazılıp bildirilene kadar bekle"""
+        self._kuyruk.join()
+
+    def kapat(self):
+        """Kuyrukta kalan her şeyi yaz, yazıcı thread'ini durdur"""
+        if self._thread.is_alive():
+            self._kuyruk.put((None, _DUR))
+            self._thread.join()
+
+    def _calis(self):
+        while True:
+            girdi = self._kuyruk.get()
+            if girdi[1] is _DUR:
+                self._kuyruk.task_done()
+                return
+            toplu, dur = [girdi], False
+            son = time.monotonic() + self.biriktirme
+            while len(toplu) < TOPLU_SINIR:
+                try:
+                    girdi = self._kuyruk.get(timeout=max(son - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                if girdi[1] is _DUR:
+                    dur = True
+                    break
+                toplu.append(girdi)
+            try:
+                self._yaz(toplu)
+            finally:
+                # yazma ne olursa olsun bosalt() / kapat() beklemede kalmasın
+                for _ in range(len(toplu) + dur):
+                    self._kuyruk.task_done()
+            if dur:
+                return
+
+    def _yaz(self, toplu):
+        try:
+            sonuclar = self.program.toplu_islem([islem for _, islem in toplu])
+            sonuc = [(no, s, None) for (no, _), s in zip(toplu, sonuclar)]
+        except (sqlite3.Error, ValueError) as e:
+            if len(toplu) == 1:
+                sonuc = [(toplu[0][0], None, e)]
+                olcum.hata("yazma_kuyrugu", e)
+            else:
+                print(f"[UYARI] {len(toplu)} düzenleme birlikte yazılamadı ({e}) – tek tek deneniyor")
+                sonuc = []
+                for girdi in toplu:
+                    try:
+                        sonuc.append((girdi[0], self.program.toplu_islem([girdi[1]])[0], None))
+                    except Exception as e:
+                        sonuc.append((girdi[0], None, e))
+                        olcum.hata("yazma_kuyrugu", e)
+        except Exception as e:
+            # beklenmeyen hata (ör. önbelleğe uygularken): yazılıp yazılmadığı bilinmez, tekrar denenmez
+            print(f"[UYARI] {len(toplu)} düzenleme yazılamadı – {e}")
+            olcum.hata("yazma_kuyrugu", e)
+            sonuc = [(no, None, e) for no, _ in toplu]
+        try:
+            self.bitti(sonuc)
+        except Exception as e:      # bildirim hatası yazıcıyı durdurmasın
+            print(f"[UYARI] yazma sonucu bildirilemedi – {e}")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Haftalık zaman çizelgesi – derlenmiş, dizi tabanlı program indeksi
+Haftanın her dakikası (7 × 1440 = 10 080 yuva) o anda geçerli kaydın
+indeksini tutar; başlangıç ve bitiş sınırları sıralı bir dizide saklanır.
+"Şu an hangi kayıt" O(1), "bir sonraki zil / sınır" bisect ile bulunur.
+Tek kayıt değiştiğinde yalnızca o kaydın kapladığı dakikalar yeniden boyanır.
+
+GunlukAkis tek bir tarihin (istisnalar çözülmüş) kayıtları için aynı
+sorguları sıralı listeler üzerinde bisect ile yanıtlar.
+"""
+
+from array import array
+from itertools import accumulate
+from bisect import bisect_left, bisect_right, insort
+
+GUN_DK   = 24 * 60
+HAFTA_DK = 7 * GUN_DK
+GUN_SN   = GUN_DK * 60
+GUNLER   = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+
+
+def saat_dakika(hhmm: str) -> int:
+    """'HH:MM' → gün başından itibaren dakika"""
+    s, d = hhmm.split(":")
+    return int(s) * 60 + int(d)
+
+
+def hafta_saniyesi(dt) -> float:
+    """datetime → Pazartesi 00:00'dan itibaren saniye"""
+    return (dt.weekday() * GUN_DK + dt.hour * 60 + dt.minute) * 60 + dt.second + dt.microsecond / 1e6
+
+
+def _parcalar(bas, bit):
+    """[bas, bit) hafta dakikası aralığını haftanın içine düşen parçalara böl"""
+    bas, uzunluk = bas % HAFTA_DK, min(bit - bas, HAFTA_DK)
+    if bas + uzunluk <= HAFTA_DK:
+        return ((bas, bas + uzunluk),)
+    return ((bas, HAFTA_DK), (0, bas + uzunluk - HAFTA_DK))
+
+
+class HaftalikCizelge:
+    def __init__(self):
+        self._yuva = array("i", [-1]) * HAFTA_DK   # dakika → girdi indeksi
+        self._girdiler = []                         # indeks → (anahtar, bas, bit, veri) | None
+        self._bos = []                              # yeniden kullanılacak indeksler
+        self._indeks = {}                           # anahtar → indeks
+        self._baslangiclar = array("i")             # sıralı, hafta dakikası
+        self._sinirlar = array("i")                 # başlangıç + bitiş, sıralı
+
+    def __len__(self):
+        return len(self._indeks)
+
+    # ---------- derleme ----------
+    def yeniden_kur(self, girdiler):
+        """girdiler: (anahtar, bas, bit, veri) – tüm çizelgeyi baştan derle"""
+        self.__init__()
+        for anahtar, bas, bit, veri in girdiler:
+            self._kaydet(anahtar, bas, bit, veri)
+        self._baslangiclar = array("i", sorted(g[1] % HAFTA_DK for g in self._girdiler))
+        self._sinirlar = array("i", sorted([g[1] % HAFTA_DK for g in self._girdiler] +
+                                           [g[2] % HAFTA_DK for g in self._girdiler]))
+        for i in sorted(range(len(self._girdiler)), key=self._sira):
+            self._boya_girdi(i, ((0, HAFTA_DK),))
+
+    def ekle(self, anahtar, bas, bit, veri=None):
+        """Tek kayıt ekle (aynı anahtar varsa değiştirir); bas < bit, hafta dakikası"""
+        if anahtar in self._indeks:
+            self.sil(anahtar)
+        self._kaydet(anahtar, bas, bit, veri)
+        insort(self._baslangiclar, bas % HAFTA_DK)
+        insort(self._sinirlar, bas % HAFTA_DK)
+        insort(self._sinirlar, bit % HAFTA_DK)
+        self._yeniden_boya(_parcalar(bas, bit))
+
+    def sil(self, anahtar):
+        i = self._indeks.pop(anahtar, None)
+        if i is None:
+            return
+        _, bas, bit, _ = self._girdiler[i]
+        self._girdiler[i] = None
+        self._bos.append(i)
+        self._cikar(self._baslangiclar, bas % HAFTA_DK)
+        self._cikar(self._sinirlar, bas % HAFTA_DK)
+        self._cikar(self._sinirlar, bit % HAFTA_DK)
+        self._yeniden_boya(_parcalar(bas, bit))
+
+    guncelle = ekle
+
+    def _kaydet(self, anahtar, bas, bit, veri):
+        i = self._bos.pop() if self._bos else len(self._girdiler)
+        if i == len(self._girdiler):
+            self._girdiler.append(None)
+        self._girdiler[i] = (anahtar, bas, bit, veri)
+        self._indeks[anahtar] = i
+
+    @staticmethod
+    def _cikar(dizi, deger):
+        j = bisect_left(dizi, deger)
+        if j < len(dizi) and dizi[j] == deger:
+            del dizi[j]
+
+    def _sira(self, i):
+        return self._girdiler[i][1], i
+
+    def _yeniden_boya(self, parcalar):
+        """Yalnızca verilen aralıkları, oraya düşen kayıtlarla yeniden boya"""
+        for a, b in parcalar:
+            self._yuva[a:b] = array("i", [-1]) * (b - a)
+        ilgili = [i for i, g in enumerate(self._girdiler)
+                  if g is not None and _kesisir(_parcalar(g[1], g[2]), parcalar)]
+        for i in sorted(ilgili, key=self._sira):   # geç başlayan kayıt üstte kalır
+            self._boya_girdi(i, parcalar)
+
+    def _boya_girdi(self, i, pencere):
+        _, bas, bit, _ = self._girdiler[i]
+        for a, b in _parcalar(bas, bit):
+            for pa, pb in pencere:
+                x, y = max(a, pa), min(b, pb)
+                if x < y:
+                    self._yuva[x:y] = array("i", [i]) * (y - x)
+
+    # ---------- sorgular ----------
+    def guncel(self, dakika):
+        """Hafta dakikasında geçerli kaydın verisi ya da None – O(1)"""
+        i = self._yuva[int(dakika) % HAFTA_DK]
+        return self._girdiler[i][3] if i >= 0 else None
+
+    def guncel_girdi(self, dakika):
+        """(anahtar, bas, bit, veri) ya da None"""
+        i = self._yuva[int(dakika) % HAFTA_DK]
+        return self._girdiler[i] if i >= 0 else None
+
+    def sonraki_sinir(self, dakika, sadece_baslangic=False):
+        """dakika'dan sonraki ilk sınır (hafta dakikası, haftayı aşabilir) ya da None"""
+        dizi = self._baslangiclar if sadece_baslangic else self._sinirlar
+        if not dizi:
+            return None
+        d = int(dakika) % HAFTA_DK
+        j = bisect_right(dizi, d)
+        sonraki = dizi[j] if j < len(dizi) else dizi[0] + HAFTA_DK
+        return int(dakika) - d + sonraki
+
+    def kalan_saniye(self, hafta_sn, sadece_baslangic=False):
+        """hafta saniyesinden bir sonraki sınıra kalan saniye ya da None"""
+        sonraki = self.sonraki_sinir(hafta_sn // 60, sadece_baslangic)
+        return None if sonraki is None else sonraki * 60 - hafta_sn
+
+
+class AkisDurumu:
+    """GunlukAkis.durum() sonucu; gecerlilik'e (gün saniyesi) kadar değişmez"""
+    __slots__ = ("guncel", "sonraki", "kalanlar", "gecerlilik")
+
+    def __init__(self, guncel, sonraki, kalanlar, gecerlilik):
+        self.guncel, self.sonraki, self.kalanlar, self.gecerlilik = guncel, sonraki, kalanlar, gecerlilik
+
+
+class GunlukAkis:
+    """
+    Bir günün kayıtları (bas_dk, bit_dk, veri), başlangıç sıralı. Şu anki
+    kayıt, sıradaki zil ve günün kalanı bisect ile bulunur; sonuç bir sonraki
+    sınıra kadar geçerlidir, arada yeniden sormaya gerek yoktur.
+    """
+
+    def __init__(self, girdiler):
+        self._girdiler = sorted(girdiler, key=lambda g: (g[0], g[1]))
+        self._baslar = [g[0] * 60 for g in self._girdiler]
+        self._en_gec = list(accumulate((g[1] * 60 for g in self._girdiler), max))   # önek en geç bitiş
+        self._sinirlar = sorted({g[0] * 60 for g in self._girdiler} | {g[1] * 60 for g in self._girdiler})
+
+    def __len__(self):
+        return len(self._girdiler)
+
+    def durum(self, sn):
+        """Gün başından sn saniyede AkisDurumu; çakışan kayıtlarda en son başlayan geçerli"""
+        j = bisect_right(self._baslar, sn)
+        i = j - 1
+        while i >= 0 and self._girdiler[i][1] * 60 <= sn:
+            # bitmiş; daha önce başlayıp hâlâ süren bir kayıt var mı
+            i = i - 1 if i > 0 and self._en_gec[i - 1] > sn else -1
+        k = bisect_right(self._sinirlar, sn)
+        return AkisDurumu(self._girdiler[i] if i >= 0 else None,
+                          self._girdiler[j] if j < len(self._girdiler) else None,
+                          self._girdiler[j:],
+                          min(self._sinirlar[k], GUN_SN) if k < len(self._sinirlar) else GUN_SN)
+
+
+def _kesisir(p1, p2):
+    return any(a < pb and pa < b for a, b in p1 for pa, pb in p2)
+
+
+# ---------- tablo uyarlayıcıları ----------
+def zil_girdisi(gun, bas_saat, sure):
+    """main.py `zil` satırı → (bas, bit) hafta dakikası"""
+    bas = gun * GUN_DK + saat_dakika(bas_saat)
+    return bas, bas + sure
+
+
+def gun_araligi(baslangic_saat, bitis_saat, gece=False):
+    """
+    'HH:MM' başlangıç / bitiş → (bas, bit) gün dakikası. Bitiş başlangıçtan
+    sonra değilse aralık terstir (bit <= bas; aralik_denetimi TERS bildirir).
+    Yalnızca gece=True ile kayıt gece yarısını aşar: bit ertesi güne taşar
+    """
+    bas, bit = saat_dakika(baslangic_saat), saat_dakika(bitis_saat)
+    return bas, bit + GUN_DK if gece and bit <= bas else bit
+
+
+def gece_asar(baslangic_saat, bitis_saat, sure):
+    """
+    Saklanan satır gece yarısını aşıyor mu: bitiş başlangıçtan sonra değil ve
+    sure bunu açıkça doğruluyor (başlangıç + sure = ertesi gün bitiş)
+    """
+    bas, bit = saat_dakika(baslangic_saat), saat_dakika(bitis_saat)
+    return bit <= bas and sure == bit + GUN_DK - bas
+
+
+def zil_programi_girdisi(gun, baslangic_saat, bitis_saat, sure=None):
+    """zil_programi.py `zil_programi` satırı → (bas, bit) hafta dakikası"""
+    bas, bit = gun_araligi(baslangic_saat, bitis_saat, gece_asar(baslangic_saat, bitis_saat, sure))
+    return GUNLER.index(gun) * GUN_DK + bas, GUNLER.index(gun) * GUN_DK + bit
+
+
+def zil_cizelgesi(kayitlar):
+    """ZilKaydi listesi → HaftalikCizelge (veri = kayıt)"""
+    c = HaftalikCizelge()
+    c.yeniden_kur((k.id, *zil_girdisi(k.gun, k.bas_saat, k.sure), k) for k in kayitlar)
+    return c
+
+
+def zil_programi_cizelgesi(satirlar):
+    """DatabaseManager.zilleri_getir() satırları → HaftalikCizelge (veri = satır)"""
+    c = HaftalikCizelge()
+    c.yeniden_kur((s[0], *zil_programi_girdisi(s[1], s[4], s[5], s[6]), s) for s in satirlar)
+    return c
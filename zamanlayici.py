@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Olay güdümlü, çok bölgeli zil zamanlayıcısı
+Her bölgenin (bina, kanat, kampüs …) bugünkü ve yarınki zilleri sıralı bir
+listede tutulur; tek bir yığında (heapq) bölge başına yalnızca sıradaki zil
+bulunur. Böylece bir zil O(log bölge) ile seçilir, bölge başına thread
+gerekmez. Zamanlayıcı bir sonraki zile kadar uyandırılabilir bir koşul
+değişkeninde bekler; bir bölgenin programı değişince yalnızca o bölge
+yeniden kurulur. Kaynak tarihle sorulur: tatil / özel gün istisnaları
+kaynağın (ProgramOnbellegi.tarih) önceden çözdüğü programda hazırdır.
+
+Bekleme monoton saatle yapılır (Condition.wait) ve en fazla MAKS_UYKU
+sürer; her uyanışta duvar saatinin monoton saate göre kayıp kaymadığı
+denetlenir. NTP adımı, elle saat değişikliği ya da uyku / hazırda bekleme
+sonrası SICRAMA_ESIGI'ni aşan kayma görülürse tüm kuyruklar yeniden kurulur;
+geri sıçramada çalmış zil tekrar çalmaz, ileri sıçramada kaçan ziller
+politikaya göre geç çalar ya da atlanır. Planlanan → gerçek tetik farkı
+SapmaHistogrami'na yazılır.
+
+Saat enjekte edilebilir: GercekSaat (varsayılan) ya da SanalSaat – aynı
+zamanlayıcı bir haftayı / yılı saniyeler içinde oynatır (simulasyon.py).
+"""
+
+import heapq, itertools, threading, time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from zaman_cizelgesi import saat_dakika
+import olcum
+
+GECIKME_TOLERANSI = 1.0     # sn – yeniden kurulumda az önce kaçan zil yine çalsın
+VARSAYILAN_BOLGE  = "ana"
+MAKS_UYKU         = 30.0    # sn – saat sıçraması en geç bu kadar sürede fark edilir
+SICRAMA_ESIGI     = 2.0     # sn – duvar saati monoton saatten bu kadar ayrılırsa sıçrama
+GEC_CAL_SINIRI    = 60.0    # sn – 'gec' politikasında kaçan zilin en fazla gecikmesi
+POLITIKALAR       = ("gec", "atla")     # kaçan zil: sınır içindeyse geç çal | hep atla
+
+
+# ---------- saatler ----------
+class GercekSaat:
+    """Duvar saati + monoton saat; bekleme Condition.wait (monoton zaman aşımı)"""
+    maks_uyku = MAKS_UYKU
+    olcek = 1.0                 # saat saniyesi / gerçek saniye
+
+    def zaman(self):
+        return time.time()
+
+    def oku(self):
+        """(duvar, monoton) – sıçrama denetimi için aynı andan"""
+        return time.time(), time.monotonic()
+
+    def bekle(self, kosul, sn):
+        """kosul kilidi tutulurken çağrılır; False → saat bitti, zamanlayıcı dursun"""
+        kosul.wait(max(sn, 0.0))
+        return True
+
+
+class SanalSaat:
+    """
+    Simülasyon saati: bas'tan (epoch sn) bitis'e kadar. hiz=None → beklemeler
+    anında atlanır (olay güdümlü, en hızlı); hiz=N → gerçek zamanın N katı
+    hızla akar (bildirimler gerçek zamanda uyandırır; gecikmeler gerçek saniyeyle
+    ölçülür). sicra(sn) duvar saatini monoton saate dokunmadan kaydırır (NTP /
+    uyku denemesi).
+    """
+
+    def __init__(self, bas, bitis=None, hiz=None):
+        self.bitis, self.hiz = bitis, hiz
+        self.maks_uyku = MAKS_UYKU * hiz if hiz else None
+        self.olcek = hiz or 1.0
+        self._sanal = float(bas)        # hiz=None: güncel sanal zaman
+        self._gercek = time.monotonic() # hiz=N: sanal = _sanal + (monotonic - _gercek) * hiz
+        self._sicrama = 0.0
+
+    def _monoton(self):
+        if self.hiz is None:
+            return self._sanal
+        return self._sanal + (time.monotonic() - self._gercek) * self.hiz
+
+    def zaman(self):
+        return self._monoton() + self._sicrama
+
+    def oku(self):
+        mono = self._monoton()
+        return mono + self._sicrama, mono
+
+    def sicra(self, sn):
+        self._sicrama += sn
+
+    def bekle(self, kosul, sn):
+        if self.bitis is not None and self.zaman() >= self.bitis:
+            return False
+        sn = max(sn, 0.0)
+        if self.bitis is not None:
+            sn = min(sn, self.bitis - self.zaman())
+        if self.hiz is None:
+            self._sanal += sn
+        else:
+            kosul.wait(sn / self.hiz)
+        return True
+
+
+class SapmaHistogrami:
+    """Planlanan → gerçek tetik farkı (ms), sabit kovalı histogram; thread güvenli"""
+    SINIRLAR = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 60000)
+
+    def __init__(self, sinirlar=SINIRLAR):
+        self.sinirlar = tuple(sinirlar)
+        self._kovalar = [0] * (len(self.sinirlar) + 1)     # son kova: en büyük sınırın üstü
+        self._kilit = threading.Lock()
+        self.adet, self.toplam, self.maks = 0, 0.0, 0.0
+
+    def kaydet(self, ms):
+        with self._kilit:
+            self._kovalar[bisect_left(self.sinirlar, ms)] += 1
+            self.adet += 1
+            self.toplam += ms
+            self.maks = max(self.maks, ms)
+
+    def yuzdelik(self, p):
+        """p. yüzdeliğin düştüğü kovanın üst sınırı (ms) ya da None"""
+        with self._kilit:
+            if not self.adet:
+                return None
+            hedef, birikim = p / 100.0 * self.adet, 0
+            for i, n in enumerate(self._kovalar):
+                birikim += n
+                if birikim >= hedef:
+                    return self.sinirlar[i] if i < len(self.sinirlar) else self.maks
+        return self.maks
+
+    def ozet(self):
+        """{'adet', 'ortalama', 'maks', 'p50', 'p95', 'p99', 'kovalar': {'<=1': n, …, '>60000': n}}"""
+        with self._kilit:
+            kovalar = {f"<={s}": n for s, n in zip(self.sinirlar, self._kovalar)}
+            kovalar[f">{self.sinirlar[-1]}"] = self._kovalar[-1]
+            adet, ortalama, maks = self.adet, self.toplam / self.adet if self.adet else None, self.maks
+        return {"adet": adet, "ortalama": ortalama, "maks": maks if adet else None,
+                "p50": self.yuzdelik(50), "p95": self.yuzdelik(95), "p99": self.yuzdelik(99),
+                "kovalar": kovalar}
+
+
+class _Bolge:
+    __slots__ = ("ad", "kaynak", "cal", "olaylar", "konum", "nesil", "son_atis")
+
+    def __init__(self, ad, kaynak, cal):
+        self.ad, self.kaynak, self.cal = ad, kaynak, cal
+        self.olaylar = []       # [(zaman_damgasi, tur, sure), ...] sıralı
+        self.konum = 0          # sıradaki olayın indeksi
+        self.nesil = 0          # yığındaki eski girdileri ayırt etmek için
+        self.son_atis = 0.0     # aynı zil iki kez çalmasın
+
+
+class ZilZamanlayici:
+    """
+    Bölge başına:
+      kaynak(tarih) -> [(tur, bas_saat, sure), ...]  (tarih: datetime.date)
+      cal(tur, sure) zil anında zamanlayıcı thread'inden çağrılır.
+    Tek bölgeli kullanım için kaynak/cal doğrudan verilebilir.
+    politika: kaçan zil (GECIKME_TOLERANSI'ndan geç) 'gec' → gec_sinir
+    saniye içindeyse çalar, 'atla' → çalmaz. Aynı bölgenin daha yeni zili de
+    kaçmışsa eskisi her durumda atlanır.
+    """
+
+    def __init__(self, kaynak=None, cal=None, politika="gec", gec_sinir=GEC_CAL_SINIRI, saat=None):
+        if politika not in POLITIKALAR:
+            raise ValueError(f"politika {' | '.join(POLITIKALAR)} olmalı")
+        self.saat = saat or GercekSaat()
+        self.politika, self.gec_sinir = politika, gec_sinir
+        self.sapma = SapmaHistogrami()
+        self.sayaclar = {"calan": 0, "gec_calan": 0, "atlanan": 0, "sicrama": 0, "hata": 0}
+        self._saat = None           # (monotonic, time) – son uyanış
+        self._kacan_esigi = None    # ileri sıçramadan sonra: bu andan sonraki ziller kaçmış sayılır
+        self._kosul = threading.Condition()
+        self._bolgeler = {}         # ad → _Bolge
+        self._yigin = []            # (zaman_damgasi, sira, nesil, bolge_adi) – bölge başına sıradaki zil
+        self._sira = itertools.count()
+        self._kirli = set()         # yeniden kurulacak bölgeler
+        self._calisiyor = False
+        self._gun_sonu = 0.0        # kuyrukların kapsadığı gün
+        if kaynak is not None:
+            self.bolge_ekle(VARSAYILAN_BOLGE, kaynak, cal)
+
+    # ---------- bölgeler ----------
+    def bolge_ekle(self, ad, kaynak, cal):
+        with self._kosul:
+            self._bolgeler[ad] = _Bolge(ad, kaynak, cal)
+            self._kirli.add(ad)
+            self._kosul.notify()
+
+    def bolge_sil(self, ad):
+        with self._kosul:
+            self._bolgeler.pop(ad, None)
+            self._kirli.discard(ad)
+            self._kosul.notify()
+
+    def bolgeler(self):
+        with self._kosul:
+            return set(self._bolgeler)
+
+    def bolgeleri_esitle(self, adlar, kaynak, cal):
+        """
+        Bölge kümesini adlar'a eşitle; yeni bölgeler için kaynak(ad, tarih) ve
+        cal(ad) -> cal(tur, sure) kullanılır.
+        """
+        adlar = set(adlar)
+        with self._kosul:
+            for ad in set(self._bolgeler) - adlar:
+                self.bolge_sil(ad)
+            for ad in adlar - set(self._bolgeler):
+                self.bolge_ekle(ad, lambda tarih, ad=ad: kaynak(ad, tarih), cal(ad))
+
+    # ---------- dış arayüz ----------
+    def yenile(self, bolge=None):
+        """Program değişti: bölgeyi (None → hepsini) bir sonraki uyanışta yeniden kur"""
+        with self._kosul:
+            if bolge is None:
+                self._kirli.update(self._bolgeler)
+            elif bolge in self._bolgeler:
+                self._kirli.add(bolge)
+            self._kosul.notify()
+
+    def durdur(self):
+        with self._kosul:
+            self._calisiyor = False
+            self._kosul.notify()
+
+    def sonraki(self):
+        """(zaman_damgasi, tur, sure, bolge) ya da None"""
+        with self._kosul:
+            self._bakim(self.saat.zaman())
+            if not self._yigin:
+                return None
+            t, _, _, ad = self._yigin[0]
+            b = self._bolgeler[ad]
+            _, tur, sure = b.olaylar[b.konum]
+            return t, tur, sure, ad
+
+    def sonraki_hepsi(self):
+        """{bolge: (zaman_damgasi, tur, sure)} – yalnızca sıradaki zili olan bölgeler"""
+        with self._kosul:
+            self._bakim(self.saat.zaman())
+            return {ad: b.olaylar[b.konum] for ad, b in self._bolgeler.items()
+                    if b.konum < len(b.olaylar)}
+
+    # ---------- kuyruk ----------
+    def _kur(self, b, simdi):
+        """Bölgenin bugünkü kalan ve yarınki zillerini sırala, sıradakini yığına koy"""
+        bugun = datetime.fromtimestamp(simdi).replace(hour=0, minute=0, second=0, microsecond=0)
+        esik = simdi - GECIKME_TOLERANSI
+        if self._kacan_esigi is not None:
+            esik = min(esik, self._kacan_esigi)     # sıçramada kaçanlar kuyruğa girer, politika karar verir
+        olaylar = []
+        for ek_gun in (0, 1):
+            gun_bas = bugun + timedelta(days=ek_gun)
+            for tur, bas_saat, sure in b.kaynak(gun_bas.date()):
+                t = (gun_bas + timedelta(minutes=saat_dakika(bas_saat))).timestamp()
+                if t >= esik and t > b.son_atis:
+                    olaylar.append((t, tur, sure))
+        olaylar.sort(key=lambda o: o[0])
+        b.olaylar, b.konum = olaylar, 0
+        b.nesil = next(self._sira)      # süreç genelinde tekil: silinip eklenen bölgeyle karışmaz
+        self._it(b)
+
+    def _it(self, b):
+        if b.konum < len(b.olaylar):
+            heapq.heappush(self._yigin, (b.olaylar[b.konum][0], next(self._sira), b.nesil, b.ad))
+
+    def _bakim(self, simdi):
+        """Gün dönümü / kirli bölgeleri kur, yığının tepesindeki eski girdileri at"""
+        if simdi >= self._gun_sonu:
+            self._kirli.update(self._bolgeler)
+            yarin = datetime.fromtimestamp(simdi).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            self._gun_sonu = yarin.timestamp()
+        if self._kirli:
+            with olcum.sure("zamanlayici_kur"):
+                for ad in sorted(self._kirli):      # aynı andaki ziller bölge adı sırasıyla çalar
+                    self._kur(self._bolgeler[ad], simdi)
+            self._kirli.clear()
+            self._kacan_esigi = None
+            if len(self._yigin) > 2 * len(self._bolgeler) + 64:
+                self._yigin = [g for g in self._yigin if self._gecerli(g)]
+                heapq.heapify(self._yigin)
+        while self._yigin and not self._gecerli(self._yigin[0]):
+            heapq.heappop(self._yigin)
+
+    def _gecerli(self, girdi):
+        b = self._bolgeler.get(girdi[3])
+        return b is not None and b.nesil == girdi[2]
+
+    def _sicrama_denetle(self, simdi, mono):
+        """Duvar saati son uyanıştan beri monoton saatten ayrıldıysa tüm kuyrukları yeniden kur"""
+        if self._saat is not None:
+            beklenen = self._saat[1] + (mono - self._saat[0])
+            fark = simdi - beklenen
+            if abs(fark) >= SICRAMA_ESIGI:
+                self.sayaclar["sicrama"] += 1
+                print(f"[UYARI] sistem saati {fark:+.1f} sn sıçradı – zil kuyrukları yeniden kuruluyor")
+                self._gun_sonu = 0.0        # gün sınırı yeniden hesaplansın, tüm bölgeler kirli
+                if fark > 0:
+                    self._kacan_esigi = beklenen - GECIKME_TOLERANSI
+        self._saat = (mono, simdi)
+
+    def _calinsin_mi(self, b, t, simdi):
+        """Kaçan zil politikası; sayaçları günceller"""
+        gecikme = (simdi - t) / self.saat.olcek     # gerçek saniye
+        if gecikme <= GECIKME_TOLERANSI:
+            self.sayaclar["calan"] += 1
+            return True
+        yeni_de_kacti = b.konum < len(b.olaylar) and b.olaylar[b.konum][0] <= simdi
+        if yeni_de_kacti or self.politika == "atla" or gecikme > self.gec_sinir:
+            self.sayaclar["atlanan"] += 1
+            print(f"[UYARI] {b.ad}: {time.strftime('%H:%M', time.localtime(t))} zili "
+                  f"{gecikme:.0f} sn kaçırıldı – atlandı")
+            return False
+        self.sayaclar["calan"] += 1
+        self.sayaclar["gec_calan"] += 1
+        print(f"[UYARI] {b.ad}: {time.strftime('%H:%M', time.localtime(t))} zili {gecikme:.0f} sn geç çalıyor")
+        return True
+
+    def istatistik(self):
+        """Sayaçlar + tetik sapması özeti (ms)"""
+        with self._kosul:
+            sayaclar = dict(self.sayaclar)
+        return {**sayaclar, "politika": self.politika, "sapma_ms": self.sapma.ozet()}
+
+    # ---------- döngü ----------
+    def calis(self):
+        """Zamanlayıcı döngüsü; durdur() çağrılana kadar döner"""
+        with self._kosul:
+            self._calisiyor = True
+            self._saat = None
+        while True:
+            with self._kosul:
+                if not self._calisiyor:
+                    return
+                simdi, mono = self.saat.oku()
+                self._sicrama_denetle(simdi, mono)
+                self._bakim(simdi)
+                if not self._yigin or self._yigin[0][0] > simdi:
+                    # bir sonraki zile ya da gece yarısına kadar uyu (monoton; en fazla maks_uyku)
+                    uyan = min(self._yigin[0][0], self._gun_sonu) if self._yigin else self._gun_sonu
+                    if self.saat.maks_uyku:
+                        uyan = min(uyan, simdi + self.saat.maks_uyku)
+                    if not self.saat.bekle(self._kosul, uyan - simdi):
+                        self._calisiyor = False
+                    continue
+                t = self._yigin[0][0]
+                b = self._bolgeler[heapq.heappop(self._yigin)[3]]
+                _, tur, sure = b.olaylar[b.konum]
+                b.konum += 1
+                b.son_atis = t
+                self._it(b)
+                if not self._calinsin_mi(b, t, simdi):
+                    continue
+                cal, ad = b.cal, b.ad
+            sapma_ms = (self.saat.zaman() - t) * 1000.0 / self.saat.olcek
+            self.sapma.kaydet(sapma_ms)
+            olcum.gozle("zil_tetik_sapma_saniye", sapma_ms / 1000.0)
+            try:
+                cal(tur, sure)
+            except Exception as e:
+                # çalıcı / IPC / Qt sinyali hatası döngüyü bitirmesin: sonraki ziller çalmaya devam eder
+                print(f"[UYARI] {ad}: {tur} zili çalınamadı – {e}")
+                olcum.hata("zamanlayici", e)
+                with self._kosul:
+                    self.sayaclar["hata"] += 1
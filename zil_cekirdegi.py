@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ortak zil çekirdeği – main.py, zil_programi.py ve başsız servis aynı parçalarla çalar
+  ZilKilidi           veritabanı başına kilit dosyası (KILIT_KLASORU altında, mutlak yolun
+                      özetiyle adlanır): aynı veritabanından yalnızca bir süreç zil çalar,
+                      iki pencere / servis çift çalmaz; farklı veritabanları birbirini
+                      engellemez
+  ZilProgramiDeposu   zil_programi.py'nin `zil_programi` tablosu → gün başına başlangıç
+                      ve bitiş zilleri; değişiklik PRAGMA data_version ile fark edilir
+  ZilCekirdegi        kilit + ZilZamanlayici + zamanlayıcı thread'i
+  SesOynatici         Qt'siz oynatıcı: ses bankası + çalıcı (süreç içi ya da süreç dışı)
+                      + klasör izleyici
+
+Kilit işletim sisteminin dosya kilididir (flock / msvcrt.locking): süreç
+çökse de kendiliğinden bırakılır, bayat kilit kalmaz. Dosyalar Windows'ta
+%PROGRAMDATA%, diğer sistemlerde /tmp'dedir; aynı veritabanını açan her
+kullanıcı aynı dosyayı görür.
+"""
+
+import os, sys, hashlib, sqlite3, tempfile, threading, time
+from zamanlayici import ZilZamanlayici
+from zaman_cizelgesi import GUNLER, GUN_DK, HAFTA_DK, zil_programi_girdisi
+from birlesik_program import tur_kodu
+from aralik_denetimi import gecerli
+from ses_bankasi import SesBankasi, SesIzleyici
+from ses_cikisi import ZilCalici
+import olcum
+
+try:
+    import fcntl
+except ImportError:             # Windows
+    fcntl = None
+    import msvcrt
+
+SES_KLASORU = "zil_sesleri"
+KAPANIS_SN  = 2.0
+BITIS_TURU  = {"DERS": "TENEFFUS", "TENEFFUS": "DERS"}     # ders biter → teneffüs zili, ve tersi
+# kullanıcıya özgü TMPDIR / %TEMP% değil: aynı bilgisayardaki her süreç aynı dosyayı görmeli
+KILIT_KLASORU = ((os.environ.get("PROGRAMDATA") if sys.platform == "win32" else "/tmp")
+                 or tempfile.gettempdir())
+
+
+# ---------- kilit ----------
+def kilit_yolu(db_file):
+    """KILIT_KLASORU/zil_<mutlak yolun özeti>.kilit – veritabanı klasörü salt okunur olsa da çalışır"""
+    ozet = hashlib.sha1(os.path.normcase(os.path.abspath(db_file)).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(KILIT_KLASORU, f"zil_{ozet}.kilit")
+
+
+class ZilKilidi:
+    """Veritabanının zillerini çalma görevi için bloklamayan, süreç ömrü boyunca tutulan kilit"""
+
+    def __init__(self, db_file):
+        self.yol = kilit_yolu(db_file)
+        self._dosya = None
+
+    def al(self):
+        """Kilit alındıysa True; başka bir süreç (ya da çekirdek) tutuyorsa False"""
+        if self._dosya is not None:
+            return True
+        try:
+            dosya = os.fdopen(os.open(self.yol, os.O_RDWR | os.O_CREAT, 0o666), "r+")
+        except PermissionError:
+            # dosyayı başka bir kullanıcı oluşturmuş: okumak için açmak kilitlemeye yeter
+            dosya = open(self.yol, encoding="ascii")
+        try:
+            if fcntl is not None:
+                fcntl.flock(dosya, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(dosya.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            dosya.close()
+            return False
+        if dosya.writable():
+            dosya.seek(0)
+            dosya.truncate()
+            dosya.write(f"{os.getpid()}\n")
+            dosya.flush()
+        self._dosya = dosya
+        return True
+
+    def sahibi(self):
+        """Kilidi en son alan sürecin pid'i ya da None"""
+        try:
+            with open(self.yol, encoding="ascii") as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def birak(self):
+        if self._dosya is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._dosya, fcntl.LOCK_UN)
+            else:
+                self._dosya.seek(0)
+                msvcrt.locking(self._dosya.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self._dosya.close()
+        self._dosya = None
+
+
+# ---------- zil_programi tablosu ----------
+def zil_programi_zilleri(satirlar):
+    """
+    (gun, tip, baslangic_saat, bitis_saat, sure) satırları → 7 günün [(tur, bas_saat, sure), ...]
+    listesi. Her kayıt başında kendi türünde, bitişinde öbür türde zil çalar;
+    aynı dakikada başlayan bir kayıt varsa bitiş zili çalmaz. Gece yarısını
+    aşan kaydın (sure ile işaretli) bitiş zili ertesi güne düşer; ters aralıklı
+    eski kaydın yalnızca başlangıç zili çalar.
+    """
+    baslar, bitisler = {}, {}       # hafta dakikası → (tur, sure)
+    for gun, tip, baslangic, bitis, sure in satirlar:
+        if gun not in GUNLER:
+            continue
+        tur = tur_kodu(tip)
+        bas, bit = zil_programi_girdisi(gun, baslangic, bitis, sure)
+        if not gecerli(bas % GUN_DK, bas % GUN_DK + bit - bas):
+            baslar.setdefault(bas % HAFTA_DK, (tur, 0))
+            continue
+        baslar.setdefault(bas % HAFTA_DK, (tur, bit - bas))
+        bitisler.setdefault(bit % HAFTA_DK, (BITIS_TURU[tur], 0))
+    gunler = [[] for _ in GUNLER]
+    for dk, (tur, sure) in sorted({**bitisler, **baslar}.items()):
+        gunler[dk // GUN_DK].append((tur, f"{dk % GUN_DK // 60:02d}:{dk % 60:02d}", sure))
+    return gunler
+
+
+class ZilProgramiDeposu:
+    """
+    `zil_programi` tablosunun zamanlayıcı kaynağı. Zil listesi ilk sorguda
+    derlenir; tazele() başka bağlantıların (DatabaseManager, içe aktarma,
+    eşitleme) yazdığını PRAGMA data_version ile görür, listeyi atar ve
+    dinleyicileri çağırır.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._kilit = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._gunler = None
+        self._data_version = None
+        self._dinleyiciler = []
+
+    def dinleyici_ekle(self, fn):
+        self._dinleyiciler.append(fn)
+
+    def gun_zilleri(self, tarih):
+        """Zamanlayıcı kaynağı: tarihin haftanın gününe düşen zilleri"""
+        with self._kilit:
+            if self._gunler is None:
+                self._yukle()
+            return self._gunler[tarih.weekday()]
+
+    def tazele(self):
+        """Tablo başka bir bağlantıdan değiştiyse derlenmiş listeyi at; değiştiyse True"""
+        with self._kilit:
+            surum = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if surum == self._data_version:
+                return False
+            self._data_version = surum
+            self._gunler = None
+        for fn in self._dinleyiciler:
+            fn()
+        return True
+
+    def _yukle(self):
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        try:
+            satirlar = self._conn.execute(
+                "SELECT gun, tip, baslangic_saat, bitis_saat, sure FROM zil_programi").fetchall()
+        except sqlite3.OperationalError:        # tablo henüz yok
+            satirlar = []
+        self._gunler = zil_programi_zilleri(satirlar)
+
+    def kapat(self):
+        with self._kilit:
+            self._conn.close()
+
+
+# ---------- zamanlayıcı ----------
+class ZilCekirdegi:
+    """
+    Veritabanı başına tek zamanlayıcı. Bölgeler motor'a (ZilZamanlayici)
+    eklenir; baslat() veritabanının kilidini alabilirse motoru kendi
+    thread'inde çalıştırır, alamazsa False döner – o veritabanının zillerini
+    başka bir süreç çalıyor. Başka veritabanlarının çekirdekleri engellenmez.
+    """
+
+    def __init__(self, db_file, motor=None):
+        self.db_file = db_file
+        self.kilit = ZilKilidi(db_file)
+        self.motor = motor or ZilZamanlayici()
+        self._thread = None
+
+    @property
+    def calisiyor(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def baslat(self):
+        if self._thread is not None:
+            return True
+        if not self.kilit.al():
+            sahibi = self.kilit.sahibi()
+            print(f"[UYARI] {self.db_file} zillerini zaten başka bir süreç çalıyor"
+                  f"{f' (pid {sahibi})' if sahibi else ''} – bu süreç zil çalmayacak")
+            return False
+        self._thread = threading.Thread(target=self.motor.calis, name="zil-zamanlayici", daemon=True)
+        self._thread.start()
+        olcum.gosterge_ekle("zil_zamanlayici_olay_toplam", self._olaylar,
+                            "Zamanlayıcı olayları (çalan, geç çalan, atlanan, saat sıçraması, çalma hatası)", "counter")
+        olcum.gosterge_ekle("zil_sonraki_zil_saniye", self._sonraki_zil, "Sıradaki zile kalan süre")
+        return True
+
+    def _olaylar(self):
+        return {(("olay", ad),): n for ad, n in self.motor.istatistik().items() if isinstance(n, int)}
+
+    def _sonraki_zil(self):
+        sonraki = self.motor.sonraki()
+        return round(sonraki[0] - time.time(), 3) if sonraki else None
+
+    def durdur(self):
+        self.motor.durdur()
+        if self._thread is not None:
+            self._thread.join(KAPANIS_SN)
+            self._thread = None
+        self.kilit.birak()
+
+
+# ---------- ses ----------
+class SesOynatici:
+    """
+    Qt'siz oynatıcı: klasördeki sesler belleğe çözülür ve izlenir; cal() herhangi
+    bir thread'den çağrılabilir. ses_sureci=True → çalma ayrı bir işçi sürecinde
+    (ses_sureci.SurecCalici).
+    """
+
+    def __init__(self, klasor=SES_KLASORU, cikis=None, ses_sureci=False):
+        self.klasor = klasor
+        self.banka = SesBankasi(klasor)
+        if ses_sureci:
+            from ses_sureci import SurecCalici
+            self.calici = SurecCalici(self.banka, cikis)
+        else:
+            self.calici = ZilCalici(self.banka, cikis)
+        self.gecikme = self.calici.gecikme
+        self.izleyici = SesIzleyici(self.banka, self.calici.sesler_degisti)
+        self.izleyici.start()
+
+    def klasor_degistir(self, klasor):
+        self.klasor = klasor
+        self.izleyici.klasor_degistir(klasor)
+
+    def cal(self, tur, sure=0, tetik=0.0):
+        self.calici.cal(tur, sure, tetik)
+
+    def durdur(self):
+        self.izleyici.stop()
+        self.calici.durdur()
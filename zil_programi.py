@@ -1,96 +1,148 @@
 import sys
+from time import perf_counter
+
+_BASLANGIC = perf_counter()     # açılış süresi ölçümü: PyQt5 yüklemesi dahil
+
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, time
+from bisect import bisect_left, bisect_right
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+                            QHBoxLayout, QTabWidget, QTableView,
                             QPushButton, QComboBox, QTimeEdit, QLineEdit, QLabel,
                             QMessageBox, QDialog, QDialogButtonBox, QFormLayout,
-                            QHeaderView, QGroupBox)
-from PyQt5.QtCore import Qt, QTime, QTimer
-from PyQt5.QtGui import QFont, QColor
+                            QHeaderView, QGroupBox, QStyledItemDelegate, QFileDialog, QCheckBox)
+from PyQt5.QtCore import (Qt, QTime, QTimer, QAbstractTableModel, QSortFilterProxyModel,
+                          QModelIndex, QRect, QSize, QEvent, pyqtSignal)
+from PyQt5.QtGui import QFont, QColor, QPainter
+from degisiklik_gunlugu import gunluk_kur, kaydet
+from aralik_denetimi import AralikDenetcisi, gecerli
+from zaman_cizelgesi import gun_araligi, gece_asar
+from durum_paneli import DurumPaneli
+from zamanlayici import VARSAYILAN_BOLGE
+from zil_cekirdegi import ZilCekirdegi, ZilProgramiDeposu, SesOynatici, SES_KLASORU
+from olcum import olculen
+import olcum
+import program_aktarim
 
 class DatabaseManager:
-    def __init__(self):
-        self.db_name = "okul_zil_programi.db"
+    JOURNAL_MODE = "WAL"   # ağ sürücüsünde paylaşılan dosyalar için "DELETE" kullanın
+    
+    def __init__(self, db_name="okul_zil_programi.db"):
+        self.db_name = db_name
+        self._yerel = threading.local()
+        self._baglantilar = []
+        self._kilit = threading.Lock()
         self.init_database()
     
+    def baglanti(self):
+        """Thread başına açılıp açık tutulan bağlantıyı döndür"""
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            # isolation_level=None: tekil ifadeler kendiliğinden commit olur,
+            # toplu işlemler transaction() ile tek commit'e toplanır
+            conn = sqlite3.connect(self.db_name, isolation_level=None,
+                                   check_same_thread=False, cached_statements=256)
+            conn.execute(f"PRAGMA journal_mode={self.JOURNAL_MODE}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-8000")      # ~8 MB
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._yerel.conn = conn
+            with self._kilit:
+                self._baglantilar.append(conn)
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """İçindeki tüm işlemleri tek commit ile yaz; iç içe kullanılabilir"""
+        conn = self.baglanti()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+    
+    def kapat(self):
+        """Açık bağlantıların hepsini kapat"""
+        with self._kilit:
+            for conn in self._baglantilar:
+                conn.close()
+            self._baglantilar.clear()
+        self._yerel = threading.local()
+    
     def init_database(self):
         """Veritabanını başlat ve tabloları oluştur"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        # Zil programı tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS zil_programi (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                gun TEXT NOT NULL,
-                tip TEXT NOT NULL,
-                baslik TEXT NOT NULL,
-                baslangic_saat TEXT NOT NULL,
-                bitis_saat TEXT NOT NULL,
-                sure INTEGER NOT NULL
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            # Zil programı tablosu
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS zil_programi (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    gun TEXT NOT NULL,
+                    tip TEXT NOT NULL,
+                    baslik TEXT NOT NULL,
+                    baslangic_saat TEXT NOT NULL,
+                    bitis_saat TEXT NOT NULL,
+                    sure INTEGER NOT NULL
+                )
+            ''')
+            # merkez → zil bilgisayarı eşitlemesi için değişiklik günlüğü
+            gunluk_kur(conn, "zil_programi")
     
+    @olculen("db_zil_ekle")
     def zil_ekle(self, gun, tip, baslik, baslangic, bitis, sure):
         """Yeni zil programı ekle"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO zil_programi (gun, tip, baslik, baslangic_saat, bitis_saat, sure)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (gun, tip, baslik, baslangic, bitis, sure))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.execute('''
+                INSERT INTO zil_programi (gun, tip, baslik, baslangic_saat, bitis_saat, sure)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (gun, tip, baslik, baslangic, bitis, sure))
+            kaydet(conn, "zil_programi", "ekle", cursor.lastrowid)
+            return cursor.lastrowid
     
+    @olculen("db_zilleri_getir")
     def zilleri_getir(self, gun=None):
         """Zil programlarını getir"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
+        conn = self.baglanti()
         
         if gun:
-            cursor.execute('SELECT * FROM zil_programi WHERE gun = ? ORDER BY baslangic_saat', (gun,))
+            cursor = conn.execute('SELECT * FROM zil_programi WHERE gun = ? ORDER BY baslangic_saat', (gun,))
         else:
-            cursor.execute('SELECT * FROM zil_programi ORDER BY gun, baslangic_saat')
+            cursor = conn.execute('SELECT * FROM zil_programi ORDER BY gun, baslangic_saat')
         
-        ziller = cursor.fetchall()
-        conn.close()
-        return ziller
+        return cursor.fetchall()
     
+    @olculen("db_zil_sil")
     def zil_sil(self, zil_id):
         """Zil programını sil"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM zil_programi WHERE id = ?', (zil_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM zil_programi WHERE id = ?', (zil_id,))
+            kaydet(conn, "zil_programi", "sil", zil_id)
     
+    @olculen("db_zil_guncelle")
     def zil_guncelle(self, zil_id, gun, tip, baslik, baslangic, bitis, sure):
         """Zil programını güncelle"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE zil_programi 
-            SET gun = ?, tip = ?, baslik = ?, baslangic_saat = ?, bitis_saat = ?, sure = ?
-            WHERE id = ?
-        ''', (gun, tip, baslik, baslangic, bitis, sure, zil_id))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            conn.execute('''
+                UPDATE zil_programi 
+                SET gun = ?, tip = ?, baslik = ?, baslangic_saat = ?, bitis_saat = ?, sure = ?
+                WHERE id = ?
+            ''', (gun, tip, baslik, baslangic, bitis, sure, zil_id))
+            kaydet(conn, "zil_programi", "guncelle", zil_id)
 
 class ZilEkleDialog(QDialog):
-    def __init__(self, parent=None, zil_data=None):
+    def __init__(self, parent=None, zil_data=None, denetci=None):
         super().__init__(parent)
         self.zil_data = zil_data
+        self.denetci = denetci      # AralikDenetcisi – çakışma / boşluk denetimi
         self.init_ui()
         
         if zil_data:
@@ -130,11 +182,20 @@ class ZilEkleDialog(QDialog):
         self.bitis_time.setTime(QTime(8, 45))
         layout.addRow("Bitiş Saati:", self.bitis_time)
         
+        # Bitiş başlangıçtan önceyse yalnızca açık onayla ertesi güne taşar
+        self.gece_check = QCheckBox("Gece yarısını aşar (bitiş ertesi gün)")
+        layout.addRow(self.gece_check)
+        
         # Süre (dakika)
         self.sure_edit = QLineEdit()
         self.sure_edit.setPlaceholderText("Dakika cinsinden")
         layout.addRow("Süre (Dakika):", self.sure_edit)
         
+        # Çakışma / boşluk uyarısı
+        self.uyari_label = QLabel()
+        self.uyari_label.setWordWrap(True)
+        layout.addRow(self.uyari_label)
+        
         # Butonlar
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self.accept)
@@ -146,19 +207,41 @@ class ZilEkleDialog(QDialog):
         # Süreyi otomatik hesapla
         self.baslangic_time.timeChanged.connect(self.hesapla_sure)
         self.bitis_time.timeChanged.connect(self.hesapla_sure)
+        self.gece_check.toggled.connect(self.hesapla_sure)
+        self.gun_combo.currentIndexChanged.connect(self.denetimi_goster)
+    
+    def aralik(self):
+        """(bas, bit) gün dakikası; bitiş başlangıçtan önceyse yalnızca onay kutusuyla ertesi gün"""
+        return gun_araligi(self.baslangic_time.time().toString("HH:mm"),
+                           self.bitis_time.time().toString("HH:mm"), self.gece_check.isChecked())
     
     def hesapla_sure(self):
         """Başlangıç ve bitiş saatinden süreyi hesapla"""
-        baslangic = self.baslangic_time.time()
-        bitis = self.bitis_time.time()
-        
-        # QTime'dan dakikaya çevir
-        baslangic_dakika = baslangic.hour() * 60 + baslangic.minute()
-        bitis_dakika = bitis.hour() * 60 + bitis.minute()
-        
-        if bitis_dakika > baslangic_dakika:
-            sure = bitis_dakika - baslangic_dakika
-            self.sure_edit.setText(str(sure))
+        bas, bit = self.aralik()
+        self.sure_edit.setText(str(bit - bas) if gecerli(bas, bit) else "0")
+        self.denetimi_goster()
+    
+    def bulgular(self):
+        """Girilen aralığın çakışma / boşluk / ters aralık bulguları"""
+        bas, bit = self.aralik()
+        gun = self.gun_combo.currentText()
+        denetci = self.denetci if self.denetci is not None else AralikDenetcisi()
+        return denetci.denetle(gun, bas, bit, haric=self.zil_data[0] if self.zil_data else None)
+    
+    def denetimi_goster(self):
+        """Bulguları düzenlerken göster: kırmızı kaydedilemez, turuncu yalnızca uyarı"""
+        bulgular = self.bulgular()
+        self.uyari_label.setText("\n".join(str(b) for b in bulgular))
+        self.uyari_label.setStyleSheet("color: #c62828;" if any(b.engel for b in bulgular)
+                                       else "color: #ef6c00;")
+    
+    def accept(self):
+        """Çakışan ya da ters aralıklı kaydı veritabanına gitmeden reddet"""
+        engeller = [str(b) for b in self.bulgular() if b.engel]
+        if engeller:
+            QMessageBox.warning(self, "Hata", "\n".join(engeller))
+            return
+        super().accept()
     
     def load_data(self):
         """Düzenleme için mevcut veriyi yükle"""
@@ -171,6 +254,7 @@ class ZilEkleDialog(QDialog):
             self.tip_combo.setCurrentIndex(tip_index)
             
             self.baslik_edit.setText(self.zil_data[3])
+            self.gece_check.setChecked(gece_asar(*self.zil_data[4:7]))
             
             # Saatleri ayarla
             baslangic_parts = self.zil_data[4].split(':')
@@ -182,27 +266,216 @@ class ZilEkleDialog(QDialog):
             self.sure_edit.setText(str(self.zil_data[6]))
     
     def get_data(self):
-        """Dialog verilerini döndür"""
+        """Dialog verilerini döndür; ters ya da çok uzun aralıkta sure 0 (kaydedilmez)"""
+        bas, bit = self.aralik()
         return {
             'gun': self.gun_combo.currentText(),
             'tip': self.tip_combo.currentText(),
             'baslik': self.baslik_edit.text(),
             'baslangic': self.baslangic_time.time().toString("HH:mm"),
             'bitis': self.bitis_time.time().toString("HH:mm"),
-            'sure': int(self.sure_edit.text()) if self.sure_edit.text().isdigit() else 0
+            'sure': bit - bas if gecerli(bas, bit) else 0
         }
 
+def denetim_girdisi(zil_id, gun, baslangic, bitis, sure):
+    """zil_programi satırı → AralikDenetcisi girdisi (gün adı anahtarlı; gece aşımı sure ile işaretli)"""
+    return (zil_id, gun, *gun_araligi(baslangic, bitis, gece_asar(baslangic, bitis, sure)))
+
+GUNLER = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+AKTARIM_FILTRESI = "Zil programı (*.csv *.json *.jsonl *.ics);;Tüm dosyalar (*)"
+TAZELE_MS = 2000    # başka bağlantıların (içe aktarma, eşitleme) değişikliklerini yoklama aralığı
+SATIR_ROLU = Qt.UserRole    # hücreden veritabanı satırına (id, gun, tip, baslik, bas, bit, sure)
+
+class ZilTabloModeli(QAbstractTableModel):
+    """Tüm sekmelerin paylaştığı zil programı modeli; gün + saat sırasında tutulur"""
+    BASLIKLAR = ['ID', 'Gün', 'Tip', 'Başlık', 'Başlangıç', 'Bitiş', 'Süre', 'İşlemler']
+    GUN_SUTUNU, ISLEM_SUTUNU = 1, 7
+    DERS_RENGI = QColor(227, 242, 253)      # Açık mavi
+    TENEFFUS_RENGI = QColor(243, 229, 245)  # Açık mor
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._satirlar = []
+        self._anahtarlar = []   # _satirlar ile paralel sıralama anahtarları
+    
+    @staticmethod
+    def _anahtar(satir):
+        return (GUNLER.index(satir[1]) if satir[1] in GUNLER else len(GUNLER), satir[4], satir[0])
+    
+    # ---------- Qt arayüzü ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.BASLIKLAR)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.BASLIKLAR[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        satir, sutun = self._satirlar[index.row()], index.column()
+        if role == Qt.DisplayRole:
+            if sutun == 0:
+                return str(satir[0])
+            if sutun == 6:
+                return f"{satir[6]} dk"
+            if sutun < self.ISLEM_SUTUNU:
+                return satir[sutun]
+        elif role == Qt.BackgroundRole and sutun < self.ISLEM_SUTUNU:
+            return self.DERS_RENGI if satir[2] == "Ders" else self.TENEFFUS_RENGI
+        elif role == SATIR_ROLU:
+            return satir
+        return None
+    
+    # ---------- değişiklikler ----------
+    def doldur(self, satirlar):
+        """Tüm modeli yeniden kur (açılış / Yenile)"""
+        self.beginResetModel()
+        self._satirlar = sorted((tuple(s) for s in satirlar), key=self._anahtar)
+        self._anahtarlar = [self._anahtar(s) for s in self._satirlar]
+        self.endResetModel()
+    
+    def satir_ekle(self, satir):
+        satir = tuple(satir)
+        anahtar = self._anahtar(satir)
+        konum = bisect_right(self._anahtarlar, anahtar)
+        self.beginInsertRows(QModelIndex(), konum, konum)
+        self._satirlar.insert(konum, satir)
+        self._anahtarlar.insert(konum, anahtar)
+        self.endInsertRows()
+    
+    def satir_sil(self, zil_id):
+        konum = self._konum(zil_id)
+        if konum is None:
+            return
+        self.beginRemoveRows(QModelIndex(), konum, konum)
+        del self._satirlar[konum]
+        del self._anahtarlar[konum]
+        self.endRemoveRows()
+    
+    def satir_guncelle(self, satir):
+        satir = tuple(satir)
+        konum = self._konum(satir[0])
+        if konum is None:
+            self.satir_ekle(satir)
+            return
+        anahtar = self._anahtar(satir)
+        onceki = self._anahtarlar[konum - 1] if konum > 0 else None
+        sonraki = self._anahtarlar[konum + 1] if konum + 1 < len(self._anahtarlar) else None
+        if (onceki is None or onceki <= anahtar) and (sonraki is None or anahtar <= sonraki):
+            # sıra değişmiyor: yalnızca o satırı yenile
+            self._satirlar[konum], self._anahtarlar[konum] = satir, anahtar
+            self.dataChanged.emit(self.index(konum, 0), self.index(konum, self.ISLEM_SUTUNU))
+        else:
+            self.satir_sil(satir[0])
+            self.satir_ekle(satir)
+    
+    def gun_satirlari(self, gun):
+        """Bir günün satırları, saat sıralı – sıralama anahtarlarında bisect"""
+        g = GUNLER.index(gun)
+        return self._satirlar[bisect_left(self._anahtarlar, (g,)):bisect_left(self._anahtarlar, (g + 1,))]
+    
+    def _konum(self, zil_id):
+        for i, satir in enumerate(self._satirlar):
+            if satir[0] == zil_id:
+                return i
+        return None
+
+class GunFiltreModeli(QSortFilterProxyModel):
+    """Paylaşılan modelden tek bir günün satırlarını gösterir"""
+    def __init__(self, gun, parent=None):
+        super().__init__(parent)
+        self.gun = gun
+    
+    def filterAcceptsRow(self, kaynak_satir, kaynak_ust):
+        index = self.sourceModel().index(kaynak_satir, ZilTabloModeli.GUN_SUTUNU, kaynak_ust)
+        return index.data() == self.gun
+
+class IslemDelegate(QStyledItemDelegate):
+    """İşlemler sütununa Düzenle / Sil düğmelerini çizer; tıklamayı sinyal olarak verir"""
+    duzenle = pyqtSignal(object)
+    sil = pyqtSignal(object)
+    DUGMELER = (("Düzenle", QColor("#007bff")), ("Sil", QColor("#dc3545")))
+    
+    def _alanlar(self, rect):
+        r = rect.adjusted(5, 5, -5, -5)
+        w = (r.width() - 5) // 2
+        return QRect(r.left(), r.top(), w, r.height()), QRect(r.left() + w + 5, r.top(), r.width() - w - 5, r.height())
+    
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        for alan, (yazi, renk) in zip(self._alanlar(option.rect), self.DUGMELER):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(renk)
+            painter.drawRoundedRect(alan, 4, 4)
+            painter.setPen(Qt.white)
+            painter.drawText(alan, Qt.AlignCenter, yazi)
+        painter.restore()
+    
+    def sizeHint(self, option, index):
+        return QSize(160, 34)
+    
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            satir = index.data(SATIR_ROLU)
+            duzenle_alani, sil_alani = self._alanlar(option.rect)
+            # diyalog olay işleme bittikten sonra açılsın
+            if duzenle_alani.contains(event.pos()):
+                QTimer.singleShot(0, lambda: self.duzenle.emit(satir))
+                return True
+            if sil_alani.contains(event.pos()):
+                QTimer.singleShot(0, lambda: self.sil.emit(satir))
+                return True
+        return False
+
 class OkulZilProgrami(QMainWindow):
-    def __init__(self):
+    def __init__(self, zil_cal=True, ses_sureci=False):
         super().__init__()
         self.db = DatabaseManager()
+        self.model = ZilTabloModeli(self)
+        self.islem_delegate = IslemDelegate(self)
+        self.islem_delegate.duzenle.connect(lambda zil: self.zil_duzenle(zil[0], zil))
+        self.islem_delegate.sil.connect(lambda zil: self.zil_sil(zil[0], zil[3]))
+        self.denetci = AralikDenetcisi()
         self.init_ui()
-        self.load_all_data()
+        self._pencere_hazir = perf_counter()
+        # veri pencere göründükten sonra yüklenir: açılış süresi programın boyutundan bağımsız
+        QTimer.singleShot(0, self.ilk_yukleme)
         
         # Timer for current time display
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_current_time)
         self.timer.start(1000)  # Her saniye güncelle
+        
+        # Zil: ortak çekirdek; veritabanını başka bir süreç çalıyorsa yalnızca düzenleyici
+        self.cekirdek = self.depo = self.oynatici = None
+        if zil_cal:
+            self.zil_kur(ses_sureci)
+    
+    def zil_kur(self, ses_sureci=False):
+        """Kayıtların başlangıç ve bitiş saatlerinde zil çal (zil_cekirdegi)"""
+        cekirdek = ZilCekirdegi(self.db.db_name)
+        if not cekirdek.baslat():
+            self.statusBar().showMessage("Düzenleyici modu – zilleri başka bir süreç çalıyor")
+            return
+        self.cekirdek = cekirdek
+        self.oynatici = SesOynatici(SES_KLASORU, ses_sureci=ses_sureci)
+        self.depo = ZilProgramiDeposu(self.db.db_name)
+        self.depo.dinleyici_ekle(cekirdek.motor.yenile)
+        cekirdek.motor.bolge_ekle(VARSAYILAN_BOLGE, self.depo.gun_zilleri, self.oynatici.cal)
+        # bu penceredeki düzenlemeler hemen, diğer bağlantılarınki TAZELE_MS içinde devreye girer
+        for sinyal in (self.model.modelReset, self.model.rowsInserted, self.model.rowsRemoved,
+                       self.model.dataChanged):
+            sinyal.connect(self.depo.tazele)
+        self.zil_timer = QTimer(self)
+        self.zil_timer.timeout.connect(self.depo.tazele)
+        self.zil_timer.start(TAZELE_MS)
+        self.statusBar().showMessage(f"Ses klasörü: {SES_KLASORU}")
     
     def init_ui(self):
         self.setWindowTitle("Okul Zil Programı Yönetimi")
@@ -213,25 +486,42 @@ class OkulZilProgrami(QMainWindow):
         self.setCentralWidget(main_widget)
         main_layout = QVBoxLayout(main_widget)
         
+        # Şu anki ders / sıradaki zil – modelden, saniyede bir yalnızca kalan süre yazılır
+        self.durum_paneli = DurumPaneli(self.gun_akisi)
+        for sinyal in (self.model.modelReset, self.model.rowsInserted, self.model.rowsRemoved,
+                       self.model.dataChanged):
+            sinyal.connect(self.durum_paneli.yenile)
+        
         # Üst panel - Mevcut zaman ve kontroller
         top_panel = self.create_top_panel()
         main_layout.addWidget(top_panel)
+        main_layout.addWidget(self.durum_paneli)
         
         # Tab widget
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
         
-        # Günlük sekmeler
-        self.gunler = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+        # Günlük sekmeler + tüm program; içerikleri ilk açıldıklarında kurulur
+        self.gunler = GUNLER
         self.tablolar = {}
+        self._sekme_kurucular = {}  # sekme indeksi → henüz kurulmamış sekmenin kurucusu
         
         for gun in self.gunler:
-            tab = self.create_gun_tab(gun)
-            self.tab_widget.addTab(tab, gun)
-        
-        # Tüm program sekmesi
-        tum_program_tab = self.create_tum_program_tab()
-        self.tab_widget.addTab(tum_program_tab, "Tüm Program")
+            self.tembel_sekme(gun, lambda gun=gun: self.create_gun_tab(gun))
+        self.tembel_sekme("Tüm Program", self.create_tum_program_tab)
+        self.tab_widget.currentChanged.connect(self.sekme_kur)
+        self.sekme_kur(self.tab_widget.currentIndex())
+    
+    def tembel_sekme(self, baslik, kurucu):
+        """Boş bir sekme ekle; içeriği kurucu() ile ilk açılışta oluşturulur"""
+        yer = QWidget()
+        QVBoxLayout(yer).setContentsMargins(0, 0, 0, 0)
+        self._sekme_kurucular[self.tab_widget.addTab(yer, baslik)] = kurucu
+    
+    def sekme_kur(self, indeks):
+        kurucu = self._sekme_kurucular.pop(indeks, None)
+        if kurucu is not None:
+            self.tab_widget.widget(indeks).layout().addWidget(kurucu())
     
     def create_top_panel(self):
         """Üst panel oluştur"""
@@ -256,6 +546,14 @@ class OkulZilProgrami(QMainWindow):
         yenile_btn.clicked.connect(self.load_all_data)
         layout.addWidget(yenile_btn)
         
+        ice_btn = QPushButton("İçe Aktar")
+        ice_btn.clicked.connect(self.ice_aktar)
+        layout.addWidget(ice_btn)
+        
+        disa_btn = QPushButton("Dışa Aktar")
+        disa_btn.clicked.connect(self.disa_aktar)
+        layout.addWidget(disa_btn)
+        
         panel.setLayout(layout)
         return panel
     
@@ -263,6 +561,14 @@ class OkulZilProgrami(QMainWindow):
         """Mevcut zamanı güncelle"""
         now = datetime.now()
         self.zaman_label.setText(now.strftime("%H:%M:%S"))
+        self.durum_paneli.tik(now)
+    
+    def gun_akisi(self, tarih):
+        """Durum paneli kaynağı: tarihin gün adındaki satırlar, modelden (diske gitmez)"""
+        akis = []
+        for s in self.model.gun_satirlari(GUNLER[tarih.weekday()]):
+            akis.append((*gun_araligi(s[4], s[5], gece_asar(s[4], s[5], s[6])), f"{s[3]} ({s[2]})"))
+        return akis
     
     def create_gun_tab(self, gun):
         """Her gün için tab oluştur"""
@@ -274,16 +580,11 @@ class OkulZilProgrami(QMainWindow):
         baslik.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(baslik)
         
-        # Tablo
-        tablo = QTableWidget()
-        tablo.setColumnCount(7)
-        tablo.setHorizontalHeaderLabels(['ID', 'Tip', 'Başlık', 'Başlangıç', 'Bitiş', 'Süre', 'İşlemler'])
-        
-        # Tablo ayarları
-        header = tablo.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.Stretch)
-        tablo.setAlternatingRowColors(True)
-        tablo.setSelectionBehavior(QTableWidget.SelectRows)
+        # Tablo – paylaşılan modelin o güne süzülmüş görünümü
+        filtre = GunFiltreModeli(gun, self)
+        filtre.setSourceModel(self.model)
+        tablo = self.create_tablo_gorunumu(filtre)
+        tablo.setColumnHidden(ZilTabloModeli.GUN_SUTUNU, True)
         
         layout.addWidget(tablo)
         
@@ -313,24 +614,30 @@ class OkulZilProgrami(QMainWindow):
         layout.addWidget(baslik)
         
         # Tablo
-        self.tum_tablo = QTableWidget()
-        self.tum_tablo.setColumnCount(8)
-        self.tum_tablo.setHorizontalHeaderLabels(['ID', 'Gün', 'Tip', 'Başlık', 'Başlangıç', 'Bitiş', 'Süre', 'İşlemler'])
-        
-        # Tablo ayarları
-        header = self.tum_tablo.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.Stretch)
-        self.tum_tablo.setAlternatingRowColors(True)
-        self.tum_tablo.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tum_tablo = self.create_tablo_gorunumu(self.model)
         
         layout.addWidget(self.tum_tablo)
         widget.setLayout(layout)
         
         return widget
     
+    def create_tablo_gorunumu(self, model):
+        """Ortak tablo görünümü ayarları"""
+        tablo = QTableView()
+        tablo.setModel(model)
+        tablo.setItemDelegateForColumn(ZilTabloModeli.ISLEM_SUTUNU, self.islem_delegate)
+        
+        # Tablo ayarları
+        header = tablo.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        tablo.verticalHeader().setDefaultSectionSize(34)
+        tablo.setAlternatingRowColors(True)
+        tablo.setSelectionBehavior(QTableView.SelectRows)
+        return tablo
+    
     def yeni_zil_ekle(self, gun=None):
         """Yeni zil ekleme dialog'unu aç"""
-        dialog = ZilEkleDialog(self)
+        dialog = ZilEkleDialog(self, denetci=self.denetci)
         if gun:
             gun_index = self.gunler.index(gun)
             dialog.gun_combo.setCurrentIndex(gun_index)
@@ -338,22 +645,28 @@ class OkulZilProgrami(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
             if data['baslik'] and data['sure'] > 0:
-                self.db.zil_ekle(data['gun'], data['tip'], data['baslik'], 
-                                data['baslangic'], data['bitis'], data['sure'])
-                self.load_all_data()
+                zil_id = self.db.zil_ekle(data['gun'], data['tip'], data['baslik'], 
+                                          data['baslangic'], data['bitis'], data['sure'])
+                self.denetci.ekle(*denetim_girdisi(zil_id, data['gun'], data['baslangic'], data['bitis'],
+                                                   data['sure']))
+                self.model.satir_ekle((zil_id, data['gun'], data['tip'], data['baslik'],
+                                       data['baslangic'], data['bitis'], data['sure']))
                 QMessageBox.information(self, "Başarılı", "Zil programı eklendi!")
             else:
                 QMessageBox.warning(self, "Hata", "Lütfen tüm alanları doğru şekilde doldurun!")
     
     def zil_duzenle(self, zil_id, zil_data):
         """Zil programını düzenle"""
-        dialog = ZilEkleDialog(self, zil_data)
+        dialog = ZilEkleDialog(self, zil_data, denetci=self.denetci)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
             if data['baslik'] and data['sure'] > 0:
                 self.db.zil_guncelle(zil_id, data['gun'], data['tip'], data['baslik'],
                                    data['baslangic'], data['bitis'], data['sure'])
-                self.load_all_data()
+                self.denetci.guncelle(*denetim_girdisi(zil_id, data['gun'], data['baslangic'], data['bitis'],
+                                                       data['sure']))
+                self.model.satir_guncelle((zil_id, data['gun'], data['tip'], data['baslik'],
+                                           data['baslangic'], data['bitis'], data['sure']))
                 QMessageBox.information(self, "Başarılı", "Zil programı güncellendi!")
             else:
                 QMessageBox.warning(self, "Hata", "Lütfen tüm alanları doğru şekilde doldurun!")
@@ -365,90 +678,78 @@ class OkulZilProgrami(QMainWindow):
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.db.zil_sil(zil_id)
-            self.load_all_data()
+            self.model.satir_sil(zil_id)
+            self.denetci.sil(zil_id)
             QMessageBox.information(self, "Başarılı", "Zil programı silindi!")
     
-    def create_action_buttons(self, tablo, zil_data):
-        """İşlem butonları oluştur"""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Düzenle butonu
-        duzenle_btn = QPushButton("Düzenle")
-        duzenle_btn.setStyleSheet("QPushButton { background-color: #007bff; color: white; }")
-        duzenle_btn.clicked.connect(lambda: self.zil_duzenle(zil_data[0], zil_data))
-        layout.addWidget(duzenle_btn)
-        
-        # Sil butonu
-        sil_btn = QPushButton("Sil")
-        sil_btn.setStyleSheet("QPushButton { background-color: #dc3545; color: white; }")
-        sil_btn.clicked.connect(lambda: self.zil_sil(zil_data[0], zil_data[3]))
-        layout.addWidget(sil_btn)
-        
-        tablo.setCellWidget(tablo.rowCount() - 1, tablo.columnCount() - 1, widget)
-    
-    def load_gun_data(self, gun):
-        """Belirli bir günün verilerini yükle"""
-        tablo = self.tablolar[gun]
-        ziller = self.db.zilleri_getir(gun)
-        
-        tablo.setRowCount(len(ziller))
-        
-        for row, zil in enumerate(ziller):
-            tablo.setItem(row, 0, QTableWidgetItem(str(zil[0])))  # ID
-            tablo.setItem(row, 1, QTableWidgetItem(zil[2]))       # Tip
-            tablo.setItem(row, 2, QTableWidgetItem(zil[3]))       # Başlık
-            tablo.setItem(row, 3, QTableWidgetItem(zil[4]))       # Başlangıç
-            tablo.setItem(row, 4, QTableWidgetItem(zil[5]))       # Bitiş
-            tablo.setItem(row, 5, QTableWidgetItem(f"{zil[6]} dk")) # Süre
-            
-            # Tip'e göre renklendirme - QColor kullanarak
-            if zil[2] == "Ders":
-                bg_color = QColor(227, 242, 253)  # Açık mavi
-            else:
-                bg_color = QColor(243, 229, 245)  # Açık mor
-            
-            for col in range(6):
-                tablo.item(row, col).setBackground(bg_color)
-            
-            # İşlem butonları
-            self.create_action_buttons(tablo, zil)
-    
-    def load_tum_program_data(self):
-        """Tüm program verilerini yükle"""
-        ziller = self.db.zilleri_getir()
-        self.tum_tablo.setRowCount(len(ziller))
-        
-        for row, zil in enumerate(ziller):
-            self.tum_tablo.setItem(row, 0, QTableWidgetItem(str(zil[0])))  # ID
-            self.tum_tablo.setItem(row, 1, QTableWidgetItem(zil[1]))       # Gün
-            self.tum_tablo.setItem(row, 2, QTableWidgetItem(zil[2]))       # Tip
-            self.tum_tablo.setItem(row, 3, QTableWidgetItem(zil[3]))       # Başlık
-            self.tum_tablo.setItem(row, 4, QTableWidgetItem(zil[4]))       # Başlangıç
-            self.tum_tablo.setItem(row, 5, QTableWidgetItem(zil[5]))       # Bitiş
-            self.tum_tablo.setItem(row, 6, QTableWidgetItem(f"{zil[6]} dk")) # Süre
-            
-            # Tip'e göre renklendirme - QColor kullanarak
-            if zil[2] == "Ders":
-                bg_color = QColor(227, 242, 253)  # Açık mavi
-            else:
-                bg_color = QColor(243, 229, 245)  # Açık mor
-            
-            for col in range(7):
-                self.tum_tablo.item(row, col).setBackground(bg_color)
-            
-            # İşlem butonları
-            self.create_action_buttons(self.tum_tablo, zil)
+    def ice_aktar(self):
+        """CSV / JSON / ICS dosyasından toplu içe aktar"""
+        dosya, _ = QFileDialog.getOpenFileName(self, "Programı İçe Aktar", "", AKTARIM_FILTRESI)
+        if not dosya:
+            return
+        degistir = QMessageBox.question(
+            self, "İçe Aktar", "Mevcut program silinip yerine dosyadaki program yazılsın mı?\n"
+            "(Hayır: dosyadaki kayıtlar mevcut programa eklenir)",
+            QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            eklenen, _, bulgular = program_aktarim.ice_aktar(self.db.db_name, dosya, "zil_programi", degistir=degistir)
+            # tek transaction'dı: tablo bir kez doldurulur
+            self.load_all_data()
+        except (OSError, ValueError, sqlite3.Error) as e:
+            QMessageBox.warning(self, "Hata", f"İçe aktarılamadı:\n{e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        mesaj = f"{eklenen} zil programı içe aktarıldı!"
+        if bulgular:
+            mesaj += f"\n\n{len(bulgular)} uyarı:\n" + "\n".join(bulgular[:10])
+        QMessageBox.information(self, "Başarılı", mesaj)
     
+    def disa_aktar(self):
+        """Haftalık programı CSV / JSON / ICS olarak dışa aktar"""
+        dosya, _ = QFileDialog.getSaveFileName(self, "Programı Dışa Aktar", "zil_programi.csv", AKTARIM_FILTRESI)
+        if not dosya:
+            return
+        try:
+            yazilan = program_aktarim.disa_aktar(self.db.db_name, dosya, "zil_programi")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            QMessageBox.warning(self, "Hata", f"Dışa aktarılamadı:\n{e}")
+            return
+        QMessageBox.information(self, "Başarılı", f"{yazilan} zil programı dışa aktarıldı!")
+    
+    def ilk_yukleme(self):
+        """Açılıştan sonraki ilk yükleme; açılış sürelerini yazdır"""
+        self.load_all_data()
+        bitti = perf_counter()
+        try:
+            from zil_servisi import bellek_mb
+            mb = bellek_mb()
+        except ImportError:
+            mb = None
+        print(f"[ZIL] açılış: pencere {(self._pencere_hazir - _BASLANGIC) * 1000:.0f} ms, "
+              f"veri {(bitti - self._pencere_hazir) * 1000:.0f} ms ({self.model.rowCount()} kayıt), "
+              f"bellek {f'{mb:.1f} MB' if mb else '?'}")
+    
+    @olculen("load_all_data")
     def load_all_data(self):
-        """Tüm verileri yükle"""
-        for gun in self.gunler:
-            self.load_gun_data(gun)
-        self.load_tum_program_data()
+        """Tüm verileri yükle – tek sorgu, sekmeler aynı modeli gün süzgeciyle paylaşır"""
+        satirlar = self.db.zilleri_getir()
+        self.model.doldur(satirlar)
+        self.denetci = AralikDenetcisi(denetim_girdisi(s[0], s[1], s[4], s[5], s[6]) for s in satirlar)
+    
+    def closeEvent(self, event):
+        if self.cekirdek is not None:
+            self.cekirdek.durdur()
+            self.oynatici.durdur()
+            self.depo.kapat()
+            self.cekirdek = None
+        self.db.kapat()
+        event.accept()
 
 def main():
     app = QApplication(sys.argv)
+    olcum.argv_uygula(sys.argv[1:])
     
     # Uygulama stili
     app.setStyleSheet("""
@@ -468,12 +769,12 @@ def main():
             background-color: white;
             border-bottom: 2px solid #007bff;
         }
-        QTableWidget {
+        QTableView {
             background-color: white;
             alternate-background-color: #f8f9fa;
             gridline-color: #dee2e6;
         }
-        QTableWidget::item:selected {
+        QTableView::item:selected {
             background-color: #007bff;
             color: white;
         }
@@ -491,7 +792,8 @@ def main():
         }
     """)
     
-    window = OkulZilProgrami()
+    window = OkulZilProgrami(zil_cal="--duzenleyici" not in sys.argv[1:],
+                             ses_sureci="--ses-sureci" in sys.argv[1:])
     window.show()
     
     sys.exit(app.exec_())
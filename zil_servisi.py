@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Başsız (headless) zil servisi – pencere olmadan zil çalar
+PyQt5 yüklenmez; yalnızca program önbelleği, ses bankası ve zamanlayıcı
+kurulur. Tüm bölgeler tek zamanlayıcıdan sürülür; her bölge `bolge`
+tablosundaki ses klasörü / çıkışına yönlendirilir. GUI (main.py
+--duzenleyici) aynı veritabanına düzenleyici olarak bağlanabilir; yaptığı
+değişiklikler PRAGMA data_version ile buraya yansır.
+
+Kullanım:
+    python main.py --headless [--db zil_programi.db] [--ses zil_sesleri] [--cikis aplay|null|…]
+                              [--api [host:]port] [--kacan gec|atla] [--gec-sinir SN]
+                              [--ses-sureci] [--olcum] [--olcum-dosya YOL]
+    kill -USR1 <pid>    → örnekleyici profili aç / kapat (kapanınca zil_profil_*.txt yazılır)
+"""
+
+import sys, time, argparse, threading, signal
+
+_BASLANGIC = time.perf_counter()
+
+from zamanlayici import ZilZamanlayici, VARSAYILAN_BOLGE, POLITIKALAR, GEC_CAL_SINIRI
+from zil_cekirdegi import ZilCekirdegi
+from program_onbellek import onbellek, init_db
+from ses_bankasi import SesBankasi, SesIzleyici
+from ses_cikisi import ZilCalici, varsayilan_cikis
+import olcum
+
+DB_FILE     = "zil_programi.db"
+SES_KLASORU = "zil_sesleri"
+TAZELE_SN   = 2.0           # başka süreçlerin değişikliklerini yoklama aralığı
+
+
+def bellek_mb():
+    """Süreç bellek kullanımı (MB, en yüksek RSS) ya da None"""
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        sayac = PROCESS_MEMORY_COUNTERS()
+        sayac.cb = ctypes.sizeof(sayac)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(sayac), sayac.cb)
+        return sayac.PeakWorkingSetSize / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class ZilServisi:
+    def __init__(self, db_file=DB_FILE, ses_klasoru=SES_KLASORU, cikis=None, politika="gec",
+                 gec_sinir=GEC_CAL_SINIRI, ses_sureci=False):
+        init_db(db_file)
+        self.onbellek = onbellek(db_file)
+        self.ses_klasoru = ses_klasoru
+        self.cikis = cikis                  # None → varsayilan_cikis()
+        self.ses_sureci = ses_sureci        # True → çalma ayrı süreçte (ses_sureci.SurecCalici)
+        self.calicilar = {}                 # (ses_klasoru, cikis_adi) → (ZilCalici, SesIzleyici)
+        self._dur = threading.Event()
+        self._basladi = False
+        self.cekirdek = ZilCekirdegi(db_file, ZilZamanlayici(politika=politika, gec_sinir=gec_sinir))
+        self.motor = self.cekirdek.motor
+        self.program_degisti()
+        self.onbellek.dinleyici_ekle(self.program_degisti)
+
+    @property
+    def calici(self):
+        """Varsayılan bölgenin çalıcısı"""
+        return self.bolge_calici(VARSAYILAN_BOLGE)
+
+    def bolge_calici(self, bolge):
+        """Aynı ses klasörü + çıkışı paylaşan bölgeler tek çalıcı kullanır"""
+        klasor, cikis_adi = self.onbellek.bolge_ayari(bolge)
+        anahtar = (klasor or self.ses_klasoru, cikis_adi)
+        if anahtar not in self.calicilar:
+            banka = SesBankasi(anahtar[0])
+            cikis = varsayilan_cikis(cikis_adi) if cikis_adi else (self.cikis or varsayilan_cikis())
+            if self.ses_sureci:
+                from ses_sureci import SurecCalici
+                calici = SurecCalici(banka, cikis)
+            else:
+                calici = ZilCalici(banka, cikis)
+            izleyici = SesIzleyici(banka, calici.sesler_degisti)
+            if self._basladi:
+                izleyici.start()
+            self.calicilar[anahtar] = (calici, izleyici)
+        return self.calicilar[anahtar][0]
+
+    def gunluk_ziller(self, bolge, tarih):
+        return self.onbellek.tarih(tarih, bolge)
+
+    def program_degisti(self, bolge=None):
+        self.motor.bolgeleri_esitle(self.onbellek.bolgeler(), self.gunluk_ziller,
+                                    lambda ad: self.bolge_calici(ad).cal)
+        self.motor.yenile(bolge)
+
+    def hazirla(self):
+        """Programı önbelleğe al, ilk zili hesapla – 'zil çalmaya hazır'"""
+        self.onbellek.gun(0)
+        return self.motor.sonraki()
+
+    def hemen_cal(self, tur, bolge=VARSAYILAN_BOLGE):
+        """Programdan bağımsız, elle tetiklenen zil"""
+        self.bolge_calici(bolge).cal(tur, 0)
+
+    def calistir(self):
+        """durdur() çağrılana kadar döner; zil kilidi başka süreçteyse hemen False"""
+        if not self.cekirdek.baslat():
+            return False
+        self._basladi = True
+        for _, izleyici in list(self.calicilar.values()):
+            izleyici.start()
+        while not self._dur.wait(TAZELE_SN):
+            self.onbellek.tazele()
+        return True
+
+    def durdur(self):
+        self.cekirdek.durdur()
+        for calici, izleyici in self.calicilar.values():
+            izleyici.stop()
+            calici.durdur()
+        self._dur.set()
+
+
+def profil_sinyali_kur():
+    """
+    SIGUSR1 → profil aç / kapat. İşleyici ana thread'de, o thread olcum'un
+    kilidini tutarken de çalışabilir: yalnızca olayı işaretler; profili
+    başlatma / durdurma ve dosya yazma ayrı bir thread'de yapılır.
+    """
+    istek = threading.Event()
+
+    def isle():
+        while True:
+            istek.wait()
+            istek.clear()
+            olcum.profil_degistir()
+
+    threading.Thread(target=isle, name="profil-sinyali", daemon=True).start()
+    signal.signal(signal.SIGUSR1, lambda *_: istek.set())
+    return istek
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Başsız okul zili servisi")
+    p.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    p.add_argument("--db", default=DB_FILE)
+    p.add_argument("--ses", default=SES_KLASORU)
+    p.add_argument("--cikis", default=None,
+                   help="winsound | aplay[:cihaz] | pw-play[:cihaz] | paplay[:cihaz] | afplay | null")
+    p.add_argument("--api", default=None, metavar="[HOST:]PORT",
+                   help="HTTP/JSON kontrol arayüzü (varsayılan yalnızca 127.0.0.1; "
+                        "başka adreste ZIL_API_ANAHTARI gerekir)")
+    p.add_argument("--kacan", choices=POLITIKALAR, default="gec",
+                   help="kaçan zil (saat sıçraması, uyku): sınır içinde geç çal | atla")
+    p.add_argument("--gec-sinir", type=float, default=GEC_CAL_SINIRI, metavar="SN",
+                   help=f"geç çalmanın en fazla gecikmesi (varsayılan {GEC_CAL_SINIRI:.0f} sn)")
+    p.add_argument("--ses-sureci", action="store_true",
+                   help="sesi ayrı bir işçi sürecinde çal (çökerse yeniden başlatılır)")
+    p.add_argument("--olcum", action="store_true",
+                   help="sıcak yolların ölçümünü aç (--api ile GET /metrics)")
+    p.add_argument("--olcum-dosya", metavar="YOL",
+                   help=f"ölçümleri {olcum.YAZ_SN:.0f} sn'de bir Prometheus metin dosyasına yaz")
+    a = p.parse_args(argv)
+
+    if a.olcum:
+        olcum.etkinlestir()
+    if a.olcum_dosya:
+        olcum.dosya_yazici_baslat(a.olcum_dosya)
+    if hasattr(signal, "SIGUSR1"):
+        profil_sinyali_kur()
+
+    servis = ZilServisi(a.db, a.ses, varsayilan_cikis(a.cikis), a.kacan, a.gec_sinir, a.ses_sureci)
+    sonraki = servis.hazirla()
+    hazir_ms = (time.perf_counter() - _BASLANGIC) * 1000
+    api = None
+    if a.api:
+        from kontrol_api import KontrolAPI, adres_coz
+        api = KontrolAPI(servis.onbellek, servis.motor, servis.hemen_cal, *adres_coz(a.api))
+        try:
+            print("[ZIL] kontrol arayüzü: http://%s:%d" % api.baslat())
+        except (OSError, ValueError) as e:
+            print(f"[HATA] kontrol arayüzü başlatılamadı – {e}")
+            servis.durdur()
+            return 1
+    mb = bellek_mb()
+    print(f"[ZIL] hazır: {hazir_ms:.0f} ms, bellek {f'{mb:.1f} MB' if mb else '?'}, "
+          f"{len(servis.motor.bolgeler())} bölge, {len(servis.calicilar)} çıkış "
+          f"({', '.join(sorted({c.cikis.ad for c, _ in servis.calicilar.values()}))})")
+    if sonraki:
+        print(f"[ZIL] sonraki zil: {time.strftime('%a %H:%M', time.localtime(sonraki[0]))} "
+              f"{sonraki[1]} ({sonraki[3]})")
+    try:
+        if not servis.calistir():           # bu veritabanının zillerini başka bir süreç çalıyor (kilit)
+            servis.durdur()
+            if api is not None:
+                api.durdur()
+            return 1
+    except KeyboardInterrupt:
+        servis.durdur()
+        ist = servis.motor.istatistik()
+        sapma = ist["sapma_ms"]
+        if sapma["adet"]:
+            print(f"[ZIL] {ist['calan']} zil ({ist['gec_calan']} geç), {ist['atlanan']} atlandı, "
+                  f"{ist['sicrama']} saat sıçraması; sapma p50 ≤{sapma['p50']} ms, p99 ≤{sapma['p99']} ms, "
+                  f"maks {sapma['maks']:.1f} ms")
+        if api is not None:
+            api.durdur()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())